@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import argparse
+import atexit
 import sys
 
 from pycsp3 import *
 
+# Profils de recherche de ACE (--strategie), communs avec le paquet : le script se lance depuis la racine du dépôt
+# en module (python -m M1.m1)
+from cyclic_bandwidth.ace import PROFILS_RECHERCHE, options_recherche, supprimer_depart
+
 
 def lire_graphe(nomFichier: str):
     """
@@ -55,10 +60,33 @@ if __name__ == "__main__":
         default="testSimple.mtx.rnd",
         help="Nom du fichier à traiter (défaut : testSimple.mtx.rnd)")
 
+    # Option pour ajouter le modèle dual position -> sommet
+    parser.add_argument(
+        "-d", "--dual",
+        action="store_true",
+        help="Ajoute le modèle dual (position -> sommet) canalisé avec x"
+    )
+    # Option pour brancher sur les positions du modèle dual
+    parser.add_argument(
+        "-b", "--branche-dual",
+        action="store_true",
+        help="Branche sur les positions du modèle dual (implique --dual)"
+    )
+
+    # Option pour choisir le profil de recherche de ACE
+    parser.add_argument(
+        "-s", "--strategie",
+        default="defaut",
+        choices=list(PROFILS_RECHERCHE),
+        help="Profil de recherche de ACE (défaut : defaut)")
+
     # Attribue les arguments
     args = parser.parse_args()
     trace: bool = True  # args.trace
     nomFichier: str = args.fichier
+    strategie: str = args.strategie
+    dual: bool = args.dual or args.branche_dual
+    branche_dual: bool = args.branche_dual
 
     # Lecture du graphe
     sommets, aretes = lire_graphe(nomFichier)
@@ -66,6 +94,8 @@ if __name__ == "__main__":
     if trace:
         print("sommets (" + str(n) + ") :", sommets)
         print("aretes :", aretes)
+    options_ace = options_recherche(strategie, sommets, aretes)  # Profil de recherche de ACE
+    atexit.register(supprimer_depart, options_ace)  # Fichier de départ supprimé à la sortie
 
     # Création des variables et des paramètres
     x = VarArray(size=n, dom=range(1, n + 1))
@@ -81,8 +111,20 @@ if __name__ == "__main__":
         Maximum(distances)
     )
 
+    # Modèle dual (optionnel) : p[q] est le sommet placé à l'étiquette q+1 du cycle
+    # Canalisation seule : M1 minimise le cyclic bandwidth sans borne k, la fenêtre q+1 ± k de l'adjacence vue des
+    # positions (posée par les scripts M2) n'est pas connue à la construction du modèle
+    if dual:
+        p = VarArray(size=n, dom=range(n))  # indice (à partir de 0) du sommet
+        satisfy(
+            AllDifferent(p),
+            [x[p[q]] == q + 1 for q in range(n)]  # Canalisation : x[i] = q+1 <=> p[q] = i
+        )
+        if branche_dual:
+            annotate(decision=p)  # Branchement sur les positions plutôt que sur les sommets
+
     # Résolution
-    result = solve(solver="ACE")
+    result = solve(solver="ACE", options=options_ace)
 
     # Affichage du résultat
     if result is UNSAT:
@@ -96,6 +138,7 @@ if __name__ == "__main__":
             print("Sommet v_" + str(i) + " -> Étiquette", e)
             i += 1
         print("CYCLIC_BANDWITDH :", max([dist_cyclique(values(x)[u - 1], values(x)[v - 1]) for (u, v) in aretes]))
+        print("STRATEGIE :", strategie)
         sys.exit(0)  # Code retour ok
     else:
         print("Pas de retour du solveur. ")
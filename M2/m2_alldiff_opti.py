@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import argparse
+import atexit
 import math
 from collections import deque
 
 from pycsp3 import *
 
+# Profils de recherche de ACE (--strategie), communs avec le paquet : le script se lance depuis la racine du dépôt
+# en module (python -m M2.m2_alldiff_opti)
+from cyclic_bandwidth.ace import PROFILS_RECHERCHE, options_recherche, supprimer_depart
+
 
 def lire_graphe(nomFichier: str):
     """
@@ -85,10 +90,33 @@ if __name__ == "__main__":
         default="testSimple.mtx.rnd",
         help="Nom du fichier à traiter (défaut : testSimple.mtx.rnd)")
 
+    # Option pour ajouter le modèle dual position -> sommet
+    parser.add_argument(
+        "-d", "--dual",
+        action="store_true",
+        help="Ajoute le modèle dual (position -> sommet) canalisé avec x"
+    )
+    # Option pour brancher sur les positions du modèle dual
+    parser.add_argument(
+        "-b", "--branche-dual",
+        action="store_true",
+        help="Branche sur les positions du modèle dual (implique --dual)"
+    )
+
+    # Option pour choisir le profil de recherche de ACE
+    parser.add_argument(
+        "-s", "--strategie",
+        default="defaut",
+        choices=list(PROFILS_RECHERCHE),
+        help="Profil de recherche de ACE (défaut : defaut)")
+
     # Attribue les arguments
     args = parser.parse_args()
     trace: bool = args.trace
     nomFichier: str = args.fichier
+    strategie: str = args.strategie
+    dual: bool = args.dual or args.branche_dual
+    branche_dual: bool = args.branche_dual
 
     # Lecture du graphe
     sommets, aretes = lire_graphe(nomFichier)
@@ -96,6 +124,8 @@ if __name__ == "__main__":
     if trace:
         print("sommets (" + str(n) + ") :", sommets)
         print("aretes :", aretes)
+    options_ace = options_recherche(strategie, sommets, aretes)  # Profil de recherche de ACE
+    atexit.register(supprimer_depart, options_ace)  # Fichier de départ supprimé à la sortie
 
     # Création des variables et des paramètres
     k = optimiser_k(sommets, aretes)  # Borne de départ
@@ -117,8 +147,35 @@ if __name__ == "__main__":
             [(x[u - 1], x[v - 1]) in couples_etiquettes_possibles for (u, v) in aretes]
         )
 
+        # Modèle dual (optionnel) : p[q] est le sommet placé à l'étiquette q+1 du cycle
+        if dual:
+            p = VarArray(size=n, dom=range(n))  # indice (à partir de 0) du sommet
+            satisfy(
+                AllDifferent(p),
+                [x[p[q]] == q + 1 for q in range(n)]  # Canalisation : x[i] = q+1 <=> p[q] = i
+            )
+            # Adjacence vue des positions : le t-ième voisin du sommet placé en q+1 (lu dans une table partagée par les
+            # positions, le sommet lui-même au-delà de son degré) a son étiquette e_dual[q][t] dans la fenêtre q+1 ± k
+            adjacence = [[] for _ in range(n)]
+            for (u, v) in aretes:
+                adjacence[u - 1].append(v - 1)
+                adjacence[v - 1].append(u - 1)
+            degre = max(len(voisins) for voisins in adjacence)
+            if degre and 2 * k + 1 < n:
+                tables = [[(i, voisins[t] if t < len(voisins) else i) for i, voisins in enumerate(adjacence)]
+                          for t in range(degre)]
+                v_dual = VarArray(size=[n, degre], dom=range(n))
+                fenetres = [[j for j in range(1, n + 1) if dist_cyclique(j, q + 1) <= k] for q in range(n)]
+                e_dual = VarArray(size=[n, degre], dom=lambda q, t: fenetres[q])
+                satisfy(
+                    [(p[q], v_dual[q][t]) in tables[t] for q in range(n) for t in range(degre)],
+                    [x[v_dual[q][t]] == e_dual[q][t] for q in range(n) for t in range(degre)]
+                )
+            if branche_dual:
+                annotate(decision=p)  # Branchement sur les positions plutôt que sur les sommets
+
         # Résolution
-        result = solve(solver="ACE")
+        result = solve(solver="ACE", options=options_ace)
 
         if result is SAT:
             if trace: print("Sat pour", k)
@@ -150,4 +207,5 @@ if __name__ == "__main__":
             i += 1
 
         print("CYCLIC_BANDWITDH :", max([dist_cyclique(old_etiquettes[u - 1], old_etiquettes[v - 1]) for (u, v) in aretes]))
+        print("STRATEGIE :", strategie)
         sys.exit(0)
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import argparse
+import atexit
 import itertools
 import math
 from collections import deque
 
 from pycsp3 import *
 
+# Profils de recherche de ACE (--strategie), communs avec le paquet : le script se lance depuis la racine du dépôt
+# en module (python -m M2.m2_permutations)
+from cyclic_bandwidth.ace import PROFILS_RECHERCHE, options_recherche, supprimer_depart
+
 
 def lire_graphe(nomFichier: str):
     """
@@ -92,10 +97,18 @@ if __name__ == "__main__":
         default=None,
         help="Borne de satisfaction du cyclic bandwith (défaut : n/2")
 
+    # Option pour choisir le profil de recherche de ACE
+    parser.add_argument(
+        "-s", "--strategie",
+        default="defaut",
+        choices=list(PROFILS_RECHERCHE),
+        help="Profil de recherche de ACE (défaut : defaut)")
+
     # Attribue les arguments
     args = parser.parse_args()
     trace: bool = args.trace
     nomFichier: str = args.fichier
+    strategie: str = args.strategie
 
     # Lecture du graphe
     sommets, aretes = lire_graphe(nomFichier)
@@ -103,6 +116,8 @@ if __name__ == "__main__":
     if trace:
         print("sommets (" + str(n) + ") :", sommets)
         print("aretes :", aretes)
+    options_ace = options_recherche(strategie, sommets, aretes)  # Profil de recherche de ACE
+    atexit.register(supprimer_depart, options_ace)  # Fichier de départ supprimé à la sortie
 
     # Création des variables et des paramètres
     x = VarArray(size=n, dom=range(1, n + 1))
@@ -121,7 +136,7 @@ if __name__ == "__main__":
     )
 
     # Résolution
-    result = solve(solver="ACE")
+    result = solve(solver="ACE", options=options_ace)
 
     # Affichage du résultat
     if result is SAT:
@@ -132,6 +147,7 @@ if __name__ == "__main__":
             print("Sommet v_" + str(i) + " -> Étiquette", e)
             i += 1
         print("CYCLIC_BANDWITDH :",max([dist_cyclique(values(x)[u - 1], values(x)[v - 1]) for (u, v) in aretes]))
+        print("STRATEGIE :", strategie)
         sys.exit(0)  # Code retour ok
     elif result is UNSAT:
         print("Unsat : problème non résolu.")
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc de mesure des modèles : exécute chaque variante sur chaque graphe, en parallèle et avec un délai par exécution,
+puis écrit un CSV au format de resultats.csv et un JSON des statistiques détaillées (médiane, écart interquartile,
+mémoire maximale).
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shlex
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Variantes mesurées : nom -> commande (le graphe et le profil de recherche sont ajoutés à l'exécution) ; les scripts
+# M1/M2 sont lancés en module, avec la racine du dépôt dans PYTHONPATH
+VARIANTES = {
+    "m1.py": [sys.executable, "-m", "M1.m1"],
+    "m1_symetrie.py": [sys.executable, "-m", "M1.m1_symetrie"],
+    "m2_alldiff_opti.py": [sys.executable, "-m", "M2.m2_alldiff_opti"],
+    "m2_alldiff_opti2.py": [sys.executable, "-m", "M2.m2_alldiff_opti2"],
+    "m2_alldiff.py": [sys.executable, "-m", "M2.m2_alldiff"],
+    "m2_alldiff_symetrie.py": [sys.executable, "-m", "M2.m2_alldiff_symetrie"],
+    "m3.py": [sys.executable, os.path.join(RACINE, "M3", "m3.py")],
+    "m3_opti.py": [sys.executable, os.path.join(RACINE, "M3", "m3_opti.py")],
+    "m3_opti2.py": [sys.executable, os.path.join(RACINE, "M3", "m3_opti2.py")],
+    "m3_symetrie.py": [sys.executable, os.path.join(RACINE, "M3", "m3_symetrie.py")],
+    "m3bis_opti2.py": [sys.executable, os.path.join(RACINE, "M3", "m3bis_opti2.py")],
+    "cli_m1": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M1"],
+    "cli_m2": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M2"],
+    "cli_m3": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M3"],
+    "cli_m4": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M4"],
+    "cli_m3_maxsat": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M3", "--maxsat"],
+    "cli_m3_cubes": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M3", "--cubes", "1"],
+    "cli_portefeuille": [sys.executable, "-m", "cyclic_bandwidth", "--portefeuille", "M3", "M3 --maxsat", "M4"],
+    "cli_m1_distances": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M1", "--distances", "2"],
+    "cli_m2_distances": [sys.executable, "-m", "cyclic_bandwidth", "-m", "M2", "--distances", "2"],
+}
+
+# Code retour de la ligne de commande quand la borne demandée est insatisfiable (sondage UNSAT)
+CODE_INSATISFIABLE = 1
+
+# Variantes de l'ancien Test/test_full.sh, mesurées par défaut
+VARIANTES_DEFAUT = ["m1.py", "m1_symetrie.py", "m2_alldiff_opti.py", "m2_alldiff_opti2.py", "m2_alldiff.py",
+                    "m2_alldiff_symetrie.py", "m3.py", "m3_opti.py", "m3_opti2.py", "m3_symetrie.py"]
+
+# Valeur du cyclic bandwidth dans la sortie des scripts : "CYCLIC_BANDWIDTH : 4", "CYCLIC_BANDWITDH : 4", "CYCLIC_BANDWIDTH=4"
+MOTIF_BANDWIDTH = re.compile(r"CYCLIC_BAND\w*\s*[:=]\s*(\d+)")
+
+
+def lire_bandwidth(sortie):
+    """
+    Extrait la dernière valeur de cyclic bandwidth affichée par une exécution.
+
+    :param sortie: sortie standard de l'exécution
+    :return: valeur entière, None si absente
+    """
+    valeurs = MOTIF_BANDWIDTH.findall(sortie)
+    return int(valeurs[-1]) if valeurs else None
+
+
+def lister_graphes(dossier, max_sommets):
+    """
+    Liste les graphes d'un dossier dont le nombre de sommets ne dépasse pas une limite.
+
+    :param dossier: dossier des fichiers *.mtx.rnd
+    :param max_sommets: nombre maximal de sommets (None : pas de limite)
+    :return: liste triée des chemins
+    """
+    graphes = []
+    for nom in sorted(os.listdir(dossier)):
+        if nom.endswith(".mtx.rnd"):
+            chemin = os.path.join(dossier, nom)
+            with open(chemin) as f:
+                f.readline()
+                n = int(f.readline().split()[0])  # Nombre de sommets sur la deuxième ligne
+            if max_sommets is None or n <= max_sommets:
+                graphes.append(chemin)
+    return graphes
+
+
+def executer(commande, delai, dossier_logs=None):
+    """
+    Exécute une commande dans un dossier temporaire (les fichiers générés par pycsp3 ne s'écrasent pas entre
+    exécutions parallèles) et mesure son temps et sa mémoire maximale.
+
+    :param commande: liste des arguments
+    :param delai: délai maximal en secondes (None : pas de délai)
+    :param dossier_logs: dossier où conserver les logs des solveurs (None : supprimés)
+    :return: dictionnaire (code, temps, rss_max_ko, delai_depasse, sortie)
+    """
+    dossier = tempfile.mkdtemp(prefix="bench_")
+    with tempfile.TemporaryFile("w+") as sortie:
+        debut = time.perf_counter()
+        env = dict(os.environ, PYTHONPATH=RACINE + os.pathsep + os.environ.get("PYTHONPATH", ""))  # Variantes en module
+        p = subprocess.Popen(commande, cwd=dossier, env=env, stdout=sortie, stderr=subprocess.DEVNULL,
+                             start_new_session=True)
+        depasse = threading.Event()
+
+        def tuer():
+            depasse.set()
+            try:
+                os.killpg(p.pid, signal.SIGKILL)  # Le script et le solveur qu'il a lancé
+            except ProcessLookupError:
+                pass
+
+        minuteur = threading.Timer(delai, tuer) if delai else None
+        if minuteur:
+            minuteur.start()
+        _, statut, usage = os.wait4(p.pid, 0)  # Attente avec l'utilisation des ressources du processus
+        temps = time.perf_counter() - debut
+        if minuteur:
+            minuteur.cancel()
+        # Comme os.waitstatus_to_exitcode (Python 3.9) : négatif pour un processus tué par un signal
+        p.returncode = -os.WTERMSIG(statut) if os.WIFSIGNALED(statut) else os.WEXITSTATUS(statut)
+        sortie.seek(0)
+        texte = sortie.read()
+
+    if dossier_logs:
+        os.makedirs(dossier_logs, exist_ok=True)
+        for nom in os.listdir(dossier):
+            if nom.endswith(".log"):
+                shutil.move(os.path.join(dossier, nom), os.path.join(dossier_logs, nom))
+    shutil.rmtree(dossier, ignore_errors=True)
+
+    return {
+        "code": p.returncode,
+        "temps": temps,
+        "rss_max_ko": usage.ru_maxrss,  # Ko sous Linux
+        "delai_depasse": depasse.is_set(),
+        "sortie": texte,
+    }
+
+
+def statistiques(temps):
+    """
+    Statistiques des temps des répétitions.
+
+    :param temps: liste des temps (secondes)
+    :return: dictionnaire moyenne, mediane, iqr, min, max
+    """
+    if not temps:
+        return {}
+    quartiles = statistics.quantiles(temps, n=4) if len(temps) > 1 else [temps[0]] * 3
+    return {
+        "moyenne": statistics.mean(temps),
+        "mediane": statistics.median(temps),
+        "iqr": quartiles[2] - quartiles[0],
+        "min": min(temps),
+        "max": max(temps),
+    }
+
+
+def mesurer(variante, graphe, args):
+    """
+    Mesure une variante sur un graphe : échauffements puis répétitions, arrêt à la première erreur.
+
+    :param variante: nom de la variante (clé de VARIANTES)
+    :param graphe: chemin du graphe
+    :param args: options de la ligne de commande
+    :return: dictionnaire des mesures
+    """
+    commande = VARIANTES[variante] + ["-f", graphe]
+    avec_strategie = not (variante.startswith("m3") or variante.startswith(("cli_m3", "cli_m4", "cli_portefeuille")))
+    if avec_strategie:
+        commande += ["--strategie", args.strategie]
+    if variante.startswith("cli_") and args.arguments:
+        commande += shlex.split(args.arguments)
+
+    temps, rss, cb, erreur = [], [], None, None
+    if not os.path.isfile(graphe):  # Sinon la commande échoue avec le code retour de l'insatisfiabilité
+        erreur = "fichier absent"
+
+    for _ in range(args.echauffement if erreur is None else 0):
+        executer(commande, args.delai)
+
+    for _ in range(args.repetitions if erreur is None else 0):
+        execution = executer(commande, args.delai, args.logs)
+        if execution["delai_depasse"]:
+            erreur = "delai"
+            break
+        insatisfiable = variante.startswith("cli_") and execution["code"] == CODE_INSATISFIABLE
+        if execution["code"] != 0 and not insatisfiable:
+            erreur = "code " + str(execution["code"])
+            break
+        temps.append(execution["temps"])
+        rss.append(execution["rss_max_ko"])
+        valeur = "UNSAT" if insatisfiable else lire_bandwidth(execution["sortie"])
+        cb = valeur if valeur is not None else cb
+
+    mesure = {
+        "script": variante,
+        "graphe": os.path.basename(graphe),
+        "strategie": args.strategie if avec_strategie else "-",
+        "ok": erreur is None,
+        "erreur": erreur,
+        "cyclic_bandwidth": cb,
+        "repetitions": len(temps),
+        "temps": temps,
+        "rss_max_ko": max(rss) if rss else None,
+    }
+    mesure.update(statistiques(temps))
+    return mesure
+
+
+def ecrire_csv(mesures, fichier):
+    """
+    Écrit les mesures au format de resultats.csv ; un profil de recherche autre que celui par défaut est noté après le
+    nom du script (m1.py[domwdeg]).
+
+    :param mesures: liste des mesures (voir mesurer)
+    :param fichier: fichier CSV de sortie
+    """
+    with open(fichier, "w", newline="") as f:
+        ecrivain = csv.writer(f)
+        ecrivain.writerow(["Script", "Graphe", "Temps_moyen(s)", "CyclicBandwidth"])
+        for m in mesures:
+            script = m["script"] if m["strategie"] in ("-", "defaut") else m["script"] + "[" + m["strategie"] + "]"
+            if m["ok"]:
+                ecrivain.writerow([script, m["graphe"], "%.4f" % m["moyenne"],
+                                   m["cyclic_bandwidth"] if m["cyclic_bandwidth"] is not None else "X"])
+            else:
+                ecrivain.writerow([script, m["graphe"], "X", "X"])
+
+
+if __name__ == "__main__":
+    # Parse les arguments
+    parser = argparse.ArgumentParser(description="Banc de mesure des modèles du cyclic bandwidth.")
+    parser.add_argument(
+        "-d", "--dossier",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data"),
+        help="Dossier des graphes (défaut : Test/Data)")
+    parser.add_argument(
+        "-g", "--graphes",
+        nargs="+",
+        default=None,
+        help="Graphes à mesurer (défaut : tous ceux du dossier)")
+    parser.add_argument(
+        "--max-sommets",
+        type=int,
+        default=None,
+        help="Nombre maximal de sommets des graphes du dossier (défaut : pas de limite)")
+    parser.add_argument(
+        "-v", "--variantes",
+        nargs="+",
+        default=VARIANTES_DEFAUT,
+        choices=list(VARIANTES),
+        help="Variantes à mesurer (défaut : celles de l'ancien test_full.sh)")
+    parser.add_argument(
+        "-n", "--repetitions",
+        type=int,
+        default=10,
+        help="Nombre de répétitions mesurées (défaut : 10)")
+    parser.add_argument(
+        "-w", "--echauffement",
+        type=int,
+        default=1,
+        help="Nombre d'exécutions d'échauffement non mesurées (défaut : 1)")
+    parser.add_argument(
+        "--delai",
+        type=float,
+        default=300,
+        help="Délai maximal par exécution en secondes (défaut : 300)")
+    parser.add_argument(
+        "-j", "--processus",
+        type=int,
+        default=1,
+        help="Nombre de mesures exécutées en parallèle (défaut : 1)")
+    parser.add_argument(
+        "-s", "--strategie",
+        default="defaut",
+        help="Profil de recherche ACE des modèles M1/M2 (défaut : defaut)")
+    parser.add_argument(
+        "-a", "--arguments",
+        default="",
+        help="Options ajoutées aux variantes cli_*, par exemple \"-r fixe -k 3\" pour mesurer un sondage "
+             "(UNSAT si la borne est insatisfiable)")
+    parser.add_argument(
+        "-o", "--sortie",
+        default="resultats.csv",
+        help="Fichier CSV de sortie (défaut : resultats.csv) ; le JSON est écrit à côté")
+    parser.add_argument(
+        "--logs",
+        default="log",
+        help="Dossier où conserver les logs des solveurs (défaut : log)")
+    args = parser.parse_args()
+    # Les commandes sont lancées dans un dossier temporaire : les chemins relatifs ne s'y retrouveraient pas
+    args.dossier, args.logs = os.path.abspath(args.dossier), os.path.abspath(args.logs)
+
+    graphes = args.graphes if args.graphes else lister_graphes(args.dossier, args.max_sommets)
+    graphes = [os.path.abspath(graphe) for graphe in graphes]
+    travaux = [(variante, graphe) for graphe in graphes for variante in args.variantes]
+
+    # Les mesures sont lancées en parallèle, chaque mesure exécutant ses répétitions à la suite
+    with ThreadPoolExecutor(max_workers=args.processus) as pool:
+        futures = [pool.submit(mesurer, variante, graphe, args) for (variante, graphe) in travaux]
+        mesures = []
+        for future in futures:
+            m = future.result()
+            mesures.append(m)
+            if m["ok"]:
+                print("[OK] %s - %s : médiane %.4f s (IQR %.4f), CB=%s, RSS=%s Ko (%s)" % (
+                    m["script"], m["graphe"], m["mediane"], m["iqr"], m["cyclic_bandwidth"], m["rss_max_ko"],
+                    m["strategie"]))
+            else:
+                print("[X] %s - %s : erreur (%s)" % (m["script"], m["graphe"], m["erreur"]))
+
+    ecrire_csv(mesures, args.sortie)
+    with open(os.path.splitext(args.sortie)[0] + ".json", "w") as f:
+        json.dump(mesures, f, indent=2)
+    print("Traitement terminé. Résultats dans", args.sortie)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Données communes des tests : petits graphes dont le cyclic bandwidth se calcule par force brute.
+"""
+import itertools
+import os
+
+import pytest
+
+from cyclic_bandwidth.cli import creer_parser
+from cyclic_bandwidth.graphe import cyclic_bandwidth, lire_graphe
+from cyclic_bandwidth.resultat import OPTIMUM
+from cyclic_bandwidth.stockage import etiquetage_valide
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+# Graphe d'exemple du sujet (6 sommets, CB 2)
+SIMPLE = os.path.join(DOSSIER, "..", "M3", "testSimple.mtx.rnd")
+
+# Petits graphes : nom -> (sommets, arêtes)
+GRAPHES = {
+    "simple": lire_graphe(SIMPLE),
+    "maison": (list(range(1, 6)), [(1, 2), (2, 3), (3, 4), (4, 1), (3, 5), (4, 5), (1, 3)]),
+    "k23": (list(range(1, 6)), [(1, 3), (1, 4), (1, 5), (2, 3), (2, 4), (2, 5)]),
+    "arbre7": (list(range(1, 8)), [(1, 2), (1, 3), (2, 4), (2, 5), (3, 6), (3, 7)]),
+    "roue7": (list(range(1, 8)), [(1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7), (2, 3), (3, 4), (4, 5), (5, 6),
+                                  (6, 7), (7, 2)]),
+    "aleatoire8": (list(range(1, 9)), [(1, 5), (1, 8), (2, 6), (2, 7), (3, 4), (3, 8), (4, 6), (5, 7), (6, 8),
+                                       (2, 3), (1, 4)]),
+}
+
+
+def force_brute(sommets, aretes):
+    """
+    :return: cyclic bandwidth minimal, sur tous les étiquetages avec x(1) = 1
+    """
+    n = len(sommets)
+    return min(cyclic_bandwidth([1] + list(reste), aretes) for reste in itertools.permutations(range(2, n + 1)))
+
+
+def arguments(*options):
+    """
+    :return: options de la ligne de commande, sans valeurs de référence ni familles reconnues (les solveurs résolvent
+             vraiment le graphe)
+    """
+    return creer_parser().parse_args(["--sans-reference", "--sans-familles"] + list(options))
+
+
+@pytest.fixture(params=sorted(GRAPHES))
+def graphe(request):
+    sommets, aretes = GRAPHES[request.param]
+    return sommets, aretes, force_brute(sommets, aretes)
+
+
+def verifier_optimum(resultat, sommets, aretes, optimum):
+    """
+    Vérifie un résultat optimal : statut, cyclic bandwidth et étiquetage cohérents.
+    """
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == optimum
+    assert etiquetage_valide(resultat.etiquettes, len(sommets))
+    assert cyclic_bandwidth(resultat.etiquettes, aretes) == optimum
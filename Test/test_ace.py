@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des profils de recherche de ACE et de leur fichier de départ.
+"""
+import os
+
+from conftest import GRAPHES
+
+from cyclic_bandwidth.ace import OPTION_WARM, PROFILS_RECHERCHE, options_recherche, supprimer_depart
+
+SOMMETS, ARETES = GRAPHES["simple"]
+
+
+def fichier_depart(options):
+    return next(o[len(OPTION_WARM):] for o in options.split() if o.startswith(OPTION_WARM))
+
+
+def test_voisins_derive_de_sauvegarde():
+    assert PROFILS_RECHERCHE["voisins"] == PROFILS_RECHERCHE["sauvegarde"]
+
+
+def test_sans_fichier_de_depart():
+    assert options_recherche("domwdeg", SOMMETS, ARETES) == PROFILS_RECHERCHE["domwdeg"]
+    supprimer_depart(PROFILS_RECHERCHE["domwdeg"])  # Rien à supprimer
+
+
+def test_fichier_de_depart_supprime():
+    options = options_recherche("voisins", SOMMETS, ARETES)
+    chemin = fichier_depart(options)
+    assert sorted(map(int, open(chemin).read().split())) == SOMMETS
+    supprimer_depart(options)
+    assert not os.path.exists(chemin)
+
+    options = options_recherche("defaut", SOMMETS, ARETES, [1, 6, 4, 3, 2, 5])
+    chemin = fichier_depart(options)
+    assert open(chemin).read() == "1 6 4 3 2 5"
+    supprimer_depart(options)
+    assert not os.path.exists(chemin)
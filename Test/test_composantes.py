@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la décomposition en composantes connexes (--composantes) : résolution séparée et réassemblage.
+"""
+import pytest
+
+from conftest import GRAPHES, arguments, force_brute
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.composantes import composantes_connexes, ordre_lineaire, sous_graphe
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.mesures import Mesures
+from cyclic_bandwidth.resultat import OPTIMUM, SAT, UNSAT
+from cyclic_bandwidth.stockage import etiquetage_valide
+
+# Maison (v_1..v_5, CB 2), chaîne v_6 - v_7 - v_8 (CB 1) et sommet isolé v_9
+SOMMETS = list(range(1, 10))
+ARETES = GRAPHES["maison"][1] + [(6, 7), (7, 8)]
+
+
+def test_composantes_connexes():
+    assert composantes_connexes(SOMMETS, ARETES) == [[1, 2, 3, 4, 5], [6, 7, 8], [9]]
+    assert sous_graphe([6, 7, 8], ARETES) == ([1, 2, 3], [(1, 2), (2, 3)])
+
+
+def test_ordre_lineaire():
+    # Un cycle ne se coupe pas sans allonger une arête : le repliement au plus double les distances
+    aretes = [(i, i % 8 + 1) for i in range(1, 9)]
+    ordre = ordre_lineaire(list(range(1, 9)), aretes)
+    assert sorted(ordre) == list(range(1, 9))
+    position = {v: p for p, v in enumerate(ordre)}
+    assert max(abs(position[u] - position[v]) for (u, v) in aretes) == 2
+
+
+def blocs(etiquettes, composantes):
+    """
+    :return: True si chaque composante occupe un bloc d'étiquettes consécutives
+    """
+    return all(max(etiquettes[v - 1] for v in c) - min(etiquettes[v - 1] for v in c) == len(c) - 1
+               for c in composantes)
+
+
+@pytest.mark.parametrize("processus", ["1", "2"])
+def test_assemblage(processus):
+    mesures = Mesures()
+    resultat = resoudre(SOMMETS, ARETES, arguments("-m", "M3", "--composantes", "--processus", processus), None,
+                        mesures)
+    assert resultat.modele.endswith("/composantes")
+    assert etiquetage_valide(resultat.etiquettes, len(SOMMETS))
+    assert blocs(resultat.etiquettes, composantes_connexes(SOMMETS, ARETES))
+    assert cyclic_bandwidth(resultat.etiquettes, ARETES) == resultat.cb == resultat.borne_sup
+    # La plus grande borne des composantes est prouvée pour le graphe ; l'assemblage peut la dépasser
+    assert resultat.borne_inf == 2 <= force_brute(SOMMETS, ARETES) <= resultat.cb
+    assert resultat.statut == (OPTIMUM if resultat.cb == 2 else SAT)
+
+    # Une phase par composante avec au moins une arête, mesurée dans le processus ou dans le groupe
+    phases = mesures.en_dict()["phases"]
+    assert [(p["phase"], p.get("n"), p.get("statut")) for p in phases] == [
+        ("composantes", None, None), ("composante", 5, OPTIMUM), ("composante", 3, OPTIMUM), ("assemblage", None, None)]
+
+
+def test_assemblage_optimal():
+    # Deux chaînes et un sommet isolé : chaque chaîne se coupe sans allonger d'arête
+    sommets, aretes = list(range(1, 8)), [(1, 4), (4, 6), (2, 5), (5, 7)]
+    resultat = resoudre(sommets, aretes, arguments("-m", "M3", "--composantes", "--processus", "1"))
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == cyclic_bandwidth(resultat.etiquettes, aretes) == 1
+    assert blocs(resultat.etiquettes, composantes_connexes(sommets, aretes))
+
+
+def test_composante_insatisfiable():
+    # La maison n'a pas d'étiquetage de CB 1 : le graphe non plus
+    resultat = resoudre(SOMMETS, ARETES, arguments("-m", "M3", "--composantes", "--processus", "1", "-k", "1"))
+    assert resultat.statut == UNSAT
+    assert not resultat.etiquettes
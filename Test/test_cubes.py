@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du cube-and-conquer (M3 --cubes), seul et dans les processus du mode lot.
+"""
+import io
+import multiprocessing
+
+import pytest
+
+from conftest import GRAPHES, SIMPLE, arguments
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.cubes import resoudre_cubes
+from cyclic_bandwidth.lot import executer_lot
+from cyclic_bandwidth.m3 import clauses_bandwidth, clauses_permutation, cubes_sondage
+from cyclic_bandwidth.resultat import OPTIMUM, SAT, UNSAT
+
+
+def test_cubes(graphe):
+    sommets, aretes, optimum = graphe
+    resultat = resoudre(sommets, aretes, arguments("-m", "M3", "--cubes", "1", "--travailleurs", "2"))
+    assert "/cubes1" in resultat.modele
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == optimum
+
+
+def test_cubes_en_lot():
+    # Les processus du mode lot ne peuvent pas avoir de fils : les cubes y sont résolus l'un après l'autre
+    args = arguments("-m", "M3", "--cubes", "2", "--travailleurs", "2")
+    obtenus = executer_lot([SIMPLE], args, processus=1, sortie=io.StringIO())
+    assert len(obtenus) == 1
+    assert "erreur" not in obtenus[0]
+    assert "/cubes2" in obtenus[0]["modele"]
+    assert obtenus[0]["statut"] == OPTIMUM
+    assert obtenus[0]["cb"] == 2
+
+
+@pytest.mark.parametrize("sequentiel", [False, True], ids=["groupe", "lot"])
+def test_cubes_a_la_demande(monkeypatch, sequentiel):
+    # Les cubes sont découpés à mesure que les processus les demandent (le groupe en tire d'avance autant que son
+    # tube en contient) : en lot, un cube satisfiable arrête la découpe
+    sommets, aretes = GRAPHES["aleatoire8"]
+    n = len(sommets)
+    permutation, binaires = clauses_permutation(n)
+    tires = []
+
+    def decoupe(k):
+        for cube in cubes_sondage(n, aretes, k, 3):
+            tires.append(cube)
+            yield cube
+
+    if sequentiel:
+        monkeypatch.setattr(multiprocessing.current_process(), "daemon", True)
+    total = len(list(cubes_sondage(n, aretes, n // 2, 3)))
+    statut, _ = resoudre_cubes(permutation, (binaires, clauses_bandwidth(n, aretes, n // 2)), decoupe(n // 2), 2)
+    assert statut == SAT
+    if sequentiel:
+        assert len(tires) == 2 < total  # Le premier cube et celui tiré pour un second processus, absent en lot
+
+    del tires[:]
+    statut, _ = resoudre_cubes(permutation, (binaires, clauses_bandwidth(n, aretes, 1)), decoupe(1), 2)
+    assert statut == UNSAT
+    assert tires == list(cubes_sondage(n, aretes, 1, 3))
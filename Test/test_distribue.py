@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du lot distribué : un coordinateur et un travailleur sur la machine locale.
+"""
+import json
+import os
+import shutil
+import socket
+import threading
+
+from conftest import SIMPLE, arguments
+
+from cyclic_bandwidth.distribue import (OPTIONS, Coordinateur, executer_coordinateur, executer_travailleur,
+                                        lire_adresse, options_travail)
+from cyclic_bandwidth.resultat import OPTIMUM
+
+
+def port_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def travaux_homonymes(tmp_path):
+    # Deux instances de même nom dans deux dossiers
+    options = options_travail(arguments("-m", "M3"))
+    chemins = []
+    for dossier in ("a", "b"):
+        os.makedirs(tmp_path / dossier)
+        chemins.append(str(tmp_path / dossier / "testSimple.mtx.rnd"))
+        shutil.copy(SIMPLE, chemins[-1])
+    return [{"chemin": chemin, "variante": "M3", "options": options} for chemin in chemins]
+
+
+def test_adresse():
+    assert lire_adresse("5000") == ("127.0.0.1", 5000)
+    assert lire_adresse("0.0.0.0:5000") == ("0.0.0.0", 5000)
+
+
+def test_options_sans_chemin():
+    options = options_travail(arguments("--base", "/tmp/base.db", "--ecrire-etiquetage", "/tmp/x", "-m", "M4"))
+    assert set(options) == set(OPTIONS)
+    assert options["modele"] == "M4"
+    assert not {"base", "ecrire_etiquetage", "etiquetage", "dossier_reprise"} & set(options)
+
+
+def test_homonymes_et_reprise(tmp_path):
+    travaux = travaux_homonymes(tmp_path)
+    sortie = str(tmp_path / "resultats.jsonl")
+    adresse = ("127.0.0.1", port_libre())
+
+    obtenus = []
+    coordinateur = threading.Thread(target=lambda: obtenus.extend(executer_coordinateur(travaux, adresse, sortie)))
+    coordinateur.start()
+    assert executer_travailleur(adresse) == 2
+    coordinateur.join()
+
+    with open(sortie) as f:
+        lignes = [json.loads(ligne) for ligne in f]
+    assert sorted(ligne["chemin"] for ligne in lignes) == sorted(t["chemin"] for t in travaux)
+    assert all(ligne["statut"] == OPTIMUM and ligne["cb"] == 2 for ligne in lignes)
+
+    # Un coordinateur relancé sur le même fichier n'a plus rien à confier
+    relance = Coordinateur(travaux, sortie)
+    assert relance.termine
+    assert relance.traiter({"type": "demande", "travailleur": "t"}) == {"type": "fin"}
+    relance.fermer()
+
+
+def test_travail_rendu_a_la_file(tmp_path, monkeypatch):
+    import cyclic_bandwidth.distribue as distribue
+
+    travaux = travaux_homonymes(tmp_path)[:1]
+    coordinateur = Coordinateur(travaux, str(tmp_path / "resultats.jsonl"), essais=2)
+    monkeypatch.setattr(distribue, "BAIL", 0)  # Le travailleur est perdu dès qu'il a reçu son travail
+    for essai in (1, 2):
+        travail = coordinateur.traiter({"type": "demande", "travailleur": "t"})
+        assert travail["type"] == "travail" and travail["essai"] == essai
+        assert travail["instance"] == "testSimple.mtx.rnd"
+    coordinateur.verifier_baux()
+    assert coordinateur.termine
+    assert coordinateur.obtenus[0]["statut"] == distribue.ECHEC
+    coordinateur.fermer()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du modèle dual position -> sommet de M1 et M2 : taille posée égale à l'estimation, linéaire en n.degré.
+"""
+import pytest
+
+from conftest import DOSSIER, GRAPHES
+
+from cyclic_bandwidth.estimation import estimer_m1, estimer_m2, taille_dual
+from cyclic_bandwidth.graphe import lire_graphe, voisins
+from cyclic_bandwidth.mesures import Mesures
+
+pycsp3 = pytest.importorskip("pycsp3")
+
+BCSPWR01 = lire_graphe(DOSSIER + "/../Data/bcspwr01.mtx.rnd")
+
+
+def degre_max(sommets, aretes):
+    return max(len(v) for v in voisins(sommets, aretes).values())
+
+
+def taille_posee(construire, *parametres):
+    """
+    :return: (variables, contraintes, tuples) notés par la construction d'un modèle pycsp3
+    """
+    mesures = Mesures()
+    try:
+        construire(*parametres, mesures=mesures)
+    finally:
+        pycsp3.clear()
+    infos = mesures.en_dict()
+    return infos["variables"], infos["contraintes"], infos.get("tuples", 0)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 20])
+def test_m2_estime(k):
+    from cyclic_bandwidth.m2 import construire
+    sommets, aretes = BCSPWR01
+    n, degre = len(sommets), degre_max(sommets, aretes)
+    estimation = estimer_m2(n, len(aretes), k, dual=degre)
+    assert taille_posee(construire, sommets, aretes, k, "alldiff", True, True, False, None) \
+        == (estimation.variables, estimation.contraintes, estimation.tuples)
+    assert estimation.octets > estimer_m2(n, len(aretes), k).octets
+
+
+def test_m1_estime():
+    from cyclic_bandwidth.m1 import construire
+    sommets, aretes = BCSPWR01
+    n, degre = len(sommets), degre_max(sommets, aretes)
+    variables, contraintes, tuples = taille_posee(construire, sommets, aretes, True, True, False, None, 4)
+    estimation = estimer_m1(n, len(aretes), 4, dual=degre)
+    assert (variables, tuples) == (estimation.variables, estimation.tuples)
+    assert contraintes == estimation.contraintes + 1  # Borne supérieure de l'objectif
+
+
+def test_taille_lineaire():
+    # O(n.degré) tuples, là où une table des arêtes par paire de positions éloignées en demandait O(n².|E|)
+    n, degre = 500, 6
+    variables, contraintes, tuples = taille_dual(n, 3, degre)
+    assert tuples == n * degre
+    assert variables == contraintes - 1 == n + 2 * n * degre
+    assert taille_dual(n, None, degre) == taille_dual(n, n // 2, degre) == (n, n + 1, 0)
+    assert taille_dual(n, 3, None) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("nom", sorted(GRAPHES))
+def test_fenetre(nom, tmp_path):
+    # Chaque voisin du sommet placé en q+1 a son étiquette dans la fenêtre q+1 ± k
+    from cyclic_bandwidth.m2 import construire
+    sommets, aretes = GRAPHES[nom]
+    try:
+        construire(sommets, aretes, 1, "alldiff", True, True, False, None)
+        fichier, _ = pycsp3.compile(str(tmp_path / "dual.xml"))
+    finally:
+        pycsp3.clear()
+    with open(fichier) as f:
+        xml = f.read()
+    assert ('id="e"' in xml) == (degre_max(sommets, aretes) > 0 and len(sommets) > 3)
+    assert "<element>" in xml
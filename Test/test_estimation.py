@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de l'estimation mémoire des modèles et du budget.
+"""
+import os
+import sys
+
+import pytest
+
+from conftest import GRAPHES, arguments
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.estimation import (MemoireInsuffisante, choisir_encodage, copies_modele, estimer_m3,
+                                         format_octets, memoire_disponible, taille_domaines)
+from cyclic_bandwidth.graphe import domaines_etiquettes, optimiser_k
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc/meminfo")
+def test_memoire_disponible_compte_le_cache():
+    libres = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    assert memoire_disponible() >= libres * 0.9  # MemAvailable inclut les pages libres (à quelques pages près)
+
+
+def test_copies():
+    assert copies_modele("M3") == 1
+    assert copies_modele("M3", travailleurs=4, cubes=2) == 5
+    assert copies_modele("M3", travailleurs=4, cubes=2, maxsat=True) == 1
+    assert copies_modele("M3", travailleurs=4, cubes=2, groupe=False) == 1
+    assert copies_modele("M4", travailleurs=3) == 3
+    assert copies_modele("M4") == (os.cpu_count() or 1)
+    assert copies_modele("M2", travailleurs=8) == 1
+
+
+def test_budget_partage_entre_copies():
+    octets = estimer_m3(60, 120, 5).octets
+    assert choisir_encodage("M3", ("sequentiel",), 60, 120, 5, budget=2 * octets, copies=2).encodage == "sequentiel"
+    with pytest.raises(MemoireInsuffisante):
+        choisir_encodage("M3", ("sequentiel",), 60, 120, 5, budget=2 * octets, copies=3)
+
+
+def test_plus_petit_encodage():
+    estimation = choisir_encodage("M3", ("sequentiel", "paires"), 60, 120, 5)
+    autres = [estimer_m3(60, 120, 5, encodage) for encodage in ("sequentiel", "paires")]
+    assert estimation.octets == min(e.octets for e in autres)
+
+
+def test_resolution_refusee():
+    sommets, aretes = GRAPHES["aleatoire8"]
+    with pytest.raises(MemoireInsuffisante):
+        resoudre(sommets, aretes, arguments("-m", "M3", "--memoire-max", "0.001"))
+
+
+def test_budget_au_sondage_le_plus_couteux():
+    # Avec des domaines restreints, M3 grossit avec k : le budget porte sur la plus grande borne que la recherche
+    # peut sonder, pas sur la plus petite
+    sommets, aretes = GRAPHES["aleatoire8"]
+    n, m = len(sommets), len(aretes)
+    octets = [estimer_m3(n, m, k, domaines=taille_domaines(domaines_etiquettes(sommets, aretes, k), aretes, n, k)).octets
+              for k in (1, optimiser_k(sommets, aretes))]
+    assert octets[0] < octets[1]
+    memoire = str((octets[0] + octets[1]) / 2 / 1024 / 1024)
+    with pytest.raises(MemoireInsuffisante):
+        resoudre(sommets, aretes, arguments("-m", "M3", "-e", "sequentiel", "--domaines", "-r", "pas", "--memoire-max",
+                                            memoire))
+    resoudre(sommets, aretes, arguments("-m", "M3", "-e", "sequentiel", "--domaines", "-r", "fixe", "-k", "1",
+                                        "--memoire-max", memoire))
+
+
+def test_format_octets():
+    assert format_octets(1000) == "1000 o"
+    assert format_octets(1536) == "1.5 Ko"
+    assert format_octets(2000 * 1024 * 1024) == "2.0 Go"
+    assert format_octets(3 * 1024 ** 4) == "3.0 To"
+    assert format_octets(10 ** 40) == "plus de 1024 To"
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des fichiers d'étiquetages : écriture, relecture, validation et rejets.
+"""
+import pytest
+
+from conftest import GRAPHES, SIMPLE
+
+from cyclic_bandwidth.cli import main
+from cyclic_bandwidth.etiquetage import (EtiquetageInvalide, charger_etiquetage, ecrire_etiquetage, lire_etiquetage,
+                                         normaliser, valider)
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+
+SOMMETS, ARETES = GRAPHES["simple"]
+ETIQUETTES = [1, 6, 4, 3, 2, 5]
+
+
+def test_aller_retour(tmp_path):
+    chemin = str(tmp_path / "simple.etq")
+    cb = cyclic_bandwidth(ETIQUETTES, ARETES)
+    ecrire_etiquetage(chemin, ETIQUETTES, cb, "testSimple.mtx.rnd", "M3", "OPTIMUM")
+    assert lire_etiquetage(chemin) == (ETIQUETTES, cb)
+    resultat = charger_etiquetage(chemin, SOMMETS, ARETES)
+    assert resultat.etiquettes == ETIQUETTES and resultat.cb == cb
+
+
+@pytest.mark.parametrize("contenu", ["6 2\n1 6 4 x 2 5\n", "6 2\n1 6 4 3 2\n", "", "6 2\n1.5 6 4 3 2 5\n"])
+def test_fichier_mal_forme(tmp_path, contenu):
+    chemin = tmp_path / "mal.etq"
+    chemin.write_text(contenu)
+    with pytest.raises(EtiquetageInvalide):
+        lire_etiquetage(str(chemin))
+
+
+def test_fichier_absent(tmp_path):
+    with pytest.raises(EtiquetageInvalide):
+        lire_etiquetage(str(tmp_path / "absent.etq"))
+
+
+def test_cb_annonce_faux(tmp_path):
+    chemin = str(tmp_path / "faux.etq")
+    ecrire_etiquetage(chemin, ETIQUETTES, 1)
+    with pytest.raises(EtiquetageInvalide):
+        charger_etiquetage(chemin, SOMMETS, ARETES)
+
+
+@pytest.mark.parametrize("etiquettes", [[1, 2, 3], [1, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 7]])
+def test_pas_une_permutation(etiquettes):
+    with pytest.raises(EtiquetageInvalide):
+        valider(etiquettes, ARETES, 6)
+
+
+def test_normaliser():
+    tournees = normaliser([3, 2, 6, 5, 4, 1])
+    assert tournees[0] == 1
+    assert cyclic_bandwidth(tournees, ARETES) == cyclic_bandwidth([3, 2, 6, 5, 4, 1], ARETES)
+
+
+def test_verifier_rejette_sans_trace(tmp_path, capsys):
+    chemin = tmp_path / "mal.etq"
+    chemin.write_text("6 2\n1 6 4 x 2 5\n")
+    assert main(["-f", SIMPLE, "--verifier", str(chemin)]) == 2
+    assert main(["-f", SIMPLE, "--verifier", str(tmp_path / "absent.etq")]) == 2
+    assert main(["-f", SIMPLE, "--etiquetage", str(chemin)]) == 2
+    assert "invalide" in capsys.readouterr().out
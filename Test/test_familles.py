@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la reconnaissance des familles de graphes au cyclic bandwidth connu.
+"""
+import itertools
+
+import pytest
+
+from conftest import GRAPHES, force_brute
+
+from cyclic_bandwidth.cli import main
+from cyclic_bandwidth.familles import reconnaitre
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.stockage import etiquetage_valide
+
+
+def grille(lignes, colonnes, tore=False):
+    """
+    :return: (sommets, aretes) de la grille lignes x colonnes, refermée en tore si demandé
+    """
+    numero = lambda i, j: (i % lignes) * colonnes + j % colonnes + 1  # noqa: E731
+    aretes = set()
+    for i in range(lignes):
+        for j in range(colonnes):
+            if tore or j + 1 < colonnes:
+                aretes.add(tuple(sorted((numero(i, j), numero(i, j + 1)))))
+            if tore or i + 1 < lignes:
+                aretes.add(tuple(sorted((numero(i, j), numero(i + 1, j)))))
+    return list(range(1, lignes * colonnes + 1)), sorted(aretes)
+
+
+# Graphes des familles : nom -> (sommets, aretes, début du nom de famille, cyclic bandwidth connu)
+FAMILLES = {
+    "chaine": (list(range(1, 8)), [(i, i + 1) for i in range(1, 7)], "chaine", 1),
+    "cycle": (list(range(1, 8)), [(i, i % 7 + 1) for i in range(1, 8)], "cycle", 1),
+    "etoile": (list(range(1, 8)), [(1, i) for i in range(2, 8)], "etoile", 3),
+    "clique": (list(range(1, 7)), list(itertools.combinations(range(1, 7), 2)), "clique", 3),
+    "biparti": (list(range(1, 8)), [(i, j) for i in range(1, 4) for j in range(4, 8)], "biparti complet", 3),
+    "grille": grille(3, 3) + ("grille", 3),
+    "grille2x4": grille(2, 4) + ("grille", 2),
+    "tore": grille(5, 6, tore=True) + ("tore", 5),
+    "chenille": (list(range(1, 9)), [(1, 2), (2, 3), (3, 4), (1, 5), (2, 6), (3, 7), (4, 8)], "chenille", 2),
+}
+
+
+@pytest.mark.parametrize("nom", sorted(FAMILLES))
+def test_reconnaitre(nom):
+    sommets, aretes, famille, cb = FAMILLES[nom]
+    reconnue = reconnaitre(sommets, aretes)
+    assert reconnue is not None
+    assert reconnue.nom.startswith(famille)
+    assert reconnue.exacte
+    assert reconnue.cb == cb
+    assert etiquetage_valide(reconnue.etiquettes, len(sommets))
+    assert cyclic_bandwidth(reconnue.etiquettes, aretes) == cb
+    if len(sommets) <= 9:
+        assert force_brute(sommets, aretes) == cb
+
+
+@pytest.mark.parametrize("nom", sorted(FAMILLES))
+def test_reconnaitre_renumerote(nom):
+    # La reconnaissance ne dépend pas de la numérotation des sommets
+    sommets, aretes, famille, cb = FAMILLES[nom]
+    n = len(sommets)
+    nouveau = {v: (3 * v) % n + 1 if n % 3 else n + 1 - v for v in sommets}
+    aretes = [(nouveau[u], nouveau[v]) for u, v in aretes]
+    reconnue = reconnaitre(sommets, aretes)
+    assert reconnue is not None and reconnue.nom.startswith(famille)
+    assert cyclic_bandwidth(reconnue.etiquettes, aretes) == reconnue.cb == cb
+
+
+@pytest.mark.parametrize("nom", ["simple", "maison", "roue7", "aleatoire8"])
+def test_hors_famille(nom):
+    assert reconnaitre(*GRAPHES[nom]) is None
+
+
+def test_famille_en_ligne_de_commande(tmp_path, capsys):
+    sommets, aretes, _, cb = FAMILLES["grille"]
+    fichier = tmp_path / "grille.mtx.rnd"
+    fichier.write_text("%%MatrixMarket\n" + "{0} {0} {1}\n".format(len(sommets), len(aretes))
+                       + "".join("{} {}\n".format(u, v) for u, v in aretes))
+    assert main(["-f", str(fichier), "--sans-reference", "--base", str(tmp_path / "base.db"), "-m", "M3"]) == 0
+    assert "grille" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du mode lot : résultats au fil de l'eau, délai par instance et processus morts en cours d'instance.
+"""
+import csv
+import io
+import os
+import signal
+import time
+
+import pytest
+
+from conftest import SIMPLE, arguments
+
+from cyclic_bandwidth import lot
+from cyclic_bandwidth.lot import DELAI_DEPASSE, executer_lot, lister_instances
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM
+
+
+def simuler(chemin, args):
+    """
+    Remplace resoudre_instance dans les processus du lot : "plantage" tue le processus, "lent" dépasse le délai.
+    """
+    nom = os.path.basename(chemin)
+    if nom == "plantage":
+        os.kill(os.getpid(), signal.SIGKILL)
+    if nom == "lent":
+        time.sleep(60)
+    return {"instance": nom, "statut": OPTIMUM}
+
+
+def test_lister_instances(tmp_path):
+    for nom in ("a.mtx.rnd", "b.mtx.rnd", "notes.txt"):
+        (tmp_path / nom).write_text("")
+    attendu = [str(tmp_path / "a.mtx.rnd"), str(tmp_path / "b.mtx.rnd")]
+    assert lister_instances([str(tmp_path), attendu[0]]) == attendu
+
+
+def test_lot_csv():
+    sortie = io.StringIO()
+    obtenus = executer_lot([SIMPLE, SIMPLE + ".absent"], arguments("-m", "M3"), processus=2, sortie=sortie,
+                           format_sortie="csv")
+    lignes = {ligne["instance"]: ligne for ligne in csv.DictReader(io.StringIO(sortie.getvalue()))}
+    assert len(obtenus) == 2
+    assert lignes["testSimple.mtx.rnd"]["statut"] == OPTIMUM
+    assert lignes["testSimple.mtx.rnd"]["cb"] == "2"
+    assert lignes["testSimple.mtx.rnd.absent"]["statut"] == INCONNU
+
+
+@pytest.mark.parametrize("processus", [1, 2])
+def test_processus_mort(monkeypatch, processus):
+    # Un processus tué en cours d'instance ne bloque pas le lot : l'instance est en erreur, les suivantes sont résolues
+    monkeypatch.setattr(lot, "resoudre_instance", simuler)
+    obtenus = executer_lot(["a", "plantage", "b", "c"], arguments(), processus=processus, sortie=io.StringIO())
+    lignes = {ligne["instance"]: ligne for ligne in obtenus}
+    assert sorted(lignes) == ["a", "b", "c", "plantage"]
+    assert lignes["plantage"]["statut"] == INCONNU
+    assert "erreur" in lignes["plantage"]
+    assert all(lignes[nom]["statut"] == OPTIMUM for nom in "abc")
+
+
+def test_processus_mort_avant_delai(monkeypatch):
+    # Avec un délai, un plantage n'est pas confondu avec un dépassement
+    monkeypatch.setattr(lot, "resoudre_instance", simuler)
+    obtenus = executer_lot(["plantage", "lent", "a"], arguments(), processus=1, delai=1, sortie=io.StringIO())
+    lignes = {ligne["instance"]: ligne for ligne in obtenus}
+    assert lignes["plantage"]["statut"] == INCONNU
+    assert lignes["lent"]["statut"] == DELAI_DEPASSE
+    assert lignes["a"]["statut"] == OPTIMUM
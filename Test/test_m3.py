@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de M3 : le tampon vectorisé de la borne k contient exactement les clauses de l'encodeur par boucles, et la
+numérotation compacte du registre se décode en l'étiquetage encodé.
+"""
+import pytest
+
+from conftest import DOSSIER, GRAPHES
+
+from cyclic_bandwidth import m3
+from cyclic_bandwidth.graphe import dist_cyclique, domaines_etiquettes, lire_graphe
+from cyclic_bandwidth.m3 import Registre, clauses_bandwidth, decoder, phases_depart, x
+
+GRAPHES_M3 = dict(GRAPHES, bcspwr01=lire_graphe(DOSSIER + "/../Data/bcspwr01.mtx.rnd"))
+
+
+def clauses_boucles(n, aretes, k, registre=None):
+    """
+    Encodeur de référence, par boucles sur les étiquettes et les arêtes et un appel de x() par littéral.
+    """
+    clauses = []
+    for i, l in aretes:
+        for j in range(1, n + 1):
+            for m in range(1, n + 1):
+                if j != m and dist_cyclique(j, m, n) > k:
+                    if registre is None:
+                        clauses.append((-x(i, j, n), -x(l, m, n)))
+                    elif registre.x(i, j) and registre.x(l, m):
+                        clauses.append((-registre.x(i, j), -registre.x(l, m)))
+    return clauses
+
+
+def clauses_tampon(tampon):
+    litteraux = iter(tampon)
+    return list(zip(litteraux, litteraux))
+
+
+@pytest.fixture(params=["numpy", "array"])
+def vectorisation(request, monkeypatch):
+    if request.param == "numpy":
+        if m3.numpy is None:
+            pytest.skip("numpy absent")
+    else:
+        monkeypatch.setattr(m3, "numpy", None)
+    return request.param
+
+
+@pytest.mark.parametrize("nom", sorted(GRAPHES_M3))
+@pytest.mark.parametrize("domaines", [False, True], ids=["dense", "registre"])
+def test_clauses_bandwidth(vectorisation, nom, domaines):
+    sommets, aretes = GRAPHES_M3[nom]
+    n = len(sommets)
+    for k in range(0, n // 2 + 1) if n < 10 else (2, 3, 7):
+        registre = Registre(n, domaines_etiquettes(sommets, aretes, k)) if domaines else None
+        assert clauses_tampon(clauses_bandwidth(n, aretes, k, registre)) == clauses_boucles(n, aretes, k, registre)
+
+
+def test_tranches(monkeypatch):
+    # Le découpage en tranches d'arêtes ne change pas le tampon
+    if m3.numpy is None:
+        pytest.skip("numpy absent")
+    sommets, aretes = GRAPHES_M3["bcspwr01"]
+    n = len(sommets)
+    couples = m3.couples_eloignes(n, 3)
+    assert m3.clauses_bandwidth_numpy(n, aretes, couples, tranche=1) == clauses_bandwidth(n, aretes, 3)
+
+
+@pytest.mark.parametrize("nom", ["aleatoire8", "bcspwr01"])
+def test_registre(nom):
+    sommets, aretes = GRAPHES_M3[nom]
+    n = len(sommets)
+    domaines = domaines_etiquettes(sommets, aretes, 2)
+    registre = Registre(n, domaines)
+    c = registre.couples
+    assert c == sum(len(d) for d in domaines) < n * n
+
+    # Rangs consécutifs dans l'ordre des sommets puis des étiquettes, 0 pour les couples non permis
+    rangs = [registre.x(i, j) for i in sommets for j in range(1, n + 1)]
+    assert [r for r in rangs if r] == list(range(1, c + 1))
+    for i in sommets:
+        for j in range(1, n + 1):
+            r = registre.x(i, j)
+            assert bool(r) == (j in domaines[i - 1])
+            if r:
+                assert (registre.sommets[r], registre.etiquettes[r]) == (i, j)
+                assert registre.s(i, j) == c + r and registre.t(i, j) == 2 * c + r
+    assert registre.variables("paires") == c and registre.variables("sequentiel") == 3 * c
+    assert registre.economisees("paires") == n * n - c and registre.economisees("sequentiel") == 3 * (n * n - c)
+
+
+def test_decoder():
+    # Cycle étiqueté dans l'ordre : chaque étiquette respecte le domaine de son sommet pour k = 1
+    n = 8
+    sommets, aretes = list(range(1, n + 1)), [(i, i % n + 1) for i in range(1, n + 1)]
+    depart = list(range(1, n + 1))
+    registre = Registre(n, domaines_etiquettes(sommets, aretes, 1))
+    assert registre.couples < n * n
+
+    phases = phases_depart(depart, n, registre)
+    assert len(phases) == n
+    # Modèle complet : x du départ vrais, autres x faux, s et t quelconques (ignorés au décodage)
+    modele = [v if v in phases else -v for v in range(1, registre.couples + 1)]
+    modele += [registre.couples + 1, -(2 * registre.couples + 1)]
+    assert decoder(modele, n, registre) == depart
+    assert len(phases_depart([1, 5, 3, 4, 2, 6, 7, 8], n, registre)) == n - 1  # v_2 hors de son domaine {8, 1, 2}
+
+    dense = [v if v in phases_depart(depart, n) else -v for v in range(1, n * n + 1)] + [n * n + 1]
+    assert decoder(dense, n) == depart
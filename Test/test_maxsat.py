@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du mode MaxSAT de M3 (--maxsat) : optimum égal à la force brute et à la recherche de k.
+"""
+import pytest
+
+from conftest import GRAPHES, arguments, verifier_optimum
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.m3 import resoudre_maxsat
+from cyclic_bandwidth.resultat import UNSAT
+
+
+@pytest.mark.parametrize("options", [
+    ("-e", "sequentiel"),
+    ("-e", "paires"),
+    ("--sans-symetrie",),
+    ("--domaines",),
+], ids=" ".join)
+def test_maxsat(graphe, options):
+    sommets, aretes, optimum = graphe
+    resultat = resoudre(sommets, aretes, arguments("-m", "M3", "--maxsat", *options))
+    assert resultat.modele.endswith("/maxsat")
+    verifier_optimum(resultat, sommets, aretes, optimum)
+
+
+def test_maxsat_egal_recherche(graphe):
+    sommets, aretes, _ = graphe
+    assert resoudre(sommets, aretes, arguments("-m", "M3", "--maxsat")).cb \
+        == resoudre(sommets, aretes, arguments("-m", "M3")).cb
+
+
+def test_maxsat_sous_optimum():
+    # Sans étiquetage de CB <= k_high, les clauses dures sont insatisfiables
+    sommets, aretes = GRAPHES["roue7"]
+    resultat = resoudre_maxsat(sommets, aretes, 1, 2)
+    assert resultat.statut == UNSAT
+    assert resultat.borne_inf == 3
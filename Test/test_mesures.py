@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des mesures par phase (--stats) : arbre des phases et sondages de k écrits en JSON.
+"""
+import io
+import json
+
+from conftest import SIMPLE, arguments
+
+from cyclic_bandwidth.cli import main
+from cyclic_bandwidth.lot import executer_lot
+from cyclic_bandwidth.mesures import Mesures, noter, phase
+
+
+def test_arbre():
+    mesures = Mesures()
+    with phase(mesures, "construction", k=3):
+        noter(mesures, variables=36)
+        with phase(mesures, "clauses"):
+            noter(mesures, clauses=12)
+        mesures.ajouter("compilation", 0.5, 0.25, fichier="m.xml")
+    noter(mesures, statut="SAT")
+    arbre = mesures.en_dict()
+
+    assert arbre["phase"] == "total" and arbre["statut"] == "SAT"
+    construction, = arbre["phases"]
+    assert construction["k"] == 3 and construction["variables"] == 36
+    clauses, compilation = construction["phases"]
+    assert clauses["clauses"] == 12 and "phases" not in clauses  # Une phase sans sous-phase n'a pas de liste
+    assert compilation == {"phase": "compilation", "fichier": "m.xml", "mur": 0.5, "cpu": 0.25}
+    assert arbre["mur"] >= construction["mur"] >= clauses["mur"] >= 0
+    assert construction["cpu"] >= 0
+
+
+def test_sans_mesures():
+    with phase(None, "construction") as noeud:
+        noter(None, variables=36)
+    assert noeud is None
+
+
+def parcourir(noeud):
+    """
+    :return: phases de l'arbre, en profondeur d'abord
+    """
+    yield noeud
+    for sous_phase in noeud.get("phases", []):
+        yield from parcourir(sous_phase)
+
+
+def test_stats_json(tmp_path):
+    fichier = tmp_path / "stats.json"
+    code = main(["-f", SIMPLE, "--sans-reference", "--sans-familles", "-m", "M3", "-r", "pas", "--stats", str(fichier)])
+    assert code == 0
+    stats = json.loads(fichier.read_text())
+    assert stats["instance"] == "testSimple.mtx.rnd"
+    assert stats["statut"] == "OPTIMUM" and stats["cb"] == 2
+
+    arbre = stats["mesures"]
+    assert arbre["phase"] == "total"
+    noms = [noeud["phase"] for noeud in arbre["phases"]]
+    assert noms[:2] == ["lecture", "estimation"]
+    estimation = arbre["phases"][1]
+    assert estimation["variables"] > 0 and estimation["octets"] > 0
+
+    # Un sondage par borne de la descente, chacun avec sa construction et son solveur
+    sondages = [noeud for noeud in arbre["phases"] if noeud["phase"] == "sondage"]
+    assert [(s["k"], s["statut"]) for s in sondages] == [(3, "SAT"), (2, "SAT"), (1, "UNSAT")]
+    for sondage in sondages:
+        assert {"clauses", "chargement", "solveur"} <= {p["phase"] for p in sondage["phases"]}
+    for noeud in parcourir(arbre):
+        assert noeud["mur"] >= 0 and noeud["cpu"] >= 0
+    assert arbre["mur"] >= sum(noeud["mur"] for noeud in arbre["phases"])
+
+
+def test_stats_sortie_standard(capsys):
+    assert main(["-f", SIMPLE, "--sans-reference", "--sans-familles", "-m", "M3", "--stats"]) == 0
+    sortie = capsys.readouterr().out
+    stats = json.loads(sortie[sortie.index("{\n"):])  # Le JSON suit l'affichage du résultat
+    assert stats["cb"] == 2 and stats["mesures"]["phase"] == "total"
+
+
+def test_stats_en_lot():
+    args = arguments("-m", "M3", "--stats")
+    obtenus = executer_lot([SIMPLE], args, processus=1, sortie=io.StringIO())
+    assert obtenus[0]["cb"] == 2
+    assert any(noeud["phase"] == "sondage" for noeud in obtenus[0]["stats"]["phases"])
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des modèles M3 et M4 : optimum égal à la force brute pour chaque encodage et option.
+"""
+import pytest
+
+from conftest import arguments, verifier_optimum
+
+from cyclic_bandwidth.cli import resoudre
+
+
+@pytest.mark.parametrize("options", [
+    ("-m", "M3", "-e", "sequentiel"),
+    ("-m", "M3", "-e", "paires"),
+    ("-m", "M3", "--sans-symetrie"),
+    ("-m", "M3", "--domaines"),
+    ("-m", "M4",),
+    ("-m", "M4", "--sans-symetrie"),
+    ("-m", "M4", "--distances", "2"),
+], ids=" ".join)
+def test_optimum(graphe, options):
+    sommets, aretes, optimum = graphe
+    verifier_optimum(resoudre(sommets, aretes, arguments(*options)), sommets, aretes, optimum)
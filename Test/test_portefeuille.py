@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du portefeuille : bornes partagées entre processus par le canal, recherche de k resserrée par les bornes des
+autres variantes, et résolution combinée.
+"""
+import multiprocessing
+import queue
+
+import pytest
+
+from conftest import GRAPHES, arguments, force_brute
+
+from cyclic_bandwidth.cli import creer_parser, resoudre
+from cyclic_bandwidth.mesures import Mesures
+from cyclic_bandwidth.portefeuille import Canal, arguments_variante
+from cyclic_bandwidth.recherche import rechercher_k
+from cyclic_bandwidth.resultat import OPTIMUM, SAT
+
+# Cycle de 6 sommets et étiquetages de CB 2 et 3
+CYCLE = [(i, i % 6 + 1) for i in range(1, 7)]
+ETIQUETAGES = {2: [1, 3, 5, 6, 4, 2], 3: [1, 4, 2, 5, 3, 6]}
+
+
+def ouvrir(k_low, k_high):
+    """
+    :return: couple (Canal, file de ses messages)
+    """
+    contexte = multiprocessing.get_context()
+    messages = contexte.Queue()
+    return Canal(k_low, k_high, messages, contexte), messages
+
+
+def test_canal():
+    canal, messages = ouvrir(1, 5)
+    canal.variante = "M3"
+    assert canal.resserrer(0, 9) == (1, 5)
+    assert canal.ameliorer(borne_inf=3)
+    assert not canal.ameliorer(borne_inf=2)  # Les bornes ne font que se resserrer
+    assert canal.ameliorer(cb=4)
+    assert not canal.ameliorer(cb=6)
+    assert canal.resserrer(0, 9) == (3, 3)
+
+    canal.publier(borne_inf=2)  # N'améliore rien : pas de message
+    canal.publier(etiquettes=ETIQUETAGES[3], cb=3)
+    assert messages.get(timeout=5) == ("borne", "M3", None, ETIQUETAGES[3], 3)
+    with pytest.raises(queue.Empty):
+        messages.get(timeout=0.1)
+
+
+def publier_fils(canal):
+    canal.variante = "fils"
+    canal.publier(borne_inf=2)
+    canal.publier(etiquettes=ETIQUETAGES[3], cb=3)
+
+
+def test_canal_entre_processus():
+    # Les bornes publiées par un processus resserrent la recherche d'un autre
+    canal, messages = ouvrir(0, 5)
+    fils = multiprocessing.get_context().Process(target=publier_fils, args=(canal,))
+    fils.start()
+    fils.join()
+    assert canal.resserrer(0, 5) == (2, 2)
+    assert [messages.get(timeout=5)[1:3] for _ in range(2)] == [("fils", 2), ("fils", None)]
+
+    # Un sondage à k = 2 satisfiable ferme l'intervalle : rien n'est sondé sous la borne de l'autre processus
+    sondages = []
+
+    def sonder(k):
+        sondages.append(k)
+        return SAT, ETIQUETAGES[2]
+
+    resultat = rechercher_k("test", CYCLE, sonder, 0, 5, "pas", partage=canal)
+    assert sondages == [2]
+    assert resultat.statut == OPTIMUM and resultat.cb == 2
+    assert messages.get(timeout=5) == ("borne", None, None, ETIQUETAGES[2], 2)
+
+
+def test_arguments_variante():
+    args = arguments("-m", "M2", "-r", "pas", "--travailleurs", "3")
+    variante = arguments_variante(creer_parser(), args, "M3 --maxsat")
+    assert (variante.modele, variante.maxsat, variante.recherche, variante.travailleurs) == ("M3", True, "pas", 3)
+    assert arguments_variante(creer_parser(), args, "-m M4 --sans-symetrie").modele == "M4"
+    assert args.modele == "M2" and not args.maxsat  # Les options de la ligne de commande ne changent pas
+
+
+def test_portefeuille():
+    sommets, aretes = GRAPHES["aleatoire8"]
+    mesures = Mesures()
+    resultat = resoudre(sommets, aretes, arguments("--portefeuille", "M3 -r pas", "M3 -r dichotomie_unsat",
+                                                   "M3 -e sequentiel"), None, mesures)
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == force_brute(sommets, aretes)
+    portefeuille, = [p for p in mesures.en_dict()["phases"] if p["phase"] == "portefeuille"]
+    assert resultat.modele == "portefeuille/" + portefeuille["gagnante"]
+    assert {b["variante"] for b in portefeuille["bilan"]} == {"M3 -r pas", "M3 -r dichotomie_unsat",
+                                                              "M3 -e sequentiel"}
+    # La gagnante a fermé l'intervalle, par son résultat ou par une borne publiée en cours de recherche
+    gagnante, = [b for b in portefeuille["bilan"] if b["variante"] == portefeuille["gagnante"]]
+    assert gagnante["temps"] >= 0
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du mode profilage (--profile) : profil des fonctions, pic mémoire et sites d'allocation de chaque phase.
+"""
+import pstats
+import tracemalloc
+
+from conftest import SIMPLE
+
+from cyclic_bandwidth.cli import main
+from cyclic_bandwidth.profilage import Profilage
+
+
+def allouer(taille):
+    """
+    :return: liste de taille entiers distincts, allouée dans ce fichier
+    """
+    return [i * 1000 for i in range(taille)]
+
+
+def test_memoire_par_phase():
+    profilage = Profilage()
+    profilage.demarrer()
+    try:
+        with profilage.phase("construction"):
+            with profilage.phase("temporaire"):
+                len(allouer(100000))  # Liste et entiers : plus de 2 Mo au pic, libérés avant la fin de la phase
+            with profilage.phase("petite"):
+                allouer(10)
+            with profilage.phase("gardee"):
+                gardee = allouer(100000)  # Encore vivante à la fin de la phase : site d'allocation relevé
+    finally:
+        profilage.arreter()
+    assert not tracemalloc.is_tracing()
+    arbre = profilage.en_dict()
+
+    construction, = arbre["phases"]
+    temporaire, petite, gardee_phase = construction["phases"]
+    assert temporaire["pic_memoire_ko"] >= petite["pic_memoire_ko"] + 2000
+    assert construction["pic_memoire_ko"] >= temporaire["pic_memoire_ko"]
+    assert arbre["pic_memoire_ko"] >= construction["pic_memoire_ko"]
+    assert "allocations" not in construction  # Sites relevés sur les phases sans sous-phase
+    site = gardee_phase["allocations"][0]
+    assert "test_profilage.py" in site["site"] and site["ko"] >= 2000
+    assert all(noeud["mur"] >= 0 for noeud in (construction, temporaire, petite, gardee_phase))
+    assert len(gardee) == 100000
+
+
+def test_profile_en_ligne_de_commande(tmp_path):
+    prefixe = str(tmp_path / "profil")
+    code = main(["-f", SIMPLE, "--sans-reference", "--sans-familles", "-m", "M3", "-r", "fixe", "-k", "2",
+                 "--profile", prefixe])
+    assert code == 0
+    assert not tracemalloc.is_tracing()
+
+    fonctions = {fonction for (_, _, fonction) in pstats.Stats(prefixe + ".prof").stats}
+    assert {"clauses_bandwidth", "sonder"} <= fonctions
+
+    rapport = (tmp_path / "profil.txt").read_text()
+    assert "=== Fonctions les plus coûteuses (temps propre) ===" in rapport
+    assert "=== Mémoire par phase" in rapport
+    assert "sondage k=2 statut=SAT : pic" in rapport
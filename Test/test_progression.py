@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du suivi des solveurs : relevés périodiques des compteurs de pysat et lecture de la sortie de ACE.
+"""
+from pysat.examples.genhard import PHP
+from pysat.solvers import Glucose3
+
+from cyclic_bandwidth import progression
+from cyclic_bandwidth.mesures import Mesures
+from cyclic_bandwidth.progression import COMPTEURS, Progression, compteurs_ace, resoudre_pysat
+
+
+def test_releves(capsys):
+    assert not Progression().actif
+    assert Progression().resume() == {}
+
+    mesures = Mesures()
+    with mesures.phase("solveur"):
+        suivi = Progression(mesures, trace=True)
+        suivi.relever(conflits=10, decisions=25, autre=1)
+        suivi.relever(conflits=40, decisions=90, memoire_ko=2048)
+        suivi.terminer()
+    solveur, = mesures.en_dict()["phases"]
+    assert solveur["conflits"] == 40 and solveur["memoire_ko"] == 2048
+    assert [sorted(r) for r in solveur["progression"]] == [["conflits", "decisions", "t"],
+                                                           ["conflits", "decisions", "memoire_ko", "t"]]
+    lignes = capsys.readouterr().out.splitlines()
+    assert len(lignes) == 2 and lignes[1].endswith("40 conflits, 90 decisions, 2048 memoire_ko")
+
+
+def test_resoudre_pysat_par_tranches(monkeypatch):
+    # Les pigeons : 7 pigeons dans 6 trous, insatisfiable après de nombreux conflits
+    monkeypatch.setattr(progression, "TRANCHE_CONFLITS", 100)
+    mesures = Mesures()
+    with mesures.phase("solveur"):
+        with Glucose3(bootstrap_with=PHP(6).clauses) as solver:
+            assert resoudre_pysat(solver, mesures, intervalle=0) is False
+    releves = mesures.en_dict()["phases"][0]["progression"]
+    assert len(releves) > 1  # Un relevé par tranche, l'intervalle étant nul
+    for avant, apres in zip(releves, releves[1:]):
+        assert apres["t"] >= avant["t"]
+        assert apres["conflits"] >= avant["conflits"] + 100  # Les tranches se cumulent
+    assert set(COMPTEURS) <= set(releves[-1])
+
+    with Glucose3(bootstrap_with=PHP(6).clauses) as solver:
+        assert resoudre_pysat(solver) is False  # D'une traite, sans relevé
+
+
+def test_compteurs_ace():
+    sortie = "\n".join([
+        "  Run  0  wrg=120  nodes=1,340  effs=25k  mem=45M",
+        "  Run  1  wrg=480  nodes=5,120  effs=98213  mem=46M",
+        "  => Optimum found  revisions=1.5M",
+    ])
+    assert compteurs_ace(sortie) == {"conflits": 480, "decisions": 5120, "propagations": 98213,
+                                     "memoire_ko": 46 * 1024, "redemarrages": 2}
+    assert compteurs_ace("") == {}
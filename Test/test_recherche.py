@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des stratégies de recherche de k, sur M3 et sur des sondages simulés.
+"""
+import pytest
+
+from conftest import GRAPHES, arguments, force_brute, verifier_optimum
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.recherche import METHODES, Partage, rechercher_k
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT
+
+# Cycle de 6 sommets et étiquetages de CB 1, 2 et 3
+CYCLE = [(i, i % 6 + 1) for i in range(1, 7)]
+ETIQUETAGES = {1: [1, 2, 3, 4, 5, 6], 2: [1, 3, 5, 6, 4, 2], 3: [1, 4, 2, 5, 3, 6]}
+
+
+class Journal(Partage):
+    """
+    Partage qui note les publications et impose une borne inférieure.
+    """
+
+    def __init__(self, borne_inf):
+        self.borne_inf = borne_inf
+        self.publications = []
+
+    def resserrer(self, k_low, k_high):
+        return max(k_low, self.borne_inf), k_high
+
+    def publier(self, borne_inf=None, etiquettes=None, cb=None):
+        self.publications.append((borne_inf, cb))
+
+
+@pytest.mark.parametrize("methode", [m for m in METHODES if m != "fixe"])
+def test_recherche(graphe, methode):
+    sommets, aretes, optimum = graphe
+    verifier_optimum(resoudre(sommets, aretes, arguments("-m", "M3", "-r", methode)), sommets, aretes, optimum)
+
+
+def test_recherche_fixe():
+    # Un seul sondage, à la borne donnée : satisfiable à l'optimum, insatisfiable juste en dessous
+    sommets, aretes = GRAPHES["roue7"]
+    optimum = force_brute(sommets, aretes)
+    resultat = resoudre(sommets, aretes, arguments("-m", "M3", "-r", "fixe", "-k", str(optimum)))
+    assert resultat.statut in (SAT, OPTIMUM)
+    assert resultat.cb == optimum
+    resultat = resoudre(sommets, aretes, arguments("-m", "M3", "-r", "fixe", "-k", str(optimum - 1)))
+    assert resultat.statut == UNSAT
+
+
+@pytest.mark.parametrize("methode", METHODES)
+def test_rechercher_k(methode):
+    # Sondages simulés : satisfiables dès k >= 1, avec un étiquetage de CB min(k, 3)
+    sondages = []
+
+    def sonder(k):
+        sondages.append(k)
+        return (UNSAT, None) if k < 1 else (SAT, ETIQUETAGES[min(k, 3)])
+
+    resultat = rechercher_k("test", CYCLE, sonder, 0, 3, methode)
+    if methode == "fixe":
+        assert sondages == [3]
+        assert resultat.statut == SAT
+        assert resultat.cb == 3
+    else:
+        assert resultat.statut == OPTIMUM
+        assert resultat.cb == 1
+        assert 0 in sondages  # L'optimum n'est prouvé que par le sondage insatisfiable sous lui
+
+
+def test_saut_au_cb_mesure():
+    # Un sondage satisfiable à k = 5 qui rend un étiquetage de CB 2 fait sonder ensuite sous 2
+    sondages = []
+
+    def sonder(k):
+        sondages.append(k)
+        return (UNSAT, None) if k < 2 else (SAT, ETIQUETAGES[2])
+
+    resultat = rechercher_k("test", CYCLE, sonder, 0, 5, "pas")
+    assert sondages == [5, 1]
+    assert resultat.statut == OPTIMUM and resultat.cb == 2
+
+
+def test_rechercher_k_partage():
+    # La borne du partage coupe la recherche ; chaque sondage y est publié
+    journal = Journal(borne_inf=3)
+    resultat = rechercher_k("test", CYCLE, lambda k: (SAT, ETIQUETAGES[3]), 0, 5, partage=journal)
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == 3
+    assert journal.publications == [(None, 3)]
+
+
+def test_rechercher_k_inconnu():
+    resultat = rechercher_k("test", [(1, 2)], lambda k: (INCONNU, None), 0, 1)
+    assert resultat.statut == INCONNU
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des valeurs de référence publiées : bornes du cyclic bandwidth tirées du bandwidth et bornes de départ de la
+recherche.
+"""
+import os
+
+from conftest import DOSSIER, GRAPHES
+
+from cyclic_bandwidth import cli
+from cyclic_bandwidth.cli import creer_parser, resoudre
+from cyclic_bandwidth.graphe import lire_graphe
+from cyclic_bandwidth.references import Reference, charger_references, ecart, reference
+from cyclic_bandwidth.resultat import OPTIMUM
+
+
+def test_bornes():
+    references = charger_references()
+    assert len(references) == 113
+    for ref in references.values():
+        assert ref.borne_inf == -(-ref.borne_inf_bw // 2)  # ceil(LB / 2)
+        assert ref.borne_sup == min(ref.meilleur_bw, ref.n // 2)
+        assert 1 <= ref.borne_inf <= ref.borne_sup
+
+
+def test_instances_du_dossier():
+    # Chaque instance du dossier a ses valeurs de référence, pour son nombre de sommets et d'arêtes
+    donnees = os.path.join(DOSSIER, "Data")
+    instances = [f for f in os.listdir(donnees) if f.endswith(".mtx.rnd")]
+    assert instances
+    for instance in instances:
+        sommets, aretes = lire_graphe(os.path.join(donnees, instance))
+        assert reference(os.path.join(donnees, instance), sommets, aretes) is not None, instance
+
+
+def test_autre_graphe():
+    # Un graphe d'un autre nombre de sommets ou d'arêtes ne reçoit pas les bornes d'une instance du même nom
+    sommets, aretes = GRAPHES["simple"]
+    assert reference("pores_1.mtx.rnd", sommets, aretes) is None
+    assert reference("inconnue.mtx.rnd", sommets, aretes) is None
+    assert reference(None, sommets, aretes) is None
+
+
+def test_ecart():
+    assert ecart(5, 4) == 25.0
+    assert ecart(3, 4) == -25.0
+    assert ecart(2, 3) == -33.33
+    assert ecart(None, 4) is None
+    assert ecart(3, 0) is None
+
+
+def test_bornes_de_depart(monkeypatch, capsys):
+    # La recherche part des bornes de la référence : aucun sondage sous la borne inférieure prouvée
+    sommets, aretes = GRAPHES["aleatoire8"]
+    cb = 3
+    ref = Reference("aleatoire8.mtx.rnd", len(sommets), len(aretes), 2 * cb - 1, cb)
+    monkeypatch.setattr(cli, "reference", lambda instance, s, a: ref if instance == ref.instance else None)
+    args = creer_parser().parse_args(["--sans-familles", "-m", "M3", "-r", "pas", "-t"])
+    resultat = resoudre(sommets, aretes, args, ref.instance)
+    sortie = capsys.readouterr().out
+    assert "Bornes de départ tirées de la référence : 3 3" in sortie
+    assert "pour 2" not in sortie
+    assert resultat.statut == OPTIMUM
+    assert resultat.cb == cb
+
+    cli.afficher(resultat, args, ref)
+    assert "écart +0.00% au meilleur bandwidth publié" in capsys.readouterr().out
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des points de reprise de la recherche de k.
+"""
+import os
+
+import pytest
+
+from conftest import GRAPHES, arguments, force_brute
+
+import cyclic_bandwidth.cli as cli
+from cyclic_bandwidth.etiquetage import EtiquetageInvalide
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, Resultat
+from cyclic_bandwidth.reprise import Reprise, chemin_reprise
+from cyclic_bandwidth.stockage import empreinte_graphe
+
+SOMMETS, ARETES = GRAPHES["aleatoire8"]
+EMPREINTE = empreinte_graphe(SOMMETS, ARETES)
+ETIQUETTES = list(range(1, 9))
+CB = cyclic_bandwidth(ETIQUETTES, ARETES)
+
+
+def test_aller_retour(tmp_path):
+    chemin = str(tmp_path / "point.json")
+    reprise = Reprise(chemin)
+    reprise.publier(borne_inf=2)
+    reprise.publier(etiquettes=ETIQUETTES, cb=CB)
+    reprise.publier(borne_inf=1)  # Une borne plus faible ne remplace pas la précédente
+
+    etat = Reprise(chemin).charger(ARETES, len(SOMMETS))
+    assert etat.statut == SAT and etat.etiquettes == ETIQUETTES and etat.borne_inf == 2
+    assert etat.cb == CB
+
+    reprise.terminer(Resultat("M3", SAT, ETIQUETTES, CB))
+    assert os.path.exists(chemin)
+    reprise.terminer(Resultat("M3", OPTIMUM, ETIQUETTES, CB))
+    assert not os.path.exists(chemin)
+
+
+def test_borne_seule_et_fichier_abime(tmp_path):
+    chemin = tmp_path / "point.json"
+    Reprise(str(chemin)).publier(borne_inf=2)
+    assert Reprise(str(chemin)).charger(ARETES, len(SOMMETS)).statut == INCONNU
+    chemin.write_text("{coupé")
+    assert Reprise(str(chemin)).charger(ARETES, len(SOMMETS)) is None
+    assert Reprise(str(tmp_path / "absent.json")).charger(ARETES, len(SOMMETS)) is None
+
+
+def test_etiquetage_invalide(tmp_path):
+    reprise = Reprise(str(tmp_path / "point.json"))
+    reprise.publier(etiquettes=[1, 2, 3], cb=1)
+    with pytest.raises(EtiquetageInvalide):
+        Reprise(reprise.chemin).charger(ARETES, len(SOMMETS))
+
+
+def test_cle_selon_les_options(tmp_path):
+    m3 = chemin_reprise(str(tmp_path), "g", EMPREINTE, arguments("-m", "M3"))
+    assert m3 == chemin_reprise(str(tmp_path), "g", EMPREINTE, arguments("-m", "M3", "-t"))
+    assert m3 != chemin_reprise(str(tmp_path), "g", EMPREINTE, arguments("-m", "M3", "-r", "galop"))
+
+
+def test_rien_d_ecrit_sans_option(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "DOSSIER_REPRISE", str(tmp_path))
+    args = arguments("-m", "M3")
+    publies = []
+    monkeypatch.setattr(Reprise, "publier", lambda self, **bornes: publies.append(bornes))
+    cli.resoudre(SOMMETS, ARETES, args, "g")
+    assert publies == [] and os.listdir(str(tmp_path)) == []
+
+
+def test_reprendre(tmp_path):
+    optimum = force_brute(SOMMETS, ARETES)
+    args = arguments("-m", "M3", "--reprendre", "--dossier-reprise", str(tmp_path))
+    chemin = chemin_reprise(str(tmp_path), "g", EMPREINTE, args)
+    reprise = Reprise(chemin)
+    reprise.publier(borne_inf=optimum - 1)
+    reprise.publier(etiquettes=ETIQUETTES, cb=CB)
+
+    resultat = cli.resoudre(SOMMETS, ARETES, args, "g")
+    assert resultat.statut == OPTIMUM and resultat.cb == optimum
+    assert not os.path.exists(chemin)  # Recherche aboutie : point de reprise effacé
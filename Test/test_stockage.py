@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la base des résolutions : bornes rassemblées et étiquetages revérifiés.
+"""
+from conftest import GRAPHES, arguments
+
+from cyclic_bandwidth.cli import resoudre
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, Resultat
+from cyclic_bandwidth.stockage import Stockage, empreinte_graphe
+
+SOMMETS, ARETES = GRAPHES["simple"]
+EMPREINTE = empreinte_graphe(SOMMETS, ARETES)
+
+
+def test_empreinte_independante_de_l_ordre():
+    assert empreinte_graphe(SOMMETS, list(reversed(ARETES))) == EMPREINTE
+    assert empreinte_graphe(SOMMETS, [(v, u) for (u, v) in ARETES]) == EMPREINTE
+    assert empreinte_graphe(SOMMETS + [7], ARETES) != EMPREINTE
+
+
+def test_graphe_inconnu(tmp_path):
+    with Stockage(str(tmp_path / "base.db")) as base:
+        assert base.meilleur(EMPREINTE, ARETES, len(SOMMETS)) is None
+
+
+def test_bornes_rassemblees(tmp_path):
+    with Stockage(str(tmp_path / "base.db")) as base:
+        base.enregistrer(EMPREINTE, 6, 6, Resultat("M3", SAT, [1, 2, 3, 4, 5, 6], 3, borne_inf=1, borne_sup=3))
+        base.enregistrer(EMPREINTE, 6, 6, Resultat("M2", INCONNU, borne_inf=2))
+        connu = base.meilleur(EMPREINTE, ARETES, len(SOMMETS))
+    assert connu.statut == SAT and connu.cb == 3 and connu.borne_inf == 2
+
+    with Stockage(str(tmp_path / "base.db")) as base:
+        base.enregistrer(EMPREINTE, 6, 6, Resultat("M4", SAT, [1, 6, 4, 3, 2, 5], 2, borne_inf=1, borne_sup=2))
+        connu = base.meilleur(EMPREINTE, ARETES, len(SOMMETS))
+    assert connu.statut == OPTIMUM and connu.cb == 2 and connu.modele == "M4"
+
+
+def test_etiquetage_d_une_autre_taille_ignore(tmp_path):
+    with Stockage(str(tmp_path / "base.db")) as base:
+        base.enregistrer(EMPREINTE, 6, 6, Resultat("M3", SAT, [1, 2, 3], 1, borne_inf=1, borne_sup=1))
+        base.enregistrer(EMPREINTE, 6, 6, Resultat("M3", SAT, [1, 2, 3, 4, 5, 6], 3, borne_inf=1, borne_sup=3))
+        connu = base.meilleur(EMPREINTE, ARETES, len(SOMMETS))
+    assert connu.etiquettes == [1, 2, 3, 4, 5, 6] and connu.cb == 3
+
+
+def test_instance_fermee_non_resolue(tmp_path):
+    base = str(tmp_path / "base.db")
+    premier = resoudre(SOMMETS, ARETES, arguments("-m", "M3", "--base", base))
+    assert premier.statut == OPTIMUM
+    second = resoudre(SOMMETS, ARETES, arguments("-m", "M4", "--base", base))
+    assert second.statut == OPTIMUM and second.cb == premier.cb and second.modele == premier.modele
+    with Stockage(base) as stockage:
+        assert stockage.connexion.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 1
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Calcul du cyclic bandwidth d'un graphe avec les modèles M1 (optimisation, ACE), M2 (décision, ACE) et M3 (SAT).
+"""
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Profils de recherche du solveur ACE utilisés par les modèles pycsp3 (M1 et M2).
+"""
+import os
+import tempfile
+import time
+
+from cyclic_bandwidth.graphe import etiquetage_largeur
+from cyclic_bandwidth.progression import SuiviAce
+
+# Profils de recherche de ACE, sélectionnables avec --strategie (options transmises telles quelles au solveur)
+PROFILS_RECHERCHE = {
+    "defaut": "",  # Réglages par défaut de ACE
+    "domwdeg": "-varh=WdegOnDom -valh=First",  # dom/wdeg, plus petite étiquette d'abord
+    "domwdeg_luby": "-varh=WdegOnDom -valh=First -luby -r_c=100",  # dom/wdeg avec redémarrages de Luby
+    "last_conflict": "-varh=WdegOnDom -lc=2 -r_c=100 -r_f=1.1",  # last-conflict et redémarrages géométriques
+    "sauvegarde": "-varh=WdegOnDom -lc=1 -sos=1",  # sauvegarde de phase sur la dernière solution
+}
+# Même profil que "sauvegarde", démarré sur un étiquetage proche des voisins (voir options_recherche)
+PROFILS_RECHERCHE["voisins"] = PROFILS_RECHERCHE["sauvegarde"]
+# Option de ACE qui donne le fichier de l'étiquetage de départ
+OPTION_WARM = "-warm="
+
+
+def options_recherche(strategie, sommets, aretes, depart=None):
+    """
+    Construit les options ACE d'un profil de recherche.
+    Le profil "voisins" démarre la sauvegarde de phase sur l'étiquetage en largeur : le choix de valeur
+    privilégie alors une étiquette proche de celles des voisins déjà placés.
+    Un étiquetage de départ donné remplace l'étiquetage en largeur, quel que soit le profil.
+
+    :param strategie: nom du profil (clé de PROFILS_RECHERCHE)
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param depart: étiquetage de départ (None : aucun)
+    :return: chaîne d'options pour ACE ; le fichier de départ qu'elle désigne est à supprimer après la résolution
+             (voir supprimer_depart)
+    """
+    options = PROFILS_RECHERCHE[strategie]
+    if strategie == "voisins" or depart is not None:
+        etiquettes = depart if depart is not None else etiquetage_largeur(sommets, aretes)
+        with tempfile.NamedTemporaryFile("w", prefix="warm_", suffix=".txt", delete=False) as f:
+            f.write(" ".join(str(e) for e in etiquettes))
+        options += " " + OPTION_WARM + f.name
+    return options
+
+
+def supprimer_depart(options):
+    """
+    Supprime le fichier de l'étiquetage de départ écrit par options_recherche, s'il y en a un.
+
+    :param options: chaîne d'options pour ACE
+    """
+    for option in options.split():
+        if option.startswith(OPTION_WARM):
+            try:
+                os.remove(option[len(OPTION_WARM):])
+            except OSError:
+                pass
+
+
+def fichier_instance():
+    """
+    Nom du fichier XCSP3 compilé par pycsp3, propre au processus pour que des résolutions parallèles
+    ne s'écrasent pas.
+
+    :return: chemin du fichier dans le dossier temporaire
+    """
+    return os.path.join(tempfile.gettempdir(), "cyclic_bandwidth_" + str(os.getpid()) + ".xml")
+
+
+def lancer_ace(options_ace="", mesures=None, trace=False):
+    """
+    Compile le modèle pycsp3 courant et le résout avec ACE.
+    pycsp3 enchaîne les deux dans un seul appel : le temps du solveur (java compris) est celui que pycsp3 mesure
+    autour du processus ACE, le reste est attribué à la compilation.
+    La sortie de ACE est suivie pendant la résolution (voir progression.SuiviAce).
+
+    :param options_ace: options transmises à ACE
+    :param mesures: Mesures où ajouter les phases "compilation" et "solveur" (None : pas de mesure)
+    :param trace: affiche les compteurs de ACE pendant la résolution
+    :return: statut pycsp3 de la résolution
+    """
+    from pycsp3 import solve, solver
+
+    fichier = fichier_instance()
+    mur, cpu_python, cpu_fils = time.perf_counter(), time.process_time(), os.times()
+    with SuiviAce(mesures, trace) as suivi:
+        result = solve(solver="ACE", options=options_ace, filename=fichier)
+    if mesures is not None:
+        mur = time.perf_counter() - mur
+        fils = os.times()
+        mur_solveur = float(solver().last_command_wck or 0) if solver() is not None else 0
+        mesures.ajouter("compilation", mur - mur_solveur, time.process_time() - cpu_python,
+                        octets_xml=os.path.getsize(fichier) if os.path.exists(fichier) else None)
+        mesures.ajouter("solveur", mur_solveur, fils.children_user + fils.children_system - cpu_fils.children_user
+                        - cpu_fils.children_system, **suivi.progression.resume())
+    return result
@@ -0,0 +1,752 @@
+# -*- coding: utf-8 -*-
+"""
+Point d'entrée unique `cyclic-bandwidth` : choisit le modèle (M1, M2, M3, M4), son encodage, la rupture de symétrie
+et la stratégie de recherche par options.
+Les solveurs (pycsp3, pysat, ortools) ne sont importés qu'une fois le modèle choisi.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from cyclic_bandwidth.ace import PROFILS_RECHERCHE, options_recherche, supprimer_depart
+from cyclic_bandwidth.distribue import ESSAIS
+from cyclic_bandwidth.estimation import (MemoireInsuffisante, choisir_encodage, copies_modele, format_octets,
+                                         memoire_disponible, taille_domaines)
+from cyclic_bandwidth.etiquetage import (EtiquetageInvalide, charger_etiquetage, chemin_etiquetage, ecrire_etiquetage,
+                                         normaliser)
+from cyclic_bandwidth.familles import reconnaitre
+from cyclic_bandwidth.graphe import domaines_etiquettes, lire_graphe, optimiser_k, paires_distance, voisins
+from cyclic_bandwidth.mesures import Mesures, noter, phase
+from cyclic_bandwidth.recherche import METHODES
+from cyclic_bandwidth.references import ecart, reference
+from cyclic_bandwidth.reprise import DOSSIER as DOSSIER_REPRISE, Reprise, chemin_reprise
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+# Encodages disponibles pour chaque modèle, le premier est celui par défaut
+ENCODAGES = {
+    "M1": ("alldiff",),
+    "M2": ("alldiff", "permutations"),
+    "M3": ("sequentiel", "paires"),
+    "M4": ("alldiff",),
+}
+
+
+def creer_parser():
+    """
+    Construit le parser des options de la ligne de commande.
+
+    :return: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="cyclic-bandwidth", description="Calcul du cyclic bandwidth d'un graphe.")
+    # Option trace
+    parser.add_argument(
+        "-t", "--trace",
+        action="store_true",
+        help="Active le mode trace"
+    )
+    # Option pour spécifier le nom du fichier de graphe
+    parser.add_argument(
+        "-f", "--fichier",
+        default="testSimple.mtx.rnd",
+        help="Nom du fichier à traiter (défaut : testSimple.mtx.rnd)")
+    # Option pour choisir le modèle
+    parser.add_argument(
+        "-m", "--modele",
+        default="M3",
+        choices=list(ENCODAGES),
+        help="Modèle à résoudre (défaut : M3)")
+    # Option pour choisir l'encodage
+    parser.add_argument(
+        "-e", "--encodage",
+        default=None,
+        choices=sorted({e for encodages in ENCODAGES.values() for e in encodages}),
+        help="Encodage du modèle (défaut : celui dont la mémoire estimée est la plus faible)")
+    # Option du budget mémoire
+    parser.add_argument(
+        "--memoire-max",
+        type=float,
+        default=None,
+        help="Mémoire maximale du modèle en Mo : la résolution est refusée si l'estimation, multipliée par les "
+             "copies du modèle (processus des cubes de M3, travailleurs de CP-SAT), la dépasse (défaut : mémoire "
+             "disponible ; 0 : pas de limite)")
+    # Option pour désactiver la rupture de symétrie
+    parser.add_argument(
+        "--sans-symetrie",
+        action="store_true",
+        help="Ne fixe pas l'étiquette de v_1 à 1")
+    # Option pour choisir la recherche de k (M2, M3)
+    parser.add_argument(
+        "-r", "--recherche",
+        default="dichotomie",
+        choices=METHODES,
+        help="Recherche de k pour M2/M3 : un sondage (fixe), descente (pas), dichotomie, galop depuis la borne "
+             "heuristique ou dichotomie biaisée vers la borne inférieure (dichotomie_unsat) ; chaque sondage "
+             "satisfiable ramène la borne supérieure sous le CB de son étiquetage (défaut : dichotomie)")
+    # Option pour spécifier la borne k
+    parser.add_argument(
+        "-k", "--kval",
+        type=int,
+        default=None,
+        help="Borne supérieure de départ du cyclic bandwith (défaut : optimiser_k)")
+    # Option pour choisir le profil de recherche de ACE
+    parser.add_argument(
+        "-s", "--strategie",
+        default="defaut",
+        choices=list(PROFILS_RECHERCHE),
+        help="Profil de recherche de ACE pour M1/M2 (défaut : defaut)")
+    # Option pour ajouter le modèle dual position -> sommet
+    parser.add_argument(
+        "-d", "--dual",
+        action="store_true",
+        help="Ajoute le modèle dual (position -> sommet) canalisé avec x, et l'adjacence vue des positions : les "
+             "voisins du sommet placé en q sont dans la fenêtre q ± k (M2 ; M1 sur la borne supérieure de l'objectif)"
+    )
+    # Option pour brancher sur les positions du modèle dual
+    parser.add_argument(
+        "-b", "--branche-dual",
+        action="store_true",
+        help="Branche sur les positions du modèle dual (implique --dual)"
+    )
+    # Options de résolution en parallèle (M4, cubes de M3) et du modèle M4 (CP-SAT)
+    parser.add_argument(
+        "--travailleurs",
+        type=int,
+        default=0,
+        help="Nombre de travailleurs en parallèle : recherche de CP-SAT pour M4, processus des cubes de M3 "
+             "(défaut : nombre de coeurs)")
+    parser.add_argument(
+        "--temps-max",
+        type=float,
+        default=None,
+        help="Temps maximal de la recherche de M4 en secondes : rend le meilleur étiquetage trouvé et la meilleure "
+             "borne inférieure prouvée (défaut : aucun)")
+    # Option de résolution MaxSAT de M3
+    parser.add_argument(
+        "--maxsat",
+        action="store_true",
+        help="M3 : un seul appel MaxSAT (RC2) avec un indicateur souple par niveau de k, au lieu de la recherche "
+             "de k (--recherche ignoré)")
+    # Option de découpe des sondages de M3 en cubes résolus en parallèle
+    parser.add_argument(
+        "--cubes",
+        type=int,
+        default=0,
+        metavar="PROFONDEUR",
+        help="M3 : découpe chaque sondage sur les étiquettes des PROFONDEUR sommets de plus haut degré, cubes résolus "
+             "en parallèle par --travailleurs processus (0 par défaut : pas de découpe ; ignoré avec --maxsat)")
+    # Option de restriction des domaines des étiquettes
+    parser.add_argument(
+        "--domaines",
+        action="store_true",
+        help="Restreint les étiquettes de chaque sommet à distance cyclique <= d.k de 1, d étant sa distance à v_1 "
+             "(sans effet avec --sans-symetrie)")
+    # Option des contraintes redondantes sur les sommets proches
+    parser.add_argument(
+        "--distances",
+        type=int,
+        default=0,
+        metavar="R",
+        help="Ajoute, pour les sommets à distance d de 2 à R dans le graphe, la contrainte redondante distance "
+             "cyclique <= d.k (M1/M2/M4, 2 : graphe carré ; 0 par défaut : aucune)")
+    # Option pour désactiver la reconnaissance des familles de graphes
+    parser.add_argument(
+        "--sans-familles",
+        action="store_true",
+        help="Ne reconnaît pas les familles de graphes au cyclic bandwidth connu (chaîne, cycle, étoile, clique, "
+             "biparti complet, grilles, tore, chenille) et lance toujours le solveur")
+    # Option de décomposition en composantes connexes
+    parser.add_argument(
+        "-c", "--composantes",
+        action="store_true",
+        help="Résout séparément les composantes connexes d'un graphe non connexe, en parallèle avec --processus, "
+             "puis assemble leurs étiquetages"
+    )
+    # Option du portefeuille de variantes
+    parser.add_argument(
+        "--portefeuille",
+        nargs="+",
+        default=None,
+        metavar="VARIANTE",
+        help="Résout l'instance avec plusieurs variantes en parallèle, chacune donnée par son modèle et ses options "
+             "(ex. \"M3\" \"M3 --maxsat\" \"M1 -s voisins\") : les bornes sont partagées entre les recherches de k, "
+             "et toutes s'arrêtent dès que l'optimum est prouvé ; la variante gagnante est reportée dans le modèle")
+    # Options du mode lot
+    parser.add_argument(
+        "-l", "--lot",
+        nargs="+",
+        default=None,
+        help="Résout par lot les fichiers ou dossiers d'instances donnés (remplace --fichier)")
+    parser.add_argument(
+        "-j", "--processus",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Nombre de processus du mode lot ou des composantes connexes (défaut : nombre de coeurs)")
+    parser.add_argument(
+        "--delai",
+        type=float,
+        default=None,
+        help="Délai maximal par instance en secondes, mode lot ou portefeuille (défaut : aucun)")
+    parser.add_argument(
+        "--format",
+        default="jsonl",
+        choices=("jsonl", "csv"),
+        help="Format des résultats du mode lot (défaut : jsonl)")
+    parser.add_argument(
+        "-o", "--sortie",
+        default=None,
+        help="Fichier des résultats du mode lot (défaut : sortie standard)")
+    # Options du lot distribué
+    parser.add_argument(
+        "--coordinateur",
+        default=None,
+        metavar="[HOTE:]PORT",
+        help="Distribue le lot (--lot) aux travailleurs qui se connectent à cette adresse (port seul : 127.0.0.1 ; "
+             "0.0.0.0:PORT pour d'autres machines, sur un réseau de confiance) : chaque couple (instance, variante) "
+             "est un travail, rendu à la file si son travailleur s'arrête ; les résultats sont ajoutés au fichier "
+             "--sortie en lignes JSON, et un coordinateur relancé saute les travaux qui y sont déjà. Les options de "
+             "fichiers (--base, --etiquetage...) ne sont pas transmises aux travailleurs")
+    parser.add_argument(
+        "--variantes",
+        nargs="+",
+        default=None,
+        metavar="VARIANTE",
+        help="Variantes du lot distribué, chacune donnée par son modèle et ses options comme pour --portefeuille "
+             "(défaut : les options de la commande)")
+    parser.add_argument(
+        "--travailleur",
+        default=None,
+        metavar="[HOTE:]PORT",
+        help="Résout les travaux d'un coordinateur (--coordinateur) jusqu'à la fin de son lot")
+    parser.add_argument(
+        "--essais",
+        type=int,
+        default=ESSAIS,
+        help="Nombre de fois qu'un travail du lot distribué est confié avant d'être déclaré en échec (défaut : "
+             + str(ESSAIS) + ")")
+    # Options des points de reprise de la recherche de k
+    parser.add_argument(
+        "--reprendre",
+        action="store_true",
+        help="Reprend une recherche de k interrompue (M2/M3) depuis son point de reprise : borne inférieure prouvée "
+             "et meilleur étiquetage, écrits après chaque sondage pour l'instance et les options")
+    parser.add_argument(
+        "--dossier-reprise",
+        default=None,
+        help="Dossier des points de reprise, écrits après chaque sondage même sans --reprendre (défaut avec "
+             "--reprendre : " + DOSSIER_REPRISE + " ; sans l'une de ces options, aucun point de reprise n'est écrit)")
+    # Options des fichiers d'étiquetages
+    parser.add_argument(
+        "--etiquetage",
+        default=None,
+        help="Étiquetage de départ (fichier .etq, ou dossier de fichiers INSTANCE.etq en mode lot) : validé, il "
+             "borne la recherche sous son CB et sert de point de départ au solveur")
+    parser.add_argument(
+        "--ecrire-etiquetage",
+        default=None,
+        help="Écrit l'étiquetage trouvé dans ce fichier .etq (mode lot : dans ce dossier, un fichier par instance)")
+    parser.add_argument(
+        "--verifier",
+        default=None,
+        help="Vérifie un fichier d'étiquetage sur le graphe (permutation, CB annoncé) sans rien résoudre")
+    # Option pour ignorer les valeurs de référence
+    parser.add_argument(
+        "--sans-reference",
+        action="store_true",
+        help="Ne part pas des bornes tirées des valeurs de référence de l'instance")
+    # Options de la base des résolutions
+    parser.add_argument(
+        "--base",
+        default=None,
+        help="Base SQLite des résolutions : part des meilleures bornes connues et saute les instances fermées "
+             "(défaut : aucune)")
+    parser.add_argument(
+        "--forcer",
+        action="store_true",
+        help="Résout sans tenir compte de la base (le résultat y est tout de même enregistré)")
+    # Option des mesures par phase
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        default=None,
+        help="Écrit en JSON les temps (réel, CPU) de chaque phase et sondage et les tailles des modèles, dans le "
+             "fichier donné ou sur la sortie standard (mode lot : ajoutés à chaque résultat)")
+    # Option du mode profilage
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profil",
+        default=None,
+        help="Profile la résolution (cProfile et tracemalloc) et écrit PREFIXE.prof et le rapport PREFIXE.txt "
+             "(défaut : profil)")
+    return parser
+
+
+def resoudre_modele(sommets, aretes, args, k_low, k_high, mesures=None, depart=None, partage=None):
+    """
+    Résout le graphe avec la variante choisie par les options.
+    Seul le module du modèle choisi (et donc son solveur) est importé.
+    Avec --composantes, un graphe non connexe est résolu composante par composante (voir composantes).
+    Un graphe d'une famille reconnue (voir familles) reçoit directement son étiquetage optimal, sans solveur ;
+    quand l'optimalité n'est pas certifiée, le solveur ne cherche qu'entre la borne de la famille et son étiquetage.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param args: options de la ligne de commande
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param depart: étiquetage de départ des solveurs (None : aucun)
+    :param partage: bornes partagées avec les autres variantes d'un portefeuille (voir portefeuille.Canal), utilisées
+                    par la recherche de k de M2 et M3 ; None : aucun partage
+    :return: Resultat de la résolution
+    """
+    if args.composantes and aretes:
+        from cyclic_bandwidth.composantes import composantes_connexes, resoudre_par_composantes
+
+        with phase(mesures, "composantes"):
+            composantes = composantes_connexes(sommets, aretes)
+            noter(mesures, composantes=len(composantes))
+        if len(composantes) > 1:
+            return resoudre_par_composantes(sommets, aretes, composantes, args, k_low, k_high, mesures)
+
+    if args.sans_familles:
+        return lancer_modele(sommets, aretes, args, k_low, k_high, mesures, depart, partage)
+
+    with phase(mesures, "familles"):
+        famille = reconnaitre(sommets, aretes)
+        noter(mesures, famille=famille.nom if famille else None)
+    if famille is None:
+        return lancer_modele(sommets, aretes, args, k_low, k_high, mesures, depart, partage)
+
+    modele = "famille/" + famille.nom
+    if args.trace:
+        print("Famille reconnue :", famille.nom + ", étiquetage de CB", famille.cb, "et borne inférieure",
+              famille.borne_inf)
+    if famille.exacte:
+        if famille.cb > k_high:  # Même réponse que le solveur sous une borne trop basse
+            return Resultat(modele, UNSAT, borne_inf=famille.cb)
+        return Resultat(modele, OPTIMUM, famille.etiquettes, famille.cb, borne_inf=famille.cb, borne_sup=famille.cb)
+
+    connu = Resultat(modele, SAT, famille.etiquettes, famille.cb, borne_inf=famille.borne_inf, borne_sup=famille.cb)
+    try:
+        resultat = lancer_modele(sommets, aretes, args, max(k_low, famille.borne_inf), min(k_high, famille.cb - 1),
+                                 mesures, depart, partage)
+    except MemoireInsuffisante as e:
+        if args.trace: print("Mémoire insuffisante, étiquetage de la famille seul :", e)
+        return connu
+    return combiner(resultat, connu)
+
+
+def lancer_modele(sommets, aretes, args, k_low, k_high, mesures=None, depart=None, partage=None):
+    """
+    Estime, construit et résout le modèle choisi par les options (voir resoudre_modele pour les paramètres).
+    L'étiquetage de départ est tourné pour respecter la rupture de symétrie, puis donné au solveur : fichier de départ
+    de ACE (M1, M2), phases des variables (M3) ou indication (M4).
+
+    :return: Resultat de la résolution
+    :raises MemoireInsuffisante: si aucun encodage ne tient dans le budget mémoire
+    """
+    symetrie = not args.sans_symetrie
+
+    # Estimation de la taille du modèle au sondage le plus coûteux avant toute construction
+    with phase(mesures, "estimation"):
+        encodages = (args.encodage,) if args.encodage else ENCODAGES[args.modele]
+        if args.memoire_max is None:
+            budget = memoire_disponible()
+        else:
+            budget = int(args.memoire_max * 1024 * 1024) if args.memoire_max > 0 else None
+        redondantes = None
+        if args.distances >= 2 and args.modele != "M3":
+            redondantes = paires_distance(sommets, aretes, args.distances)
+        copies = copies_modele(args.modele, args.travailleurs, args.cubes, args.maxsat,
+                               not multiprocessing.current_process().daemon)
+        degre = None
+        if (args.dual or args.branche_dual) and args.modele in ("M1", "M2"):
+            degre = max((len(v) for v in voisins(sommets, aretes).values()), default=0)
+
+        def estimer(k, budget=None):
+            domaines = None
+            if args.domaines and symetrie and args.modele == "M3":
+                domaines = taille_domaines(domaines_etiquettes(sommets, aretes, k), aretes, len(sommets), k)
+            return choisir_encodage(args.modele, encodages, len(sommets), len(aretes), k, symetrie, budget, domaines,
+                                    {d: len(p) for d, p in redondantes.items()} if redondantes else None, copies,
+                                    degre)
+
+        # Toute borne de [k_low, k_high] peut être sondée, sauf en recherche fixe : les couples éloignés de M3 croissent
+        # quand k diminue, mais les tables de M2, le modèle dual et les domaines restreints croissent avec k
+        sondages = [k_high] if args.recherche == "fixe" else range(min(k_low, k_high), k_high + 1)
+        k_pire = max(sondages, key=lambda k: estimer(k).octets)
+        estimation = estimer(k_pire, budget)
+        encodage = estimation.encodage
+        noter(mesures, encodage=encodage, k=k_pire, variables=estimation.variables,
+              contraintes=estimation.contraintes, tuples=estimation.tuples, octets=estimation.octets, copies=copies)
+    if args.trace:
+        print("Encodage", encodage, ": environ", estimation.variables, "variables,", estimation.contraintes,
+              "clauses ou contraintes,", format_octets(estimation.octets), "pour k =", k_pire)
+
+    etiquettes = None
+    if depart is not None and depart.etiquettes:
+        etiquettes = normaliser(depart.etiquettes) if symetrie else depart.etiquettes
+    options_ace = options_recherche(args.strategie, sommets, aretes, etiquettes) if args.modele in ("M1", "M2") else ""
+    try:
+        module = importlib.import_module("cyclic_bandwidth." + args.modele.lower())
+
+        if args.modele == "M1":
+            return module.resoudre(sommets, aretes, symetrie, args.dual, args.branche_dual, options_ace, args.trace,
+                                   k_low, k_high, mesures, args.domaines, redondantes)
+        if args.modele == "M4":
+            return module.resoudre(sommets, aretes, symetrie, args.travailleurs, args.temps_max, args.trace, k_low,
+                                   k_high, mesures, args.domaines, redondantes, etiquettes)
+        if args.modele == "M2":
+            return module.resoudre(sommets, aretes, k_low, k_high, args.recherche, encodage, symetrie, args.dual,
+                                   args.branche_dual, options_ace, args.trace, mesures, args.domaines, redondantes,
+                                   partage=partage)
+        return module.resoudre(sommets, aretes, k_low, k_high, args.recherche, encodage, symetrie, args.trace, mesures,
+                               args.domaines, args.maxsat, etiquettes, args.cubes, args.travailleurs, partage=partage)
+    finally:
+        supprimer_depart(options_ace)  # Fichier de départ de ACE, relu à chaque sondage de M2
+
+
+def resoudre_variantes(sommets, aretes, args, k_low, k_high, mesures=None, depart=None, reprise=None):
+    """
+    Résout le graphe avec la variante des options, ou avec le portefeuille de variantes de --portefeuille (voir
+    portefeuille.resoudre_portefeuille ; autres paramètres : voir resoudre_modele).
+
+    :param reprise: Reprise où écrire l'état de la recherche de k après chaque sondage (None : aucun point de
+                    reprise ; sans effet sur un portefeuille)
+    :return: Resultat de la résolution
+    """
+    if not args.portefeuille:
+        return resoudre_modele(sommets, aretes, args, k_low, k_high, mesures, depart, partage=reprise)
+
+    from cyclic_bandwidth.portefeuille import arguments_variante, resoudre_portefeuille
+
+    parser = creer_parser()
+    variantes = {variante: arguments_variante(parser, args, variante) for variante in args.portefeuille}
+    return resoudre_portefeuille(sommets, aretes, variantes, k_low, k_high, args.delai, args.trace, mesures, depart)
+
+
+def combiner(resultat, connu):
+    """
+    Combine le résultat d'une résolution avec ce qui est déjà connu du graphe (base, famille reconnue) :
+    la plus grande borne inférieure et le meilleur des deux étiquetages sont retenus.
+
+    :param resultat: Resultat de la résolution
+    :param connu: Resultat déjà connu (voir Stockage.meilleur), None si le graphe est inconnu
+    :return: Resultat combiné
+    """
+    if connu is None:
+        return resultat
+    bornes_inf = [b for b in (resultat.borne_inf, connu.borne_inf) if b is not None]
+    borne_inf = max(bornes_inf) if bornes_inf else None
+
+    meilleur = resultat
+    if connu.etiquettes and (not resultat.etiquettes or connu.cb < resultat.cb):
+        meilleur = connu
+    if not meilleur.etiquettes:
+        return Resultat(resultat.modele, resultat.statut, borne_inf=borne_inf)
+
+    cb = meilleur.cb
+    statut = OPTIMUM if borne_inf is not None and borne_inf >= cb else SAT
+    return Resultat(resultat.modele, statut, meilleur.etiquettes, cb,
+                    borne_inf=min(borne_inf, cb) if borne_inf is not None else None, borne_sup=cb)
+
+
+def resoudre(sommets, aretes, args, instance=None, mesures=None):
+    """
+    Résout le graphe avec la variante choisie par les options.
+    Les bornes tirées des valeurs de référence de l'instance resserrent l'intervalle de départ : la recherche s'arrête
+    dès qu'elle atteint la borne inférieure, sans sondage insatisfiable pour la confirmer.
+    Avec une base (--base), la recherche part du meilleur intervalle connu, une instance déjà fermée n'est pas
+    résolue à nouveau et chaque résolution y est enregistrée.
+    Un étiquetage de départ (--etiquetage, ou le meilleur de la base) borne la recherche sous son CB et est donné
+    aux solveurs comme point de départ.
+    Avec --reprendre ou --dossier-reprise, l'état de la recherche de k est écrit après chaque sondage dans un point
+    de reprise (voir reprise), relu avec --reprendre et effacé quand la recherche aboutit.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param args: options de la ligne de commande
+    :param instance: nom du fichier de l'instance, enregistré dans la base
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :return: Resultat de la résolution
+    :raises EtiquetageInvalide: si l'étiquetage de départ n'est pas valide pour le graphe
+    """
+    k_low = 1 if aretes else 0  # Toute arête a une distance cyclique d'au moins 1
+    k_high = args.kval if args.kval is not None else optimiser_k(sommets, aretes)
+
+    ref = None if args.sans_reference else reference(instance, sommets, aretes)
+    if ref is not None:
+        k_low = max(k_low, ref.borne_inf)
+        k_high = min(k_high, ref.borne_sup)
+        if args.trace: print("Bornes de départ tirées de la référence :", k_low, k_high)
+
+    depart = None
+    if args.etiquetage is not None:
+        chemin = chemin_etiquetage(args.etiquetage, instance or "")
+        if not os.path.isdir(args.etiquetage) or os.path.exists(chemin):  # Dossier : les instances sans fichier partent de rien
+            depart = charger_etiquetage(chemin, sommets, aretes)
+            k_high = min(k_high, depart.cb - 1)
+            if args.trace: print("Étiquetage de départ de CB", depart.cb, ": borne supérieure", k_high)
+
+    from cyclic_bandwidth.stockage import Stockage, empreinte_graphe
+
+    empreinte = empreinte_graphe(sommets, aretes)
+    reprise = None
+    if args.reprendre or args.dossier_reprise is not None:
+        dossier = args.dossier_reprise if args.dossier_reprise is not None else DOSSIER_REPRISE
+        reprise = Reprise(chemin_reprise(dossier, instance, empreinte, args))
+    if args.reprendre:
+        etat = reprise.charger(aretes, len(sommets))
+        if etat is not None:
+            if etat.borne_inf is not None:
+                k_low = max(k_low, etat.borne_inf)
+            if etat.etiquettes:
+                k_high = min(k_high, etat.cb - 1)
+                if depart is None or etat.cb < depart.cb:
+                    depart = etat
+            if args.trace: print("Bornes de départ tirées du point de reprise :", k_low, k_high)
+
+    if args.base is None:
+        resultat = resoudre_variantes(sommets, aretes, args, k_low, k_high, mesures, depart, reprise)
+        if reprise is not None:
+            reprise.terminer(resultat)
+        return combiner(resultat, depart)
+
+    with Stockage(args.base) as base:
+        connu = None if args.forcer else base.meilleur(empreinte, aretes, len(sommets))
+    if connu is not None:
+        if connu.statut == OPTIMUM:
+            if args.trace: print("Instance fermée dans la base, CB =", connu.cb)
+            return connu
+        # Intervalle de départ resserré : au-dessus de la borne inférieure prouvée, sous le meilleur étiquetage connu
+        if connu.borne_inf is not None:
+            k_low = max(k_low, connu.borne_inf)
+        if connu.etiquettes:
+            k_high = min(k_high, connu.cb - 1)
+            if depart is None or connu.cb < depart.cb:
+                depart = connu
+        if args.trace: print("Bornes de départ tirées de la base :", k_low, k_high)
+
+    debut = time.perf_counter()
+    resultat = resoudre_variantes(sommets, aretes, args, k_low, k_high, mesures, depart, reprise)
+    temps = time.perf_counter() - debut
+    if reprise is not None:
+        reprise.terminer(resultat)
+
+    options = {cle: getattr(args, cle) for cle in ("encodage", "sans_symetrie", "recherche", "kval", "strategie", "dual",
+                                                   "branche_dual", "composantes", "sans_familles", "domaines",
+                                                   "distances", "maxsat", "travailleurs", "temps_max", "cubes",
+                                                   "portefeuille")}
+    with Stockage(args.base) as base:
+        base.enregistrer(empreinte, len(sommets), len(aretes), resultat, options, round(temps, 4), instance)
+    return combiner(combiner(resultat, connu), depart)
+
+
+def afficher(resultat, args, ref=None):
+    """
+    Affiche le résultat au même format que les scripts des modèles.
+
+    :param resultat: Resultat de la résolution
+    :param args: options de la ligne de commande
+    :param ref: Reference de l'instance, pour afficher l'écart (None : pas d'écart affiché)
+    """
+    if resultat.statut == UNSAT:
+        print("Unsat : problème non résolu.")
+    elif resultat.statut == INCONNU:
+        print("Pas de retour du solveur. ")
+    else:
+        print(resultat.statut.capitalize() + " (" + resultat.modele + ")")
+        print("Valeurs des étiquettes :")
+        for i, e in enumerate(resultat.etiquettes, start=1):
+            print("Sommet v_" + str(i) + " -> Étiquette", e)
+        print("CYCLIC_BANDWIDTH :", resultat.cb)
+        if args.modele in ("M1", "M2"):
+            print("STRATEGIE :", args.strategie)
+        if ref is not None:
+            print("REFERENCE : cyclic bandwidth dans [" + str(ref.borne_inf) + ", " + str(ref.borne_sup) + "], écart",
+                  "%+.2f%%" % ecart(resultat.cb, ref.borne_sup), "au meilleur bandwidth publié,",
+                  "%+.2f%%" % ecart(resultat.cb, ref.borne_inf), "à la borne inférieure")
+
+
+def statistiques(mesures, resultat, instance=None):
+    """
+    Rassemble les mesures d'une résolution pour --stats.
+
+    :param mesures: Mesures de la résolution
+    :param resultat: Resultat de la résolution
+    :param instance: nom du fichier de l'instance
+    :return: dictionnaire sérialisable en JSON
+    """
+    return {
+        "instance": instance,
+        "modele": resultat.modele,
+        "statut": resultat.statut,
+        "cb": resultat.cb,
+        "mesures": mesures.en_dict(),
+    }
+
+
+def executer_lot(args):
+    """
+    Mode lot : résout toutes les instances données par --lot et écrit les résultats au fil de l'eau.
+
+    :param args: options de la ligne de commande
+    :return: code retour (0 : ok, 2 : au moins une instance sans résultat)
+    """
+    from cyclic_bandwidth.lot import executer_lot as executer, lister_instances
+
+    instances = lister_instances(args.lot)
+    sortie = open(args.sortie, "w", newline="") if args.sortie else sys.stdout
+    try:
+        obtenus = executer(instances, args, args.processus, args.delai, sortie, args.format)
+    finally:
+        if args.sortie:
+            sortie.close()
+    return 0 if all(ligne.get("etiquettes") or ligne["statut"] == UNSAT for ligne in obtenus) else 2
+
+
+def executer_coordinateur(args, parser):
+    """
+    Lot distribué : sert les travaux (instance, variante) de --lot et --variantes aux travailleurs, et ajoute leurs
+    résultats au fichier --sortie.
+
+    :param args: options de la ligne de commande
+    :param parser: parser de la ligne de commande, pour les options des variantes
+    :return: code retour (0 : ok, 2 : au moins un travail sans résultat)
+    """
+    from cyclic_bandwidth.distribue import executer_coordinateur as executer, lire_adresse, options_travail
+    from cyclic_bandwidth.lot import lister_instances
+    from cyclic_bandwidth.portefeuille import arguments_variante
+
+    variantes = {variante: options_travail(arguments_variante(parser, args, variante))
+                 for variante in args.variantes or [""]}
+    travaux = [{"chemin": chemin, "variante": variante, "options": options}
+               for chemin in lister_instances(args.lot) for variante, options in variantes.items()]
+    obtenus = executer(travaux, lire_adresse(args.coordinateur), args.sortie, args.essais, args.trace)
+    return 0 if all(ligne.get("etiquettes") or ligne["statut"] == UNSAT for ligne in obtenus) else 2
+
+
+def executer_travailleur(args):
+    """
+    Travailleur du lot distribué : résout les travaux du coordinateur --travailleur.
+
+    :param args: options de la ligne de commande
+    :return: code retour (0 : ok, 2 : coordinateur injoignable)
+    """
+    from cyclic_bandwidth.distribue import CoordinateurInjoignable, executer_travailleur as executer, lire_adresse
+
+    try:
+        resolus = executer(lire_adresse(args.travailleur), trace=args.trace)
+    except CoordinateurInjoignable as e:
+        print("Coordinateur injoignable :", e)
+        return 2  # Code retour erreur quelconque
+    if args.trace: print("Travaux résolus :", resolus)
+    return 0  # Code retour ok
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la commande cyclic-bandwidth.
+
+    :param argv: arguments de la ligne de commande (défaut : sys.argv)
+    :return: code retour (0 : ok, 1 : insatisfiable, 2 : erreur quelconque)
+    """
+    parser = creer_parser()
+    args = parser.parse_args(argv)
+
+    if args.encodage is not None and args.encodage not in ENCODAGES[args.modele]:
+        parser.error("encodage " + args.encodage + " indisponible pour " + args.modele)
+
+    for variante in args.portefeuille or ():
+        from cyclic_bandwidth.portefeuille import arguments_variante
+
+        arguments_variante(parser, args, variante)  # Une variante aux options invalides s'arrête ici
+
+    if args.travailleur is not None:
+        return executer_travailleur(args)
+
+    if args.lot is not None:
+        if args.profile or args.verifier or args.portefeuille:
+            parser.error("--profile, --verifier et --portefeuille ne s'utilisent que sur une seule instance")
+        if args.ecrire_etiquetage is not None:
+            os.makedirs(args.ecrire_etiquetage, exist_ok=True)  # Un fichier par instance dans ce dossier
+        if args.coordinateur is not None:
+            if args.sortie is None or args.format != "jsonl":
+                parser.error("--coordinateur ajoute ses résultats à un fichier --sortie en lignes JSON")
+            for variante in args.variantes or ():
+                from cyclic_bandwidth.portefeuille import arguments_variante
+
+                if arguments_variante(parser, args, variante).portefeuille:
+                    parser.error("--portefeuille ne s'utilise que sur une seule instance")
+            return executer_coordinateur(args, parser)
+        return executer_lot(args)
+
+    mesures = None
+    if args.profile:
+        from cyclic_bandwidth.profilage import Profilage
+
+        mesures = Profilage()
+        mesures.demarrer()
+    elif args.stats:
+        mesures = Mesures()
+
+    # Lecture du graphe, une seule fois pour toute la résolution
+    try:
+        with phase(mesures, "lecture"):
+            sommets, aretes = lire_graphe(args.fichier)
+    except (OSError, ValueError) as e:
+        print("Graphe illisible :", e)
+        return 2  # Code retour erreur quelconque
+    if args.trace:
+        print("sommets (" + str(len(sommets)) + ") :", sommets)
+        print("aretes :", aretes)
+
+    instance = os.path.basename(args.fichier)
+    if args.verifier is not None:
+        try:
+            verifie = charger_etiquetage(args.verifier, sommets, aretes)
+        except EtiquetageInvalide as e:
+            print("Étiquetage invalide :", e)
+            return 2  # Code retour erreur quelconque
+        print("Étiquetage valide, CYCLIC_BANDWIDTH :", verifie.cb)
+        return 0  # Code retour ok
+
+    try:
+        resultat = resoudre(sommets, aretes, args, instance, mesures)
+    except MemoireInsuffisante as e:
+        print("Mémoire insuffisante :", e)
+        return 2  # Code retour erreur quelconque
+    except EtiquetageInvalide as e:
+        print("Étiquetage de départ invalide :", e)
+        return 2  # Code retour erreur quelconque
+    if args.profile:
+        mesures.arreter()
+        mesures.ecrire(args.profile)
+    afficher(resultat, args, reference(args.fichier, sommets, aretes))
+    if args.ecrire_etiquetage is not None and resultat.etiquettes:
+        ecrire_etiquetage(chemin_etiquetage(args.ecrire_etiquetage, instance), resultat.etiquettes, resultat.cb,
+                          instance, resultat.modele, resultat.statut)
+
+    if args.stats:
+        stats = json.dumps(statistiques(mesures, resultat, instance), indent=2, ensure_ascii=False)
+        if args.stats == "-":
+            print(stats)
+        else:
+            with open(args.stats, "w") as f:
+                f.write(stats + "\n")
+
+    if resultat.statut == UNSAT:
+        return 1  # Code retour insatisfiable
+    if resultat.statut == INCONNU:
+        return 2  # Code retour erreur quelconque
+    return 0  # Code retour ok
+
+
+if __name__ == "__main__":
+    sys.exit(main())
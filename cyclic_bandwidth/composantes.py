@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Décomposition d'un graphe non connexe en composantes connexes, résolues séparément puis réassemblées.
+
+Le cyclic bandwidth d'une composante minore celui du graphe : retirer des sommets du cycle des étiquettes ne fait que
+raccourcir les arcs entre les sommets restants. La plus grande borne inférieure des composantes est donc prouvée pour
+le graphe entier. L'étiquetage global place les composantes bout à bout, chacune coupée (ou repliée) à l'endroit qui
+allonge le moins ses arêtes.
+"""
+import copy
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cyclic_bandwidth.graphe import cyclic_bandwidth, optimiser_k, voisins
+from cyclic_bandwidth.mesures import Mesures, noter, phase
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+
+def composantes_connexes(sommets, aretes):
+    """
+    Calcule les composantes connexes du graphe par parcours en largeur.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: liste des composantes (listes triées de sommets), la plus grande d'abord
+    """
+    adjacence = voisins(sommets, aretes)
+    vus = set()
+    composantes = []
+    for depart in sommets:
+        if depart not in vus:
+            vus.add(depart)
+            composante = []
+            file = deque([depart])
+            while file:
+                u = file.popleft()
+                composante.append(u)
+                for v in adjacence[u]:
+                    if v not in vus:
+                        vus.add(v)
+                        file.append(v)
+            composantes.append(sorted(composante))
+    composantes.sort(key=len, reverse=True)
+    return composantes
+
+
+def sous_graphe(composante, aretes):
+    """
+    Renumérote une composante en 1..n_c, dans l'ordre de ses sommets.
+
+    :param composante: liste triée des sommets de la composante
+    :param aretes: Arêtes du graphe
+    :return: couple (sommets, aretes) de la composante renumérotée
+    """
+    numero = {v: i for i, v in enumerate(composante, start=1)}
+    locales = [(numero[u], numero[v]) for (u, v) in aretes if u in numero]
+    return list(range(1, len(composante) + 1)), locales
+
+
+def ordre_lineaire(etiquettes, aretes):
+    """
+    Déplie un étiquetage cyclique en un ordre linéaire des sommets, pour le placer dans un bloc d'étiquettes
+    consécutives d'un cycle plus grand.
+    Toutes les coupures du cycle sont essayées, ainsi que le repliement (1, n, 2, n-1, ...) qui au plus double
+    les distances ; l'ordre retenu est celui de plus petite largeur linéaire.
+
+    :param etiquettes: étiquetage cyclique de la composante (la i-ème valeur est l'étiquette de v_i)
+    :param aretes: Arêtes de la composante
+    :return: liste des sommets dans l'ordre du bloc
+    """
+    n = len(etiquettes)
+    sommet = [0] * (n + 1)  # étiquette -> sommet
+    for i, e in enumerate(etiquettes, start=1):
+        sommet[e] = i
+
+    def largeur(ordre):
+        position = {v: p for p, v in enumerate(ordre)}
+        return max([abs(position[u] - position[v]) for (u, v) in aretes], default=0)
+
+    candidats = [sommet[c:] + sommet[1:c] for c in range(1, n + 1)]  # Coupure avant l'étiquette c
+    repli = []
+    for q in range(1, n // 2 + 1):
+        repli += [sommet[q], sommet[n + 1 - q]]
+    if n % 2:
+        repli.append(sommet[n // 2 + 1])
+    candidats.append(repli)
+    return min(candidats, key=largeur)
+
+
+def assembler(n, composantes, etiquetages, aretes_locales):
+    """
+    Assemble les étiquetages des composantes en un étiquetage du graphe : les composantes occupent des blocs
+    d'étiquettes consécutives, dans l'ordre de la liste.
+
+    :param n: nombre de sommets du graphe
+    :param composantes: listes des sommets (numérotation du graphe) de chaque composante
+    :param etiquetages: étiquetage cyclique de chaque composante
+    :param aretes_locales: arêtes renumérotées de chaque composante
+    :return: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    """
+    etiquettes = [0] * n
+    prochaine = 1
+    for composante, etiquetage, locales in zip(composantes, etiquetages, aretes_locales):
+        for v in ordre_lineaire(etiquetage, locales):
+            etiquettes[composante[v - 1] - 1] = prochaine
+            prochaine += 1
+    return etiquettes
+
+
+def resoudre_composante(sommets, aretes, args, k_high, mesures=None):
+    """
+    Résout une composante connexe, de la borne inférieure 1 à la borne supérieure donnée.
+
+    :param sommets: Sommets de la composante
+    :param aretes: Arêtes de la composante
+    :param args: options de la ligne de commande
+    :param k_high: borne supérieure de départ
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :return: Resultat de la résolution
+    """
+    from cyclic_bandwidth.cli import resoudre_modele
+
+    return resoudre_modele(sommets, aretes, args, 1, min(k_high, optimiser_k(sommets, aretes)), mesures)
+
+
+def resoudre_composante_isolee(sommets, aretes, args, k_high, avec_mesures=False):
+    """
+    Résout une composante dans un processus du groupe, avec ses propres mesures.
+
+    :param avec_mesures: mesure les phases de la résolution (autres paramètres : voir resoudre_composante)
+    :return: couple (Resultat, arbre des phases ou None)
+    """
+    mesures = Mesures() if avec_mesures else None
+    resultat = resoudre_composante(sommets, aretes, args, k_high, mesures)
+    return resultat, mesures.en_dict() if mesures is not None else None
+
+
+def resoudre_par_composantes(sommets, aretes, composantes, args, k_low, k_high, mesures=None):
+    """
+    Résout chaque composante avec au moins une arête, en parallèle si plusieurs processus sont demandés,
+    puis combine les résultats.
+    Chaque composante part de la borne inférieure 1 (la borne du graphe peut dépasser son optimum) et de la borne
+    supérieure du graphe, qui la majore aussi.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param composantes: composantes connexes (voir composantes_connexes)
+    :param args: options de la ligne de commande
+    :param k_low: borne inférieure prouvée de départ du graphe
+    :param k_high: borne supérieure de départ du graphe
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :return: Resultat de la résolution
+    """
+    sous_graphes = [sous_graphe(c, aretes) for c in composantes]
+    a_resoudre = [i for i, (_, locales) in enumerate(sous_graphes) if locales]  # Les sommets isolés n'ont rien à résoudre
+    args_composante = copy.copy(args)
+    args_composante.composantes = False
+    if args.trace: print("Composantes connexes :", [len(c) for c in composantes])
+
+    # Pas de groupe dans un processus du mode lot, qui ne peut pas avoir de fils
+    processus = min(args.processus, len(a_resoudre))
+    resultats = {}
+    if processus > 1 and not multiprocessing.current_process().daemon:
+        with ProcessPoolExecutor(max_workers=processus) as groupe:
+            futurs = {i: groupe.submit(resoudre_composante_isolee, *sous_graphes[i], args_composante, k_high,
+                                       mesures is not None) for i in a_resoudre}
+            for i in a_resoudre:
+                resultats[i], arbre = futurs[i].result()
+                if mesures is not None:  # Phases mesurées dans le processus du groupe
+                    sous_phases = {"phases": arbre["phases"]} if arbre["phases"] else {}
+                    mesures.ajouter("composante", arbre["mur"], arbre["cpu"], n=len(composantes[i]),
+                                    m=len(sous_graphes[i][1]), statut=resultats[i].statut, **sous_phases)
+    else:
+        for i in a_resoudre:
+            with phase(mesures, "composante", n=len(composantes[i]), m=len(sous_graphes[i][1])):
+                resultats[i] = resoudre_composante(*sous_graphes[i], args_composante, k_high, mesures)
+                noter(mesures, statut=resultats[i].statut)
+
+    modele = (resultats[a_resoudre[0]].modele if a_resoudre else "vide") + "/composantes"
+    bornes_inf = [k_low] + [resultats[i].borne_inf for i in a_resoudre if resultats[i].borne_inf is not None]
+    borne_inf = max(bornes_inf) if bornes_inf else None
+    statuts = {resultats[i].statut for i in a_resoudre}
+    if UNSAT in statuts:  # Une composante sans étiquetage sous k_high : le graphe n'en a pas non plus
+        return Resultat(modele, UNSAT, borne_inf=borne_inf)
+    if INCONNU in statuts:
+        return Resultat(modele, INCONNU, borne_inf=borne_inf)
+
+    with phase(mesures, "assemblage"):
+        etiquetages = [resultats[i].etiquettes if i in resultats else [1] for i in range(len(composantes))]
+        etiquettes = assembler(len(sommets), composantes, etiquetages, [locales for _, locales in sous_graphes])
+        cb = cyclic_bandwidth(etiquettes, aretes)
+    if args.trace: print("Composantes assemblées : CB =", cb, "borne inférieure", borne_inf)
+    statut = OPTIMUM if borne_inf is not None and cb <= borne_inf else SAT
+    return Resultat(modele, statut, etiquettes, cb, borne_inf=min(borne_inf, cb) if borne_inf is not None else None,
+                    borne_sup=cb)
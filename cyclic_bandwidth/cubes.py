@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Cube-and-conquer : un sondage SAT difficile est découpé en cubes (hypothèses sur quelques littéraux, voir
+m3.cubes_sondage), résolus en parallèle par un groupe de processus.
+Chaque processus charge la formule une seule fois et garde ses clauses apprises d'un cube à l'autre ; le premier cube
+satisfiable lève un drapeau partagé qui interrompt les autres.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+
+from pysat.solvers import Glucose3
+
+from cyclic_bandwidth.mesures import noter
+from cyclic_bandwidth.resultat import INCONNU, SAT, UNSAT
+
+# État d'un processus travailleur : solveur chargé et drapeau d'arrêt partagé (voir initialiser)
+TRAVAILLEUR = {}
+
+
+def charger(clauses, tampons, phases):
+    """
+    Charge la formule dans un solveur.
+
+    :param clauses: liste de clauses
+    :param tampons: array("i") de clauses binaires, deux littéraux consécutifs par clause
+    :param phases: littéraux donnés en phases au solveur (None : aucun)
+    :return: solveur Glucose3 chargé
+    """
+    solver = Glucose3()
+    solver.append_formula(clauses)
+    for tampon in tampons:
+        litteraux = iter(tampon)
+        solver.append_formula(zip(litteraux, litteraux))
+    if phases:
+        solver.set_phases(phases)
+    return solver
+
+
+def initialiser(clauses, tampons, phases, arret):
+    """
+    Charge la formule dans le solveur du processus travailleur, et surveille le drapeau d'arrêt.
+
+    :param clauses: liste de clauses
+    :param tampons: array("i") de clauses binaires, deux littéraux consécutifs par clause
+    :param phases: littéraux donnés en phases au solveur (None : aucun)
+    :param arret: multiprocessing.Event levé quand un cube est satisfiable
+    """
+    TRAVAILLEUR.update(solver=charger(clauses, tampons, phases), arret=arret)
+    threading.Thread(target=surveiller, daemon=True).start()
+
+
+def surveiller():
+    """
+    Interrompt le solveur du processus dès que le drapeau d'arrêt est levé.
+    """
+    TRAVAILLEUR["arret"].wait()
+    TRAVAILLEUR["solver"].interrupt()
+
+
+def resoudre_cube(cube):
+    """
+    Résout la formule du processus sous les hypothèses d'un cube.
+
+    :param cube: liste de littéraux supposés vrais
+    :return: couple (statut, modèle du solveur ou None) ; INCONNU si le drapeau d'arrêt est levé
+    """
+    if TRAVAILLEUR["arret"].is_set():
+        return INCONNU, None
+    solver = TRAVAILLEUR["solver"]
+    satisfiable = solver.solve_limited(assumptions=cube, expect_interrupt=True)  # Relâche le GIL pour surveiller
+    if satisfiable:
+        return SAT, solver.get_model()
+    return (INCONNU if satisfiable is None else UNSAT), None
+
+
+def resoudre_cubes(clauses, tampons, cubes, travailleurs=0, phases=None, mesures=None):
+    """
+    Résout une formule cube par cube avec un groupe de processus.
+    Dans un processus du mode lot, qui ne peut pas avoir de fils, les cubes sont résolus l'un après l'autre par un
+    seul solveur.
+
+    :param clauses: liste de clauses
+    :param tampons: array("i") de clauses binaires, deux littéraux consécutifs par clause
+    :param cubes: itérable des cubes, listes de littéraux supposés vrais, dont la disjonction couvre le problème ; un
+                  générateur n'est parcouru qu'au fur et à mesure que les processus demandent des cubes
+    :param travailleurs: nombre de processus (0 : nombre de coeurs)
+    :param phases: littéraux donnés en phases aux solveurs (None : aucun)
+    :param mesures: Mesures où noter les travailleurs et les cubes résolus (None : pas de mesure)
+    :return: couple (statut, modele) : SAT et le modèle dès qu'un cube est satisfiable, UNSAT si tous les cubes sont
+             insatisfiables, INCONNU sinon
+    """
+    # Premiers cubes, un par processus au plus : le groupe n'a pas plus de processus que de cubes
+    cubes = iter(cubes)
+    premiers = list(itertools.islice(cubes, travailleurs if travailleurs > 0 else os.cpu_count() or 1))
+    travailleurs = len(premiers)
+    cubes = itertools.chain(premiers, cubes)
+    statut, modele, resolus = UNSAT, None, 0
+    if premiers and multiprocessing.current_process().daemon:
+        travailleurs = 1
+        solver = charger(clauses, tampons, phases)
+        try:
+            for cube in cubes:
+                resolus += 1
+                if solver.solve(assumptions=cube):
+                    statut, modele = SAT, solver.get_model()
+                    break
+        finally:
+            solver.delete()
+    elif premiers:
+        contexte = multiprocessing.get_context()
+        arret = contexte.Event()
+        with contexte.Pool(travailleurs, initializer=initialiser, initargs=(clauses, tampons, phases, arret)) as pool:
+            for resultat, solution in pool.imap_unordered(resoudre_cube, cubes):
+                resolus += 1
+                if resultat == SAT:
+                    statut, modele = SAT, solution
+                    arret.set()
+                    break
+                if resultat == INCONNU:
+                    statut = INCONNU
+    noter(mesures, travailleurs=travailleurs, cubes_resolus=resolus)
+    return statut, modele
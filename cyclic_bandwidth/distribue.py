@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Lot distribué : un coordinateur garde la file des travaux (instance, variante) d'un lot et les confie aux
+travailleurs qui se connectent en TCP, depuis d'autres processus de la même machine ou d'autres machines. Chaque
+travailleur résout ses travaux comme le mode lot (délai compris, voir lot.executer_lot) et renvoie les résultats,
+que le coordinateur ajoute au fichier des résultats en lignes JSON.
+
+Protocole : une connexion par échange, un message JSON d'une ligne dans chaque sens. Un travailleur envoie des signes
+de vie pendant un travail ; un travail sans signe de vie depuis BAIL secondes (travailleur arrêté, machine perdue) est
+rendu à la file, jusqu'à ESSAIS fois. Le fichier des résultats sert de journal : un coordinateur relancé saute les
+travaux qui y ont déjà un résultat, et les travailleurs attendent son retour pendant PATIENCE secondes.
+Le protocole n'est pas authentifié : le coordinateur n'écoute par défaut que la machine locale, et un travailleur ne
+reçoit que les options de OPTIONS, aucune n'étant un chemin de fichier.
+"""
+import collections
+import json
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+
+from cyclic_bandwidth.lot import Ecrivain, executer_lot
+
+# Secondes entre deux demandes d'un travailleur sans travail, ou deux tentatives de connexion
+PAUSE = 1.0
+# Secondes entre deux signes de vie d'un travailleur pendant un travail
+BATTEMENT = 5.0
+# Secondes sans signe de vie après lesquelles un travail est rendu à la file
+BAIL = 4 * BATTEMENT
+# Secondes pendant lesquelles un travailleur réessaie de joindre le coordinateur avant d'abandonner
+PATIENCE = 120.0
+# Nombre de fois qu'un travail est confié avant d'être déclaré en échec
+ESSAIS = 3
+# Statut d'un travail perdu ESSAIS fois (travailleur arrêté pendant sa résolution)
+ECHEC = "ECHEC"
+# Options d'une variante transmises aux travailleurs : modèle et recherche, sans chemin de fichier (base, étiquetages,
+# points de reprise) qu'un coordinateur pourrait imposer au travailleur
+OPTIONS = ("modele", "encodage", "sans_symetrie", "recherche", "strategie", "dual", "branche_dual", "kval", "domaines",
+           "distances", "maxsat", "cubes", "travailleurs", "temps_max", "composantes", "processus", "sans_familles",
+           "sans_reference", "memoire_max", "delai", "stats")
+
+
+class CoordinateurInjoignable(Exception):
+    """
+    Exception levée quand le coordinateur ne répond pas pendant le délai de patience.
+    """
+    pass
+
+
+def lire_adresse(texte, hote="127.0.0.1"):
+    """
+    :param texte: adresse "hote:port" ou port seul
+    :param hote: hôte d'une adresse donnée par son port seul
+    :return: couple (hote, port)
+    """
+    hote_donne, _, port = texte.rpartition(":")
+    return hote_donne or hote, int(port)
+
+
+def options_travail(args):
+    """
+    :param args: options d'une variante
+    :return: dictionnaire des options de la variante transmises aux travailleurs (voir OPTIONS)
+    """
+    return {cle: getattr(args, cle) for cle in OPTIONS}
+
+
+def echanger(adresse, message, patience=PATIENCE):
+    """
+    Envoie un message au coordinateur et attend sa réponse, en réessayant tant qu'il ne répond pas.
+
+    :param adresse: couple (hote, port) du coordinateur
+    :param message: dictionnaire à envoyer
+    :param patience: secondes pendant lesquelles réessayer (0 : une seule tentative)
+    :return: dictionnaire de la réponse
+    :raises CoordinateurInjoignable: si le coordinateur ne répond pas pendant la patience
+    """
+    fin = time.monotonic() + patience
+    while True:
+        try:
+            with socket.create_connection(adresse, timeout=30) as connexion:
+                connexion.sendall((json.dumps(message) + "\n").encode())
+                with connexion.makefile(encoding="utf-8") as flux:
+                    reponse = flux.readline()
+            if reponse:
+                return json.loads(reponse)
+        except (OSError, ValueError):
+            pass
+        if time.monotonic() >= fin:
+            raise CoordinateurInjoignable(adresse[0] + ":" + str(adresse[1]))
+        time.sleep(PAUSE)
+
+
+def lire_faits(chemin):
+    """
+    Relit les travaux déjà résolus dans un fichier de résultats.
+
+    :param chemin: fichier des résultats en lignes JSON
+    :return: ensemble des couples (chemin de l'instance, variante) qui y ont un résultat
+    """
+    faits = set()
+    if not os.path.exists(chemin):
+        return faits
+    with open(chemin, encoding="utf-8") as f:
+        for ligne in f:
+            try:
+                resultat = json.loads(ligne)
+                faits.add((resultat["chemin"], resultat["variante"]))
+            except (ValueError, KeyError, TypeError):  # Ligne coupée par un arrêt du coordinateur
+                continue
+    return faits
+
+
+class Coordinateur:
+    """
+    File des travaux d'un lot distribué, et baux des travaux confiés aux travailleurs.
+    Les méthodes sont appelées depuis les fils d'exécution du serveur, sous un verrou.
+
+    :param travaux: liste des travaux, dictionnaires de clés "chemin", "variante" et "options" (voir
+                    options_travail) ; un travail est identifié par le chemin absolu de son instance et sa variante
+    :param sortie: fichier des résultats en lignes JSON, complété (les travaux qui y ont un résultat sont sautés)
+    :param essais: nombre de fois qu'un travail est confié avant d'être déclaré en échec
+    :param trace: affiche les travaux confiés, résultats reçus et travaux rendus à la file
+    """
+
+    def __init__(self, travaux, sortie, essais=ESSAIS, trace=False):
+        faits = lire_faits(sortie)
+        self.travaux = {(os.path.abspath(t["chemin"]), t["variante"]): t for t in travaux}
+        self.faits = {cle for cle in self.travaux if cle in faits}
+        self.file = collections.deque(cle for cle in self.travaux if cle not in self.faits)
+        self.baux = {}  # cle -> (échéance, travailleur)
+        self.confies = collections.Counter()  # cle -> nombre de fois que le travail a été confié
+        self.essais = essais
+        self.trace = trace
+        self.obtenus = []
+        self.verrou = threading.Lock()
+        if self.faits and trace:
+            print("Coordinateur :", len(self.faits), "travaux déjà résolus dans", sortie)
+
+        # Une ligne coupée par un arrêt est terminée, pour que le résultat suivant commence sur sa propre ligne
+        coupee = False
+        if os.path.exists(sortie) and os.path.getsize(sortie) > 0:
+            with open(sortie, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                coupee = f.read(1) != b"\n"
+        self.flux = open(sortie, "a", encoding="utf-8")
+        if coupee:
+            self.flux.write("\n")
+        self.ecrivain = Ecrivain(self.flux, "jsonl")
+
+    @property
+    def termine(self):
+        """
+        :return: True quand chaque travail a son résultat
+        """
+        with self.verrou:
+            return len(self.faits) == len(self.travaux)
+
+    def publier(self, cle, ligne):
+        # Écrit le résultat d'un travail, sous le verrou
+        self.faits.add(cle)
+        self.baux.pop(cle, None)
+        self.obtenus.append(ligne)
+        self.ecrivain.ecrire(ligne)
+
+    def verifier_baux(self):
+        """
+        Rend à la file les travaux dont le travailleur ne donne plus signe de vie, ou les déclare en échec après
+        le nombre d'essais.
+        """
+        with self.verrou:
+            maintenant = time.monotonic()
+            for cle, (echeance, travailleur) in list(self.baux.items()):
+                if maintenant < echeance:
+                    continue
+                del self.baux[cle]
+                if self.confies[cle] >= self.essais:
+                    if self.trace: print("Coordinateur :", cle, "en échec après", self.confies[cle], "essais")
+                    self.publier(cle, {"instance": os.path.basename(cle[0]), "chemin": cle[0], "variante": cle[1],
+                                       "statut": ECHEC,
+                                       "essais": self.confies[cle], "travailleur": travailleur})
+                else:
+                    if self.trace: print("Coordinateur :", cle, "perdu par", travailleur + ", rendu à la file")
+                    self.file.append(cle)
+
+    def traiter(self, message):
+        """
+        Répond au message d'un travailleur.
+
+        :param message: {"type": "demande"}, {"type": "battement", "cle": ...} ou {"type": "resultat", "cle": ...,
+                        "ligne": ...}, avec le nom du travailleur sous "travailleur"
+        :return: réponse {"type": "travail", ...}, {"type": "attente"}, {"type": "fin"} ou {"type": "ok"}
+        """
+        self.verifier_baux()
+        travailleur = message.get("travailleur")
+        with self.verrou:
+            if message["type"] == "demande":
+                while self.file:
+                    cle = self.file.popleft()
+                    if cle in self.faits:  # Résultat reçu d'un travailleur qu'on croyait perdu
+                        continue
+                    travail = self.travaux[cle]
+                    with open(travail["chemin"], encoding="utf-8") as f:
+                        contenu = f.read()
+                    self.confies[cle] += 1
+                    self.baux[cle] = (time.monotonic() + BAIL, travailleur)
+                    if self.trace: print("Coordinateur :", cle, "confié à", travailleur)
+                    return {"type": "travail", "cle": list(cle), "instance": os.path.basename(cle[0]),
+                            "contenu": contenu, "options": travail["options"], "essai": self.confies[cle]}
+                return {"type": "attente" if self.baux else "fin"}
+
+            cle = tuple(message["cle"])
+            if message["type"] == "battement":
+                if cle in self.baux:
+                    self.baux[cle] = (time.monotonic() + BAIL, travailleur)
+            elif message["type"] == "resultat" and cle in self.travaux and cle not in self.faits:
+                if self.trace: print("Coordinateur :", cle, "résolu par", travailleur, message["ligne"].get("statut"))
+                ligne = dict(message["ligne"], instance=os.path.basename(cle[0]), chemin=cle[0], variante=cle[1],
+                             travailleur=travailleur, essais=max(self.confies[cle], 1))
+                self.publier(cle, ligne)
+            return {"type": "ok"}
+
+    def fermer(self):
+        self.flux.close()
+
+
+class Gestionnaire(socketserver.StreamRequestHandler):
+    """
+    Échange avec un travailleur : lit son message, répond avec le coordinateur du serveur.
+    """
+
+    def handle(self):
+        try:
+            reponse = self.server.coordinateur.traiter(json.loads(self.rfile.readline()))
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            reponse = {"type": "erreur", "erreur": repr(e)}
+        self.wfile.write((json.dumps(reponse) + "\n").encode())
+
+
+class Serveur(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True  # Un coordinateur relancé reprend aussitôt son port
+    daemon_threads = True
+
+
+def executer_coordinateur(travaux, adresse, sortie, essais=ESSAIS, trace=False):
+    """
+    Sert les travaux d'un lot aux travailleurs jusqu'à ce que chacun ait son résultat.
+
+    :param travaux: liste des travaux (voir Coordinateur)
+    :param adresse: couple (hote, port) où écouter
+    :param sortie: fichier des résultats en lignes JSON
+    :param essais: nombre de fois qu'un travail est confié avant d'être déclaré en échec
+    :param trace: affiche le suivi des travaux
+    :return: liste des résultats obtenus par ce coordinateur (sans ceux déjà présents dans le fichier)
+    """
+    coordinateur = Coordinateur(travaux, sortie, essais, trace)
+    try:
+        with Serveur(adresse, Gestionnaire) as serveur:
+            serveur.coordinateur = coordinateur
+            fil = threading.Thread(target=serveur.serve_forever, kwargs={"poll_interval": PAUSE / 2}, daemon=True)
+            fil.start()
+            if trace: print("Coordinateur : en écoute sur", (adresse[0] or "*") + ":" + str(adresse[1]) + ",",
+                            len(coordinateur.file), "travaux à résoudre")
+            while not coordinateur.termine:
+                time.sleep(PAUSE)
+                coordinateur.verifier_baux()
+            time.sleep(2 * PAUSE)  # Les travailleurs en attente reçoivent « fin » avant l'arrêt du serveur
+            serveur.shutdown()
+    finally:
+        coordinateur.fermer()
+    return coordinateur.obtenus
+
+
+def battre(adresse, cle, nom, arret):
+    """
+    Envoie des signes de vie au coordinateur pendant un travail.
+
+    :param adresse: couple (hote, port) du coordinateur
+    :param cle: clé du travail
+    :param nom: nom du travailleur
+    :param arret: threading.Event levé à la fin du travail
+    """
+    while not arret.wait(BATTEMENT):
+        try:
+            echanger(adresse, {"type": "battement", "cle": cle, "travailleur": nom}, patience=0)
+        except CoordinateurInjoignable:
+            pass  # Coordinateur relancé : le résultat lui sera envoyé avec patience
+
+
+def executer_travailleur(adresse, nom=None, trace=False):
+    """
+    Demande des travaux au coordinateur et les résout jusqu'à ce qu'il n'en ait plus.
+    Chaque instance reçue est écrite sous son nom dans un dossier temporaire, puis résolue par un processus du mode
+    lot, arrêté au délai de la variante (--delai). Seules les options de OPTIONS sont prises au coordinateur, les
+    autres gardent leur valeur par défaut.
+
+    :param adresse: couple (hote, port) du coordinateur
+    :param nom: nom du travailleur (défaut : machine:pid)
+    :param trace: affiche les travaux reçus et leurs résultats
+    :return: nombre de travaux résolus
+    :raises CoordinateurInjoignable: si le coordinateur ne répond plus pendant PATIENCE secondes
+    """
+    from cyclic_bandwidth.cli import creer_parser
+
+    parser = creer_parser()
+    nom = nom or socket.gethostname() + ":" + str(os.getpid())
+    dossier = tempfile.mkdtemp(prefix="cyclic_bandwidth_travailleur_")
+    resolus = 0
+    try:
+        with open(os.devnull, "w") as nul:
+            while True:
+                reponse = echanger(adresse, {"type": "demande", "travailleur": nom})
+                if reponse["type"] == "fin":
+                    break
+                if reponse["type"] != "travail":
+                    time.sleep(PAUSE)
+                    continue
+                cle = reponse["cle"]
+                instance = os.path.basename(reponse["instance"])  # Jamais écrite hors du dossier temporaire
+                if trace: print("Travailleur", nom, ":", instance, cle[1] or "-", "essai", reponse["essai"])
+                chemin = os.path.join(dossier, instance)
+                with open(chemin, "w", encoding="utf-8") as f:
+                    f.write(reponse["contenu"])
+                args = parser.parse_args([])
+                for option in OPTIONS:
+                    if option in reponse["options"]:
+                        setattr(args, option, reponse["options"][option])
+
+                arret = threading.Event()
+                threading.Thread(target=battre, args=(adresse, cle, nom, arret), daemon=True).start()
+                try:
+                    ligne = executer_lot([chemin], args, 1, args.delai, nul)[0]
+                finally:
+                    arret.set()
+                os.remove(chemin)
+                if trace: print("Travailleur", nom, ":", instance, ligne.get("statut"), ligne.get("cb"))
+                echanger(adresse, {"type": "resultat", "cle": cle, "ligne": ligne, "travailleur": nom})
+                resolus += 1
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+    return resolus
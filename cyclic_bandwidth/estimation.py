@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Estimation de la taille des modèles avant leur construction : variables, clauses ou contraintes, tuples et mémoire.
+Sert à choisir l'encodage le moins coûteux qui tient dans un budget mémoire, ou à refuser la résolution avant
+d'allouer quoi que ce soit.
+"""
+import math
+import os
+from dataclasses import dataclass
+
+# Coûts mémoire en octets, relevés avec tracemalloc sur CPython 3.11 (64 bits) pour les structures Python
+OCTETS_CLAUSE = 64  # liste d'une clause et son pointeur dans la liste des clauses
+OCTETS_LITTERAL = 40  # pointeur et entier Python d'un littéral
+OCTETS_BINAIRE = 8  # clause binaire dans un tampon array("i") : deux littéraux de 4 octets
+OCTETS_TUPLE = 72  # tuple de deux étiquettes et son pointeur dans la table
+OCTETS_TERME = 2048  # arbre d'expression pycsp3 d'une distance cyclique (ordre de grandeur)
+OCTETS_CONTRAINTE_CPSAT = 1024  # distance cyclique CP-SAT (abs, min, borne) dans chaque travailleur (ordre de grandeur)
+# Coûts dans le solveur SAT (Glucose), ordre de grandeur : en-tête et surveillances de la clause, littéraux, variable
+OCTETS_CLAUSE_SOLVEUR = 48
+OCTETS_LITTERAL_SOLVEUR = 4
+OCTETS_VARIABLE_SOLVEUR = 64
+
+
+class MemoireInsuffisante(Exception):
+    """
+    Aucun encodage du modèle ne tient dans le budget mémoire.
+    """
+
+
+@dataclass
+class Estimation:
+    """
+    Taille estimée d'un modèle pour une borne k.
+
+    :param modele: "M1", "M2", "M3" ou "M4"
+    :param encodage: encodage du modèle
+    :param k: borne du cyclic bandwidth
+    :param variables: nombre de variables
+    :param contraintes: nombre de clauses (M3) ou de contraintes (M1, M2)
+    :param tuples: nombre de tuples des tables (M2)
+    :param octets: mémoire estimée au pic d'un sondage
+    """
+    modele: str
+    encodage: str
+    k: int
+    variables: int
+    contraintes: int
+    tuples: int = 0
+    octets: int = 0
+
+
+def nb_couples_eloignes(n, k):
+    """
+    Nombre de couples ordonnés d'étiquettes distinctes à distance cyclique > k.
+
+    :param n: nombre d'étiquettes
+    :param k: borne du cyclic bandwidth
+    :return: nombre de couples (j, m)
+    """
+    # Autour de chaque étiquette, min(2k, n-1) autres étiquettes sont à distance <= k
+    return n * (n - 1 - min(2 * k, n - 1))
+
+
+@dataclass
+class TailleDomaines:
+    """
+    Taille des domaines restreints des étiquettes (voir graphe.domaines_etiquettes) pour une borne k.
+
+    :param sommets: nombre d'étiquettes permises de chaque sommet
+    :param etiquettes: nombre de sommets permis pour chaque étiquette
+    :param couples_eloignes: nombre de couples (arête, étiquettes permises à distance cyclique > k)
+    """
+    sommets: list
+    etiquettes: list
+    couples_eloignes: int
+
+
+def taille_domaines(domaines, aretes, n, k):
+    """
+    Compte les variables et les couples interdits que laissent des domaines restreints, sans construire de clause.
+    Les sommets à même distance de v_1 partagent leur domaine : les couples sont comptés une fois par paire de
+    domaines, à l'aide des sommes cumulées de l'appartenance au domaine le long du cycle.
+
+    :param domaines: étiquettes permises de chaque sommet
+    :param aretes: Arêtes du graphe
+    :param n: nombre de sommets
+    :param k: borne du cyclic bandwidth
+    :return: TailleDomaines
+    """
+    partages = {}  # domaine -> [domaine, nombre de sommets qui le partagent]
+    for d in domaines:
+        partages.setdefault(id(d), [d, 0])[1] += 1
+    etiquettes = [0] * n
+    for d, nombre in partages.values():
+        for e in d:
+            etiquettes[e - 1] += nombre
+
+    r = min(k, n // 2)
+    cumuls = {}  # domaine -> sommes cumulées de son appartenance sur trois tours du cycle
+
+    def proches(d_i, d_l):
+        # Nombre de couples (j, m) de d_i x d_l à distance cyclique <= k (j = m compris)
+        if 2 * r + 1 >= n:  # La fenêtre de chaque étiquette couvre tout le cycle
+            return len(d_i) * len(d_l)
+        if id(d_l) not in cumuls:
+            dedans = [0] * n
+            for e in d_l:
+                dedans[e - 1] = 1
+            cumul = [0]
+            for b in dedans * 3:
+                cumul.append(cumul[-1] + b)
+            cumuls[id(d_l)] = cumul
+        cumul = cumuls[id(d_l)]
+        return sum(cumul[n + j + r] - cumul[n + j - 1 - r] for j in d_i)  # Étiquettes j-r..j+r du tour du milieu
+
+    par_couple = {}
+    couples = 0
+    for (u, v) in aretes:
+        cle = (id(domaines[u - 1]), id(domaines[v - 1]))
+        if cle not in par_couple:
+            d_i, d_l = domaines[u - 1], domaines[v - 1]
+            par_couple[cle] = len(d_i) * len(d_l) - proches(d_i, d_l)
+        couples += par_couple[cle]
+    return TailleDomaines([len(d) for d in domaines], etiquettes, couples)
+
+
+def taille_dual(n, k, degre):
+    """
+    Taille du modèle dual position -> sommet (voir m2.poser_dual) : canalisation, puis deux variables et deux
+    contraintes par position et par rang de voisin pour l'adjacence vue des positions, dont les tables (sommet,
+    t-ième voisin) sont partagées par les positions.
+
+    :param n: nombre de sommets
+    :param k: borne du cyclic bandwidth (None : canalisation seule)
+    :param degre: degré maximal du graphe, None : pas de modèle dual
+    :return: triplet (variables, contraintes, tuples)
+    """
+    if degre is None:
+        return 0, 0, 0
+    if k is None or degre == 0 or 2 * k + 1 >= n:
+        return n, 1 + n, 0
+    return n + 2 * n * degre, 1 + n + 2 * n * degre, n * degre
+
+
+def estimer_m3(n, m, k, encodage="sequentiel", symetrie=True, domaines=None, redondantes=None, dual=None):
+    """
+    Estime la taille du modèle M3 (voir m3.clauses_permutation et m3.clauses_bandwidth).
+
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param k: borne du cyclic bandwidth
+    :param encodage: "paires" ou "sequentiel"
+    :param symetrie: clause unitaire de rupture de symétrie
+    :param domaines: TailleDomaines des domaines restreints (voir taille_domaines), None : toutes les étiquettes
+    :param redondantes: inutilisé, M3 ne pose pas de contraintes redondantes
+    :param dual: inutilisé, M3 n'a pas de modèle dual
+    :return: Estimation
+    """
+    # Avec des domaines, seuls les couples permis sont numérotés (voir m3.Registre)
+    # Les clauses binaires « au plus un » (paires) et de la borne k sont en tampons array("i"), les autres en listes
+    couples = n * n if domaines is None else sum(domaines.sommets)
+    variables = couples if encodage == "paires" else 3 * couples  # x (puis s et t)
+    if domaines is None:
+        if encodage == "paires":
+            clauses, binaires = 2 * n, n * n * (n - 1)  # au moins un, puis au plus un par paires, sommets et étiquettes
+            litteraux = 2 * n * n
+        else:
+            clauses, binaires = 2 * n * (3 * n - 1), 0  # au moins un, puis compteurs séquentiels
+            litteraux = 2 * n * n + 2 * n * (2 + 6 * (n - 1))
+        clauses_k = nb_couples_eloignes(n, k) * m  # deux littéraux par arête et par couple d'étiquettes trop éloignées
+    else:
+        clauses, binaires, litteraux = 0, 0, 0
+        for a in domaines.sommets + domaines.etiquettes:  # Même décompte sur chaque sommet et chaque étiquette
+            if encodage == "paires":
+                clauses, binaires, litteraux = clauses + 1, binaires + a * (a - 1) // 2, litteraux + a
+            else:
+                clauses, litteraux = clauses + (3 * a - 1 if a else 1), litteraux + (7 * a - 4 if a else 0)
+        clauses_k = domaines.couples_eloignes
+    if symetrie:
+        clauses, litteraux = clauses + 1, litteraux + 1
+
+    # Clauses de la borne k
+    binaires += clauses_k
+
+    # Au pic d'un sondage, les clauses sont à la fois dans les listes ou tampons Python et dans le solveur
+    octets = (clauses * (OCTETS_CLAUSE + OCTETS_CLAUSE_SOLVEUR) + litteraux * (OCTETS_LITTERAL + OCTETS_LITTERAL_SOLVEUR)
+              + binaires * (OCTETS_BINAIRE + OCTETS_CLAUSE_SOLVEUR + 2 * OCTETS_LITTERAL_SOLVEUR)
+              + variables * OCTETS_VARIABLE_SOLVEUR)
+    clauses += binaires
+    return Estimation("M3", encodage, k, variables, clauses, 0, octets)
+
+
+def estimer_m2(n, m, k, encodage="alldiff", symetrie=True, domaines=None, redondantes=None, dual=None):
+    """
+    Estime la taille du modèle M2 (voir m2.construire).
+
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param k: borne du cyclic bandwidth
+    :param encodage: "alldiff" ou "permutations"
+    :param symetrie: rupture de symétrie (réduit la table des permutations à (n-1)!)
+    :param domaines: inutilisé, les domaines restreints ne changent pas les tables
+    :param redondantes: nombre de paires de sommets à chaque distance d >= 2 (None : pas de contraintes redondantes)
+    :param dual: degré maximal du graphe quand le modèle dual est posé (None : pas de modèle dual)
+    :return: Estimation
+    """
+    tuples = n * min(2 * k, n - 1)  # table des couples d'étiquettes à distance <= k
+    contraintes = m + 1 + (1 if symetrie and encodage != "permutations" else 0)
+    for d, paires in (redondantes or {}).items():
+        if paires and d * k < n // 2:  # une table par distance, partagée par ses paires
+            tuples += n * 2 * d * k
+            contraintes += paires
+    variables_dual, contraintes_dual, tuples_dual = taille_dual(n, k, dual)
+    tuples += tuples_dual
+    octets = tuples * OCTETS_TUPLE + contraintes_dual * OCTETS_TERME
+    if encodage == "permutations":
+        permutations = math.factorial(n - 1 if symetrie else n)
+        tuples += permutations
+        octets += permutations * (OCTETS_CLAUSE + n * 8)  # tuple de n étiquettes (petits entiers partagés)
+    return Estimation("M2", encodage, k, n + variables_dual, contraintes + contraintes_dual, tuples, octets)
+
+
+def estimer_m1(n, m, k=None, encodage="alldiff", symetrie=True, domaines=None, redondantes=None, dual=None):
+    """
+    Estime la taille du modèle M1 (voir m1.construire) : elle ne dépend pas de k.
+
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param k: borne du cyclic bandwidth, fenêtre de l'adjacence du modèle dual (None : aucune)
+    :param encodage: "alldiff"
+    :param symetrie: rupture de symétrie
+    :param domaines: inutilisé
+    :param redondantes: nombre de paires de sommets à chaque distance d >= 2 (None : pas de contraintes redondantes)
+    :param dual: degré maximal du graphe quand le modèle dual est posé (None : pas de modèle dual) ; son adjacence
+                 vue des positions est comptée pour la fenêtre k
+    :return: Estimation
+    """
+    paires = sum((redondantes or {}).values())
+    variables_dual, contraintes_dual, tuples_dual = taille_dual(n, k, dual)
+    return Estimation("M1", encodage, k, n + (1 if paires else 0) + variables_dual,
+                      1 + (1 if symetrie else 0) + paires + contraintes_dual, tuples_dual,
+                      (3 * (m + paires) + contraintes_dual) * OCTETS_TERME + tuples_dual * OCTETS_TUPLE)
+
+
+def estimer_m4(n, m, k=None, encodage="alldiff", symetrie=True, domaines=None, redondantes=None, dual=None):
+    """
+    Estime la taille du modèle M4 (voir m4.construire) : elle ne dépend pas de k.
+
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param k: inutilisé, pour la même signature que les autres modèles
+    :param encodage: "alldiff"
+    :param symetrie: rupture de symétrie
+    :param domaines: inutilisé
+    :param redondantes: nombre de paires de sommets à chaque distance d >= 2 (None : pas de contraintes redondantes)
+    :param dual: inutilisé, M4 n'a pas de modèle dual
+    :return: Estimation
+    """
+    distances = m + sum((redondantes or {}).values())  # deux variables et trois contraintes par distance cyclique
+    return Estimation("M4", encodage, k, n + 1 + 2 * distances, 1 + (1 if symetrie else 0) + 3 * distances, 0,
+                      distances * OCTETS_CONTRAINTE_CPSAT)
+
+
+ESTIMATEURS = {"M1": estimer_m1, "M2": estimer_m2, "M3": estimer_m3, "M4": estimer_m4}
+
+
+def memoire_disponible():
+    """
+    Mémoire physique disponible : MemAvailable de /proc/meminfo sous Linux, qui compte le cache récupérable, sinon
+    les pages libres.
+
+    :return: nombre d'octets, None si le système ne la donne pas
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for ligne in f:
+                if ligne.startswith("MemAvailable:"):
+                    return int(ligne.split()[1]) * 1024  # Valeur en Ko
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def copies_modele(modele, travailleurs=0, cubes=0, maxsat=False, groupe=True):
+    """
+    Nombre de copies du modèle en mémoire pendant la résolution.
+
+    :param modele: "M1", "M2", "M3" ou "M4"
+    :param travailleurs: travailleurs de CP-SAT (M4) ou processus des cubes (M3) ; 0 : nombre de coeurs
+    :param cubes: profondeur de la découpe en cubes de M3 (0 : pas de découpe)
+    :param maxsat: M3 résolu en MaxSAT (pas de découpe)
+    :param groupe: un groupe de processus est possible (False dans un processus du mode lot, voir cubes)
+    :return: 1 + un solveur chargé par processus des cubes, ou une copie par travailleur de CP-SAT
+    """
+    travailleurs = travailleurs if travailleurs > 0 else os.cpu_count() or 1
+    if modele == "M3" and cubes > 0 and not maxsat and groupe:
+        return 1 + travailleurs
+    if modele == "M4":
+        return travailleurs
+    return 1
+
+
+def choisir_encodage(modele, encodages, n, m, k, symetrie=True, budget=None, domaines=None, redondantes=None,
+                     copies=1, dual=None):
+    """
+    Choisit, parmi les encodages proposés, celui dont la mémoire estimée est la plus faible, s'il tient dans le budget.
+
+    :param modele: "M1", "M2", "M3" ou "M4"
+    :param encodages: encodages possibles (un seul si l'encodage est imposé)
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param k: borne du sondage le plus coûteux
+    :param symetrie: rupture de symétrie
+    :param budget: mémoire maximale en octets (None : pas de limite)
+    :param domaines: TailleDomaines des domaines restreints (None : toutes les étiquettes)
+    :param redondantes: nombre de paires de sommets à chaque distance d >= 2, M1 et M2 (None : aucune)
+    :param copies: nombre de copies du modèle en mémoire (voir copies_modele), qui se partagent le budget
+    :param dual: degré maximal du graphe quand le modèle dual est posé, M1 et M2 (None : pas de modèle dual)
+    :return: Estimation de l'encodage choisi (mémoire d'une copie)
+    :raises MemoireInsuffisante: si aucun encodage ne tient dans le budget
+    """
+    estimations = [ESTIMATEURS[modele](n, m, k, encodage, symetrie, domaines, redondantes, dual)
+                   for encodage in encodages]
+    meilleure = min(estimations, key=lambda e: e.octets)
+    if budget is not None and meilleure.octets * copies > budget:
+        raise MemoireInsuffisante(
+            modele + " (n=" + str(n) + ", m=" + str(m) + ", k=" + str(k) + ") demande environ "
+            + ", ".join(e.encodage + " " + format_octets(e.octets) for e in estimations)
+            + (" par copie, " + str(copies) + " copies" if copies > 1 else "")
+            + " pour un budget de " + format_octets(budget))
+    return meilleure
+
+
+def format_octets(octets):
+    """
+    :param octets: nombre d'octets
+    :return: texte lisible, avec une décimale au-delà de l'octet (Ko, Mo, Go, To)
+    """
+    if octets < 1024:
+        return str(octets) + " o"
+    if octets >= 1024 ** 5:  # Comparaison entière : la table des permutations dépasse vite les flottants
+        return "plus de 1024 To"
+    puissance = 1
+    while octets >= 1024 ** (puissance + 1):
+        puissance += 1
+    return "%.1f %s" % (octets / 1024 ** puissance, ("Ko", "Mo", "Go", "To")[puissance - 1])
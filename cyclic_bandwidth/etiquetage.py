@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Fichiers d'étiquetages : un étiquetage trouvé une fois est enregistré, puis relu comme borne supérieure, point de
+départ des solveurs ou contrôle de non-régression, sans relancer la résolution.
+
+Format (les lignes commençant par % sont des commentaires, comme dans les fichiers .mtx.rnd) :
+
+    %%CyclicBandwidth etiquetage
+    % instance=ibm32.mtx.rnd modele=M3/sequentiel/symetrie/dichotomie statut=OPTIMUM
+    32 9
+    1 17 5 ...
+
+La première ligne de données donne n et le cyclic bandwidth annoncé, la suite les étiquettes de v_1 à v_n.
+"""
+import os
+
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.resultat import SAT, Resultat
+
+# Extension des fichiers d'étiquetages, et entête de leur première ligne
+EXTENSION = ".etq"
+ENTETE = "%%CyclicBandwidth etiquetage"
+
+
+class EtiquetageInvalide(Exception):
+    """
+    L'étiquetage n'est pas une permutation des étiquettes 1..n, ou son cyclic bandwidth n'est pas celui annoncé.
+    """
+
+
+def chemin_etiquetage(chemin, instance):
+    """
+    Fichier d'étiquetage d'une instance : le chemin lui-même, ou INSTANCE.etq si le chemin est un dossier (mode lot).
+
+    :param chemin: fichier ou dossier donné en option
+    :param instance: nom du fichier de l'instance
+    :return: chemin du fichier
+    """
+    if os.path.isdir(chemin):
+        return os.path.join(chemin, instance + EXTENSION)
+    return chemin
+
+
+def ecrire_etiquetage(chemin, etiquettes, cb, instance=None, modele=None, statut=None):
+    """
+    Écrit un étiquetage.
+
+    :param chemin: fichier de sortie
+    :param etiquettes: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    :param cb: cyclic bandwidth de l'étiquetage
+    :param instance: nom du fichier de l'instance (commentaire)
+    :param modele: variante qui a trouvé l'étiquetage (commentaire)
+    :param statut: statut de la résolution (commentaire)
+    """
+    description = " ".join(cle + "=" + str(valeur) for cle, valeur in
+                           (("instance", instance), ("modele", modele), ("statut", statut)) if valeur is not None)
+    with open(chemin, "w") as f:
+        f.write(ENTETE + "\n")
+        if description:
+            f.write("% " + description + "\n")
+        f.write(str(len(etiquettes)) + " " + str(cb) + "\n")
+        f.write(" ".join(map(str, etiquettes)) + "\n")
+
+
+def lire_etiquetage(chemin):
+    """
+    Lit un étiquetage.
+
+    :param chemin: fichier à lire
+    :return: couple (liste des étiquettes, cyclic bandwidth annoncé)
+    :raises EtiquetageInvalide: si le fichier est illisible, contient autre chose que des entiers ou ne donne pas n
+                                étiquettes
+    """
+    try:
+        with open(chemin) as f:
+            valeurs = [int(v) for ligne in f if not ligne.startswith("%") for v in ligne.split()]
+    except OSError as e:
+        raise EtiquetageInvalide(chemin + " : fichier illisible (" + (e.strerror or str(e)) + ")") from e
+    except ValueError as e:
+        raise EtiquetageInvalide(chemin + " : valeur non entière (" + str(e) + ")") from e
+    if len(valeurs) < 2 or len(valeurs) != valeurs[0] + 2:
+        raise EtiquetageInvalide(chemin + " : " + str(max(len(valeurs) - 2, 0)) + " étiquettes pour n = "
+                                 + (str(valeurs[0]) if valeurs else "?"))
+    return valeurs[2:], valeurs[1]
+
+
+def valider(etiquettes, aretes, n):
+    """
+    Vérifie qu'un étiquetage est une permutation de 1..n et recalcule son cyclic bandwidth.
+
+    :param etiquettes: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    :param aretes: Arêtes du graphe
+    :param n: nombre de sommets
+    :return: cyclic bandwidth de l'étiquetage
+    :raises EtiquetageInvalide: si l'étiquetage n'est pas une permutation
+    """
+    if len(etiquettes) != n:
+        raise EtiquetageInvalide(str(len(etiquettes)) + " étiquettes pour " + str(n) + " sommets")
+    vues = bytearray(n + 1)
+    for i, e in enumerate(etiquettes, start=1):
+        if not 1 <= e <= n or vues[e]:
+            raise EtiquetageInvalide("étiquette " + str(e) + " de v_" + str(i) + " hors de 1.." + str(n)
+                                     + " ou déjà prise")
+        vues[e] = 1
+    return cyclic_bandwidth(etiquettes, aretes)
+
+
+def charger_etiquetage(chemin, sommets, aretes):
+    """
+    Lit et valide l'étiquetage d'un graphe.
+
+    :param chemin: fichier à lire
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: Resultat SAT de l'étiquetage (borne supérieure)
+    :raises EtiquetageInvalide: si l'étiquetage est invalide ou si son cyclic bandwidth n'est pas celui annoncé
+    """
+    etiquettes, annonce = lire_etiquetage(chemin)
+    cb = valider(etiquettes, aretes, len(sommets))
+    if cb != annonce:
+        raise EtiquetageInvalide(chemin + " : cyclic bandwidth " + str(cb) + " au lieu de " + str(annonce))
+    return Resultat("etiquetage", SAT, etiquettes, cb, borne_sup=cb)
+
+
+def normaliser(etiquettes):
+    """
+    Tourne un étiquetage pour que v_1 ait l'étiquette 1 (rupture de symétrie des modèles), sans changer son cyclic
+    bandwidth.
+
+    :param etiquettes: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    :return: liste des étiquettes tournées
+    """
+    n, decalage = len(etiquettes), etiquettes[0] - 1
+    return [(e - 1 - decalage) % n + 1 for e in etiquettes]
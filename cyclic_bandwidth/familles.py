@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+Reconnaissance des familles de graphes dont le cyclic bandwidth est connu, et étiquetages optimaux associés.
+
+Familles reconnues (quelle que soit la numérotation des sommets), avec n sommets :
+- chaîne P_n et cycle C_n : 1 ;
+- étoile K_1,n-1 et clique K_n : n // 2 (un sommet de degré d impose une borne >= ceil(d / 2)) ;
+- biparti complet K_a,b (a <= b) : ceil(b / 2) + floor((a - 1) / 2) ;
+- grille P_r x P_c : min(r, c) (Hromkovič, Müller, Sýkora, Vrťo, « On embeddings in cycles ») ;
+- tore C_r x C_c (r, c >= 5) : min(r, c), la grille qu'il contient étant un graphe partiel de même ordre ;
+- grille à 9 points P_r ⊠ P_c : étiquetage de largeur min(r, c) + 1, exact quand il atteint la borne des boules ;
+- chenille (arbre dont les sommets internes forment une chaîne) : disposition gloutonne de la chaîne et de ses
+  feuilles, exacte seulement quand elle atteint la borne des boules (voir borne_boules).
+
+Chaque famille donne un étiquetage et une borne inférieure : l'étiquetage est certifié optimal quand son cyclic
+bandwidth, recalculé, atteint la borne.
+"""
+import itertools
+from collections import deque
+from dataclasses import dataclass
+
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+
+
+@dataclass
+class Famille:
+    """
+    Famille reconnue et étiquetage associé.
+
+    :param nom: nom de la famille (ex. "grille 30x30")
+    :param etiquettes: étiquetage (la i-ème valeur est l'étiquette de v_i)
+    :param cb: cyclic bandwidth de l'étiquetage
+    :param borne_inf: borne inférieure prouvée du cyclic bandwidth optimal
+    """
+    nom: str
+    etiquettes: list
+    cb: int
+    borne_inf: int
+
+    @property
+    def exacte(self):
+        """L'étiquetage atteint la borne inférieure : il est optimal."""
+        return self.cb <= self.borne_inf
+
+
+def adjacence_simple(sommets, aretes):
+    """
+    Liste d'adjacence sans boucle ni arête multiple (elles ne changent pas le cyclic bandwidth).
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: couple (dictionnaire sommet -> ensemble de ses voisins, nombre d'arêtes distinctes)
+    """
+    adjacence = {i: set() for i in sommets}
+    for (u, v) in aretes:
+        if u != v:
+            adjacence[u].add(v)
+            adjacence[v].add(u)
+    return adjacence, sum(len(voisins) for voisins in adjacence.values()) // 2
+
+
+def distances(adjacence, depart):
+    """
+    Distances dans le graphe depuis un sommet, par parcours en largeur.
+
+    :param adjacence: dictionnaire sommet -> voisins
+    :param depart: sommet de départ
+    :return: dictionnaire sommet atteint -> distance
+    """
+    dist = {depart: 0}
+    file = deque([depart])
+    while file:
+        u = file.popleft()
+        for v in adjacence[u]:
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                file.append(v)
+    return dist
+
+
+def borne_boules(adjacence):
+    """
+    Borne inférieure du cyclic bandwidth par les boules : les sommets à distance <= r d'un sommet v ont une étiquette
+    à distance cyclique <= r.k de celle de v, donc |B(v, r)| <= 2.r.k + 1.
+
+    :param adjacence: dictionnaire sommet -> voisins
+    :return: max sur v et r de ceil((|B(v, r)| - 1) / 2r)
+    """
+    borne = 0
+    for v in adjacence:
+        taille = [0]  # taille[r] = nombre de sommets à distance exactement r
+        for d in distances(adjacence, v).values():
+            if d >= len(taille):
+                taille += [0] * (d + 1 - len(taille))
+            taille[d] += 1
+        boule = 1
+        for r in range(1, len(taille)):
+            boule += taille[r]
+            borne = max(borne, -(-(boule - 1) // (2 * r)))
+    return borne
+
+
+def parcours_chaine(adjacence, debut):
+    """
+    Parcourt une chaîne (ou un cycle) de sommets de degré au plus 2 depuis une extrémité.
+
+    :param adjacence: dictionnaire sommet -> voisins
+    :param debut: sommet de départ
+    :return: liste des sommets dans l'ordre du parcours
+    """
+    ordre, precedent, courant = [debut], None, debut
+    while True:
+        suivants = [v for v in adjacence[courant] if v != precedent and v != debut]
+        if not suivants:
+            return ordre
+        precedent, courant = courant, suivants[0]
+        ordre.append(courant)
+
+
+def etiqueter_ordre(n, ordre):
+    """
+    :param n: nombre de sommets
+    :param ordre: sommets dans l'ordre de leurs étiquettes
+    :return: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    """
+    etiquettes = [0] * n
+    for e, v in enumerate(ordre, start=1):
+        etiquettes[v - 1] = e
+    return etiquettes
+
+
+def chaine_ou_cycle(adjacence, n, m, degres):
+    """Chaîne P_n ou cycle C_n : les sommets sont étiquetés dans l'ordre du parcours."""
+    if max(degres.values()) > 2 or m not in (n - 1, n):
+        return None
+    debut = min(degres, key=lambda v: degres[v])  # Une extrémité pour la chaîne
+    ordre = parcours_chaine(adjacence, debut)
+    if len(ordre) != n:
+        return None
+    return ("chaine " if m == n - 1 else "cycle ") + str(n), ordre, 1
+
+
+def etoile_ou_clique(adjacence, n, m, degres):
+    """Étoile ou clique : un sommet de degré n - 1 impose déjà n // 2, atteint par tout étiquetage de la clique."""
+    if m == n * (n - 1) // 2:
+        return "clique " + str(n), list(adjacence), n // 2
+    centres = [v for v in degres if degres[v] == n - 1]
+    if m == n - 1 and centres:
+        return "etoile " + str(n), [centres[0]] + [v for v in adjacence if v != centres[0]], n // 2
+    return None
+
+
+def biparti_complet(adjacence, n, m, degres):
+    """
+    Biparti complet K_a,b (a <= b) : chaque côté forme un bloc d'étiquettes consécutives, sauf si a et b sont pairs,
+    où les deux moitiés de chaque côté alternent (a/2, b/2, a/2, b/2). Valeur vérifiée par recherche exhaustive
+    jusqu'à 11 sommets et par le calcul de l'étiquetage jusqu'à K_39,49.
+    """
+    depart = next(iter(adjacence))
+    cote = {depart: 0}
+    file = deque([depart])
+    while file:
+        u = file.popleft()
+        for v in adjacence[u]:
+            if v not in cote:
+                cote[v] = 1 - cote[u]
+                file.append(v)
+            elif cote[v] == cote[u]:
+                return None
+    petit = [v for v in adjacence if cote[v] == 0]
+    grand = [v for v in adjacence if cote[v] == 1]
+    if len(petit) > len(grand):
+        petit, grand = grand, petit
+    a, b = len(petit), len(grand)
+    if len(cote) != n or m != a * b:
+        return None
+    if a % 2 == 0 and b % 2 == 0:
+        ordre = petit[:a // 2] + grand[:b // 2] + petit[a // 2:] + grand[b // 2:]
+    else:
+        ordre = petit + grand
+    return "biparti complet " + str(a) + "x" + str(b), ordre, (b + 1) // 2 + (a - 1) // 2
+
+
+def ordre_grille(lignes, colonnes, position):
+    """
+    Ordre des sommets d'une grille ou d'un tore : ils sont numérotés le long de la plus petite dimension, d'où une
+    distance min(lignes, colonnes) entre voisins des deux autres côtés.
+
+    :param lignes: nombre de lignes
+    :param colonnes: nombre de colonnes
+    :param position: dictionnaire sommet -> (ligne, colonne)
+    :return: liste des sommets dans l'ordre de leurs étiquettes
+    """
+    if lignes <= colonnes:
+        return sorted(position, key=lambda v: (position[v][1], position[v][0]))
+    return sorted(position, key=lambda v: position[v])
+
+
+def grille(adjacence, n, m, degres):
+    """
+    Grille P_r x P_c (r, c >= 2) : les coordonnées sont retrouvées par les distances à deux coins voisins, puis toutes
+    les arêtes sont vérifiées.
+    """
+    coins = [v for v in degres if degres[v] == 2]
+    if len(coins) != 4 or max(degres.values()) > 4:
+        return None
+    d0 = distances(adjacence, coins[0])
+    c1 = min(coins[1:], key=lambda v: d0.get(v, n))  # Coin voisin, sur le plus petit côté
+    p = d0.get(c1, 0)
+    if len(d0) != n or p == 0 or n % (p + 1):
+        return None
+    colonnes, lignes = p + 1, n // (p + 1)
+    if m != lignes * (colonnes - 1) + colonnes * (lignes - 1):
+        return None
+    d1 = distances(adjacence, c1)
+
+    # (i, j) depuis le coin (0, 0) : d0 = i + j et d1 = i + (p - j)
+    position = {}
+    for v in adjacence:
+        if (d0[v] - d1[v] + p) % 2:
+            return None
+        j = (d0[v] - d1[v] + p) // 2
+        position[v] = (d0[v] - j, j)
+    if len(set(position.values())) != n or not all(0 <= i < lignes and 0 <= j < colonnes
+                                                    for (i, j) in position.values()):
+        return None
+    for u in adjacence:
+        for v in adjacence[u]:
+            (i, j), (i2, j2) = position[u], position[v]
+            if abs(i - i2) + abs(j - j2) != 1:
+                return None
+    return "grille " + str(lignes) + "x" + str(colonnes), ordre_grille(lignes, colonnes, position), \
+        min(lignes, colonnes)
+
+
+def grille_diagonale(adjacence, n, m, degres):
+    """
+    Grille à 9 points P_r ⊠ P_c (r, c >= 3, voisins en diagonale compris, comme gr_30_30). La première ligne et la
+    première colonne sont parcourues le long du bord (sommets de degré <= 5) depuis un coin ; la distance d'un sommet à
+    la première ligne donne sa ligne, celle à la première colonne sa colonne, puis toutes les arêtes sont vérifiées.
+    La numérotation le long de la plus petite dimension donne min(r, c) + 1 ; la borne inférieure est celle des
+    boules, qui ne l'atteint pas toujours.
+    """
+    coins = [v for v in degres if degres[v] == 3]
+    if len(coins) != 4 or max(degres.values()) > 8:
+        return None
+    d0 = distances(adjacence, coins[0])
+    if len(d0) != n:
+        return None
+
+    def bord(cible):
+        # Chemin le long du bord de coins[0] à cible, en se rapprochant de cible à chaque pas
+        d_cible = distances(adjacence, cible)
+        chemin = [coins[0]]
+        for pas in range(1, d0[cible] + 1):
+            suivants = [w for w in adjacence[chemin[-1]] if d0[w] == pas and degres[w] <= 5]
+            if not suivants:
+                return None
+            chemin.append(min(suivants, key=lambda w: d_cible[w]))
+        return chemin if chemin[-1] == cible else None
+
+    def distances_ensemble(depart):
+        dist = dict.fromkeys(depart, 0)
+        file = deque(depart)
+        while file:
+            u = file.popleft()
+            for v in adjacence[u]:
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    file.append(v)
+        return dist
+
+    for c1, c2 in itertools.permutations(coins[1:], 2):
+        colonnes, lignes = d0[c1] + 1, d0[c2] + 1
+        if min(lignes, colonnes) < 3 or lignes * colonnes != n \
+                or m != 4 * lignes * colonnes - 3 * (lignes + colonnes) + 2:
+            continue
+        ligne0, colonne0 = bord(c1), bord(c2)
+        if ligne0 is None or colonne0 is None:
+            continue
+        i, j = distances_ensemble(ligne0), distances_ensemble(colonne0)
+        position = {v: (i[v], j[v]) for v in adjacence}
+        if len(set(position.values())) != n:
+            continue
+        if all(max(abs(position[u][0] - position[v][0]), abs(position[u][1] - position[v][1])) == 1
+               for u in adjacence for v in adjacence[u]):
+            return "grille diagonale " + str(lignes) + "x" + str(colonnes), ordre_grille(lignes, colonnes, position), \
+                borne_boules(adjacence)
+    return None
+
+
+def tore(adjacence, n, m, degres):
+    """
+    Tore C_r x C_c (r, c >= 5) : 4-régulier, les seuls 4-cycles y sont les carrés de la grille. La première ligne et
+    la première colonne sont parcourues en ligne droite (le voisin opposé n'a aucun voisin commun avec le précédent),
+    chaque ligne suivante est déduite des carrés, puis toutes les arêtes sont vérifiées.
+    """
+    if m != 2 * n or set(degres.values()) != {4}:
+        return None
+
+    def communs(u, v):
+        return (adjacence[u] & adjacence[v]) - {u, v}
+
+    def ligne_droite(debut, suivant):
+        ordre = [debut]
+        precedent, courant = debut, suivant
+        while courant != debut:
+            ordre.append(courant)
+            opposes = [w for w in adjacence[courant] if w != precedent and communs(precedent, w) == {courant}]
+            if len(opposes) != 1 or len(ordre) > n:
+                return None
+            precedent, courant = courant, opposes[0]
+        return ordre
+
+    v0 = next(iter(adjacence))
+    est = next(iter(adjacence[v0]))
+    nord = [w for w in adjacence[v0] if w != est and communs(est, w) - {v0}]  # Voisins perpendiculaires à est
+    if not nord:
+        return None
+    ligne0, colonne0 = ligne_droite(v0, est), ligne_droite(v0, nord[0])
+    if ligne0 is None or colonne0 is None or len(ligne0) < 5 or len(colonne0) < 5 \
+            or len(ligne0) * len(colonne0) != n:
+        return None
+    colonnes, lignes = len(ligne0), len(colonne0)
+
+    grille_sommets = [ligne0]
+    for i in range(1, lignes):
+        ligne = [colonne0[i]]
+        for j in range(1, colonnes):
+            # Coin du carré (i-1, j-1), (i-1, j), (i, j-1) : le voisin commun de (i-1, j) et (i, j-1) autre que (i-1, j-1)
+            coin = communs(grille_sommets[i - 1][j], ligne[j - 1]) - {grille_sommets[i - 1][j - 1]}
+            if len(coin) != 1:
+                return None
+            ligne.append(coin.pop())
+        grille_sommets.append(ligne)
+    position = {v: (i, j) for i, ligne in enumerate(grille_sommets) for j, v in enumerate(ligne)}
+    if len(position) != n:
+        return None
+    for u in adjacence:
+        for v in adjacence[u]:
+            (i, j), (i2, j2) = position[u], position[v]
+            if sorted((min(abs(i - i2), lignes - abs(i - i2)), min(abs(j - j2), colonnes - abs(j - j2)))) != [0, 1]:
+                return None
+    return "tore " + str(lignes) + "x" + str(colonnes), ordre_grille(lignes, colonnes, position), min(lignes, colonnes)
+
+
+def chenille(adjacence, n, m, degres):
+    """
+    Chenille : arbre dont les sommets non feuilles forment une chaîne (l'épine). Les feuilles de chaque sommet de
+    l'épine sont réparties dans les intervalles à sa gauche et à sa droite ; pour k croissant depuis la borne des
+    boules, on place le plus de feuilles possible à gauche tant que chaque intervalle reste de longueur < k.
+    La disposition n'est certifiée optimale que si elle atteint la borne des boules.
+    """
+    if m != n - 1 or len(distances(adjacence, next(iter(adjacence)))) != n:
+        return None
+    epine_sommets = {v for v in adjacence if degres[v] > 1}
+    sous_degres = {v: len(adjacence[v] & epine_sommets) for v in epine_sommets}
+    if len(epine_sommets) < 2 or max(sous_degres.values()) > 2:
+        return None
+    epine = parcours_chaine({v: adjacence[v] & epine_sommets for v in epine_sommets},
+                            min(sous_degres, key=lambda v: sous_degres[v]))
+    feuilles = [[w for w in adjacence[v] if w not in epine_sommets] for v in epine]
+
+    borne = borne_boules(adjacence)
+    for k in range(max(borne, 1), n // 2 + 1):
+        gauche = [0] * len(epine)  # Nombre de feuilles placées à gauche de chaque sommet de l'épine
+        place = k  # Places libres dans l'intervalle à gauche du sommet courant
+        for i, f in enumerate(feuilles):
+            gauche[i] = min(len(f), place)
+            droite = len(f) - gauche[i]
+            # L'intervalle suivant garde la place du sommet suivant ; le dernier est fermé par le cycle
+            if droite > (k if i == len(epine) - 1 else k - 1):
+                break
+            place = k - 1 - droite
+        else:
+            ordre = []
+            for v, f, g in zip(epine, feuilles, gauche):
+                ordre += f[:g] + [v] + f[g:]
+            return "chenille " + str(len(epine)), ordre, borne
+    return None
+
+
+# Familles essayées dans l'ordre : les plus particulières d'abord (une chaîne est aussi une chenille)
+FAMILLES = (chaine_ou_cycle, etoile_ou_clique, biparti_complet, grille, grille_diagonale, tore, chenille)
+
+
+def reconnaitre(sommets, aretes):
+    """
+    Cherche une famille de graphes connue à laquelle appartient le graphe.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: Famille, None si le graphe n'est d'aucune famille reconnue (ou n'est pas connexe)
+    """
+    n = len(sommets)
+    if n < 2:
+        return None
+    adjacence, m = adjacence_simple(sommets, aretes)
+    if m == 0 or len(distances(adjacence, sommets[0])) != n:
+        return None
+    degres = {v: len(adjacence[v]) for v in adjacence}
+
+    for famille in FAMILLES:
+        trouve = famille(adjacence, n, m, degres)
+        if trouve is not None:
+            nom, ordre, borne_inf = trouve
+            etiquettes = etiqueter_ordre(n, ordre)
+            return Famille(nom, etiquettes, cyclic_bandwidth(etiquettes, aretes), borne_inf)
+    return None
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Lecture des graphes et fonctions communes à tous les modèles.
+"""
+from collections import deque
+
+
+def lire_graphe(nomFichier: str):
+    """
+    Lit un graphe depuis un fichier mtx.rnd .
+
+    :param nomFichier: nom du fichier à lire
+    :returns un couple:
+        - sommets : liste des sommets [1..n]
+        - aretes : liste des tuples (u,v)
+    """
+    aretes = []  # liste des aretes
+
+    with open(nomFichier, "r") as f:
+        f.readline()  # Saute la premiere ligne premières lignes
+        n, _, _ = map(int, f.readline().split())  # Recupère le nombre de sommets n.
+        for line in f:
+            u, v = map(int, line.split())  # Chaque ligne comporte les 2 sommets d'un arc
+            aretes.append((u, v))
+
+        sommets = [i for i in range(1, n + 1)]
+
+        return (sommets, aretes)
+
+
+def dist_cyclique(i, j, n):
+    """
+    Calcul la distance cyclique entre 2 sommets selon leur étiquette.
+
+    :param i: étiquette du premier noeud
+    :param j: étiquette du deuxième noeud
+    :param n: nombre d'étiquettes (sommets) du cycle
+    return : poids de l'arc
+    """
+    return min(abs(i - j), n - abs(i - j))
+
+
+def cyclic_bandwidth(etiquettes, aretes):
+    """
+    Calcule le cyclic bandwidth d'un étiquetage.
+
+    :param etiquettes: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    :param aretes: Arêtes du graphe
+    :return: plus grande distance cyclique entre les extrémités d'une arête (0 sans arête)
+    """
+    n = len(etiquettes)
+    return max([dist_cyclique(etiquettes[u - 1], etiquettes[v - 1], n) for (u, v) in aretes], default=0)
+
+
+def voisins(sommets, aretes):
+    """
+    Construit la liste d'adjacence du graphe.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: dictionnaire sommet -> liste de ses voisins
+    """
+    adjacence = {i: [] for i in sommets}
+    for (u, v) in aretes:
+        adjacence[u].append(v)
+        adjacence[v].append(u)
+    return adjacence
+
+
+def optimiser_k(sommets, aretes):
+    """
+    Calculer une borne supérieur optimisée du CB optimal, pour certains types de graphes.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: borne supérieur optimisée du CB optimal
+    """
+    n = len(sommets)
+
+    # Calcul du degré et construction de la liste d'adjacence
+    degre = [0] * n
+    for (u, v) in aretes:
+        degre[u - 1] += 1
+        degre[v - 1] += 1
+
+    nb_deg_1 = degre.count(1)
+    nb_deg_2 = degre.count(2)
+
+    # Cas spéciaux
+    if nb_deg_1 == 2 and nb_deg_2 == n - 2:  # chemin simple / chaîne
+        return 1
+
+    if nb_deg_2 == n:  # cycle
+        return 1
+
+    return n // 2  # Pour tous les autres cas notamment : clique, étoile (, bipartis complet équilibré...
+
+
+def etiquetage_largeur(sommets, aretes):
+    """
+    Calcule un étiquetage qui numérote les sommets dans l'ordre d'un parcours en largeur depuis v_1.
+    Les voisins d'un sommet déjà placé reçoivent ainsi des étiquettes proches de la sienne.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    """
+    adjacence = voisins(sommets, aretes)
+
+    etiquettes = [0] * len(sommets)
+    prochaine = 1
+    for depart in sommets:  # Un parcours par composante connexe
+        if etiquettes[depart - 1] == 0:
+            etiquettes[depart - 1] = prochaine
+            prochaine += 1
+            file = deque([depart])
+            while file:
+                u = file.popleft()
+                for v in adjacence[u]:
+                    if etiquettes[v - 1] == 0:
+                        etiquettes[v - 1] = prochaine
+                        prochaine += 1
+                        file.append(v)
+
+    return etiquettes
+
+
+def distances_depuis(sommets, aretes, depart=1):
+    """
+    Calcule la distance dans le graphe de chaque sommet à un sommet de départ, par parcours en largeur.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param depart: sommet de départ
+    :return: liste des distances (la i-ème valeur est celle de v_i, None si v_i n'est pas atteint)
+    """
+    adjacence = voisins(sommets, aretes)
+    dist = [None] * len(sommets)
+    dist[depart - 1] = 0
+    file = deque([depart])
+    while file:
+        u = file.popleft()
+        for v in adjacence[u]:
+            if dist[v - 1] is None:
+                dist[v - 1] = dist[u - 1] + 1
+                file.append(v)
+    return dist
+
+
+def domaines_etiquettes(sommets, aretes, k):
+    """
+    Restreint les étiquettes possibles de chaque sommet quand v_1 a l'étiquette 1 (rupture de symétrie) et que le
+    cyclic bandwidth est au plus k : un sommet à distance d de v_1 a une étiquette à distance cyclique au plus d.k
+    de 1. Les sommets non atteints depuis v_1 gardent toutes les étiquettes.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth
+    :return: liste des domaines (la i-ème valeur est la liste croissante des étiquettes permises pour v_i)
+    """
+    n = len(sommets)
+    par_rayon = {}  # Les sommets à même distance de v_1 partagent leur domaine
+    domaines = []
+    for d in distances_depuis(sommets, aretes):
+        rayon = n // 2 if d is None else min(d * k, n // 2)
+        if rayon not in par_rayon:
+            par_rayon[rayon] = [e for e in range(1, n + 1) if dist_cyclique(1, e, n) <= rayon]
+        domaines.append(par_rayon[rayon])
+    return domaines
+
+
+def paires_distance(sommets, aretes, rayon):
+    """
+    Calcule les paires de sommets non adjacents à distance au plus rayon dans le graphe, par un parcours en largeur
+    borné depuis chaque sommet.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param rayon: distance maximale (2 : paires du carré du graphe)
+    :return: dictionnaire distance d (2..rayon) -> liste des paires (u, v), u < v, à distance exactement d
+    """
+    adjacence = voisins(sommets, aretes)
+    paires = {d: [] for d in range(2, rayon + 1)}
+    for depart in sommets:
+        dist = {depart: 0}
+        frontiere = [depart]
+        for d in range(1, rayon + 1):
+            suivante = []
+            for u in frontiere:
+                for v in adjacence[u]:
+                    if v not in dist:
+                        dist[v] = d
+                        suivante.append(v)
+                        if d >= 2 and v > depart:
+                            paires[d].append((depart, v))
+            frontiere = suivante
+    return paires
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution par lot : un ensemble d'instances est résolu par un groupe de processus de longue durée.
+Chaque processus garde son interpréteur et ses solveurs importés d'une instance à l'autre ; une instance qui dépasse
+son délai est arrêtée avec son processus, qui est alors remplacé, comme un processus mort en cours d'instance (mémoire
+épuisée, plantage d'un solveur).
+"""
+import collections
+import csv
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
+import time
+
+from cyclic_bandwidth.etiquetage import chemin_etiquetage, ecrire_etiquetage
+from cyclic_bandwidth.graphe import lire_graphe
+from cyclic_bandwidth.mesures import Mesures, phase
+from cyclic_bandwidth.references import ecart, reference
+from cyclic_bandwidth.resultat import INCONNU
+
+# Colonnes des résultats écrits en CSV (les étiquettes ne sont écrites qu'en JSON)
+COLONNES = ("instance", "n", "m", "modele", "statut", "cb", "borne_inf", "borne_sup", "temps", "ref_inf", "ref_sup",
+            "ecart")
+
+# Statut d'une instance arrêtée parce qu'elle a dépassé son délai
+DELAI_DEPASSE = "DELAI"
+
+
+def lister_instances(chemins):
+    """
+    Liste les fichiers d'instances à résoudre.
+
+    :param chemins: fichiers ou dossiers (les dossiers sont parcourus à la recherche de *.mtx.rnd)
+    :return: liste triée des fichiers, sans doublon
+    """
+    instances = []
+    for chemin in chemins:
+        if os.path.isdir(chemin):
+            instances += [os.path.join(chemin, f) for f in os.listdir(chemin) if f.endswith(".mtx.rnd")]
+        else:
+            instances.append(chemin)
+    return sorted(set(instances))
+
+
+def resoudre_instance(chemin, args):
+    """
+    Résout une instance et décrit le résultat sous forme de dictionnaire.
+
+    :param chemin: fichier de l'instance
+    :param args: options de la ligne de commande
+    :return: dictionnaire du résultat (clés de COLONNES, plus "etiquettes" et "stats" avec --stats) ; l'écart est relatif au meilleur
+             bandwidth publié pour l'instance
+    """
+    from cyclic_bandwidth.cli import resoudre, statistiques
+
+    debut = time.perf_counter()
+    mesures = Mesures() if args.stats else None
+    with phase(mesures, "lecture"):
+        sommets, aretes = lire_graphe(chemin)
+    resultat = resoudre(sommets, aretes, args, os.path.basename(chemin), mesures)
+    ref = reference(chemin, sommets, aretes)
+    ligne = {
+        "instance": os.path.basename(chemin),
+        "n": len(sommets),
+        "m": len(aretes),
+        "modele": resultat.modele,
+        "statut": resultat.statut,
+        "cb": resultat.cb,
+        "borne_inf": resultat.borne_inf,
+        "borne_sup": resultat.borne_sup,
+        "temps": round(time.perf_counter() - debut, 4),
+        "ref_inf": ref.borne_inf if ref else None,
+        "ref_sup": ref.borne_sup if ref else None,
+        "ecart": ecart(resultat.cb, ref.borne_sup) if ref else None,
+        "etiquettes": resultat.etiquettes,
+    }
+    if mesures is not None:
+        ligne["stats"] = statistiques(mesures, resultat)["mesures"]
+    if args.ecrire_etiquetage is not None and resultat.etiquettes:
+        ecrire_etiquetage(chemin_etiquetage(args.ecrire_etiquetage, ligne["instance"]), resultat.etiquettes,
+                          resultat.cb, ligne["instance"], resultat.modele, resultat.statut)
+    return ligne
+
+
+def travailleur(connexion, args):
+    """
+    Boucle d'un processus du groupe : résout les instances reçues jusqu'à recevoir None.
+
+    :param connexion: extrémité du processus de son tube vers le processus principal, qui y envoie les chemins
+                      d'instances et y reçoit le dictionnaire du résultat de chacune
+    :param args: options de la ligne de commande
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()  # Le processus et ses solveurs externes (java) forment un groupe, arrêté d'un seul coup
+    sys.stdout = open(os.devnull, "w")  # Les traces des solveurs ne se mélangent pas aux résultats
+    while True:
+        chemin = connexion.recv()
+        if chemin is None:
+            break
+        try:
+            ligne = resoudre_instance(chemin, args)
+        except Exception as e:
+            ligne = {"instance": os.path.basename(chemin), "statut": INCONNU, "erreur": repr(e)}
+        connexion.send(ligne)
+
+
+def arreter(processus):
+    """
+    Arrête un processus du groupe et les solveurs qu'il a lancés.
+
+    :param processus: multiprocessing.Process à arrêter
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(processus.pid, signal.SIGKILL)
+        else:
+            processus.terminate()
+    except ProcessLookupError:
+        pass
+    processus.join()
+
+
+class Ecrivain:
+    """
+    Écrit les résultats au fil de l'eau, en lignes JSON ou en CSV.
+    """
+
+    def __init__(self, sortie, format_sortie):
+        """
+        :param sortie: flux où écrire les résultats
+        :param format_sortie: "jsonl" ou "csv"
+        """
+        self.sortie = sortie
+        self.format = format_sortie
+        if format_sortie == "csv":
+            self.csv = csv.DictWriter(sortie, fieldnames=COLONNES, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def ecrire(self, ligne):
+        """
+        Écrit un résultat et vide le tampon de la sortie.
+
+        :param ligne: dictionnaire du résultat
+        """
+        if self.format == "csv":
+            self.csv.writerow(ligne)
+        else:
+            self.sortie.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        self.sortie.flush()
+
+
+def executer_lot(instances, args, processus=1, delai=None, sortie=sys.stdout, format_sortie="jsonl"):
+    """
+    Résout des instances avec un groupe de processus réutilisés et écrit chaque résultat dès qu'il est connu.
+
+    :param instances: fichiers des instances
+    :param args: options de la ligne de commande (modèle, encodage, recherche...)
+    :param processus: nombre de processus du groupe
+    :param delai: délai maximal par instance en secondes (None : pas de délai)
+    :param sortie: flux où écrire les résultats
+    :param format_sortie: "jsonl" ou "csv"
+    :return: liste des résultats, dans l'ordre où ils ont été obtenus
+    """
+    ecrivain = Ecrivain(sortie, format_sortie)
+    restantes = collections.deque(instances)
+    # Un tube par processus : le processus principal sait toujours quelle instance chacun résout, même s'il meurt
+    groupe = {}  # tube -> [processus, instance en cours, début]
+    obtenus = []
+
+    def confier(tube):
+        if restantes:
+            chemin = restantes.popleft()
+            groupe[tube][1:] = chemin, time.perf_counter()
+            try:
+                tube.send(chemin)
+            except OSError:  # Processus mort entre deux instances : détecté au tour suivant, l'instance en erreur
+                pass
+        else:
+            try:
+                tube.send(None)
+            except OSError:
+                pass
+            groupe.pop(tube)[0].join()
+            tube.close()
+
+    def lancer():
+        tube, extremite = multiprocessing.Pipe()
+        p = multiprocessing.Process(target=travailleur, args=(extremite, args), daemon=True)
+        p.start()
+        extremite.close()
+        groupe[tube] = [p, None, None]
+        confier(tube)
+
+    def retirer(tube, ligne):
+        arreter(groupe.pop(tube)[0])
+        tube.close()
+        publier(ligne)
+        if restantes:
+            lancer()
+
+    def publier(ligne):
+        obtenus.append(ligne)
+        ecrivain.ecrire(ligne)
+
+    for _ in range(min(processus, len(instances))):
+        lancer()
+
+    while groupe:
+        multiprocessing.connection.wait(list(groupe) + [p.sentinel for p, _, _ in groupe.values()], timeout=0.1)
+        for tube in list(groupe):
+            p, chemin, debut = groupe[tube]
+            ligne = None
+            if tube.poll():
+                try:
+                    ligne = tube.recv()
+                except (EOFError, OSError):  # Tube fermé par la mort du processus
+                    pass
+            if ligne is not None:
+                publier(ligne)
+                confier(tube)
+            elif not p.is_alive():
+                # Processus mort en cours d'instance (mémoire épuisée, plantage d'un solveur) : il est remplacé
+                retirer(tube, {"instance": os.path.basename(chemin), "statut": INCONNU,
+                               "erreur": "processus arrêté (code " + str(p.exitcode) + ")"})
+            elif delai is not None and time.perf_counter() - debut > delai:
+                # Arrêt et remplacement des processus qui dépassent le délai
+                retirer(tube, {"instance": os.path.basename(chemin), "statut": DELAI_DEPASSE, "temps": delai})
+    return obtenus
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Modèle M1 : problème d'optimisation (minimisation du cyclic bandwidth) résolu par ACE via pycsp3.
+"""
+import pycsp3
+from pycsp3 import OPTIMUM as OPTIMUM_ACE, SAT as SAT_ACE, UNSAT as UNSAT_ACE
+from pycsp3 import AllDifferent, Maximum, Var, VarArray, clear, minimize, satisfy, values
+
+from cyclic_bandwidth.ace import lancer_ace
+from cyclic_bandwidth.graphe import cyclic_bandwidth, domaines_etiquettes
+from cyclic_bandwidth.m2 import poser_dual
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+
+def dist_cyclique_var(xu, xv, n):
+    """
+    Expression pycsp3 de la distance cyclique entre les étiquettes de deux sommets.
+
+    :param xu: variable de l'étiquette du premier sommet
+    :param xv: variable de l'étiquette du deuxième sommet
+    :param n: nombre d'étiquettes
+    :return: expression min(|xu - xv|, n - |xu - xv|)
+    """
+    return pycsp3.min(pycsp3.abs(xu - xv), n - pycsp3.abs(xu - xv))
+
+
+def resoudre(sommets, aretes, symetrie=True, dual=False, branche_dual=False, options_ace="", trace=False, k_low=None,
+             k_high=None, mesures=None, domaines=False, redondantes=None):
+    """
+    Résout le modèle M1 : minimise le maximum des distances cycliques sur les arêtes.
+    Les bornes connues sont posées sur l'objectif : un étiquetage qui atteint k_low est alors prouvé optimal sans
+    autre recherche.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param symetrie: fixe l'étiquette de v_1 à 1 pour rompre les symétries de rotation
+    :param dual: ajoute le modèle dual position -> sommet, canalisé avec x, et l'adjacence vue des positions sur la
+                 fenêtre de k_high (voir m2.poser_dual)
+    :param branche_dual: branche sur les positions du modèle dual (implique dual)
+    :param options_ace: options transmises à ACE (voir ace.options_recherche)
+    :param trace: mode trace
+    :param k_low: borne inférieure prouvée du cyclic bandwidth (None : aucune)
+    :param k_high: borne supérieure imposée au cyclic bandwidth (None : aucune)
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint les étiquettes de chaque sommet selon sa distance à v_1 et k_high (avec symetrie)
+    :param redondantes: paires de sommets à distance d >= 2 (voir graphe.paires_distance), contraintes à une distance
+                        cyclique <= d fois l'objectif ; None : aucune
+    :return: Resultat de la résolution
+    """
+    modele = "M1" + ("/symetrie" if symetrie else "") + ("/domaines" if domaines and symetrie and k_high is not None else "")
+    with phase(mesures, "construction"):
+        x = construire(sommets, aretes, symetrie, dual, branche_dual, k_low, k_high, mesures, domaines, redondantes)
+
+    # Résolution
+    result = lancer_ace(options_ace, mesures, trace)
+    with phase(mesures, "decodage"):
+        etiquettes = values(x) if result in (SAT_ACE, OPTIMUM_ACE) else []
+    clear()  # Réinitialise les éléments pycsp3 pour pouvoir relancer
+
+    if result is OPTIMUM_ACE:
+        cb = cyclic_bandwidth(etiquettes, aretes)
+        return Resultat(modele, OPTIMUM, etiquettes, cb, borne_inf=cb, borne_sup=cb)
+    elif result is SAT_ACE:
+        cb = cyclic_bandwidth(etiquettes, aretes)
+        return Resultat(modele, SAT, etiquettes, cb, borne_sup=cb)
+    elif result is UNSAT_ACE:
+        if trace: print("Unsat : problème non résolu.")
+        return Resultat(modele, UNSAT, borne_inf=k_high + 1 if k_high is not None else None)
+    else:
+        if trace: print("Pas de retour du solveur.")
+        return Resultat(modele, INCONNU)
+
+
+def construire(sommets, aretes, symetrie, dual, branche_dual, k_low, k_high, mesures=None, domaines=False,
+               redondantes=None):
+    """
+    Pose les variables, les contraintes et l'objectif du modèle M1 (voir resoudre pour les paramètres).
+
+    :return: tableau x des étiquettes des sommets
+    """
+    n = len(sommets)
+
+    # Création des variables et des paramètres
+    if domaines and symetrie and k_high is not None:
+        # Tout étiquetage sous k_high place les sommets proches de v_1 près de l'étiquette 1
+        permises = domaines_etiquettes(sommets, aretes, k_high)
+        x = VarArray(size=n, dom=lambda i: permises[i])
+    else:
+        x = VarArray(size=n, dom=range(1, n + 1))
+
+    # Définition des contraintes
+    satisfy(
+        AllDifferent(x)
+    )
+    if symetrie:
+        satisfy(
+            x[0] == 1
+        )
+
+    # Modèle dual (optionnel) : p[q] est le sommet placé à l'étiquette q+1 du cycle
+    # L'objectif est borné par k_high : l'adjacence vue des positions est posée sur sa fenêtre (canalisation seule
+    # sans borne connue, la fenêtre dépendrait alors de l'objectif)
+    variables, contraintes, tuples = n, 1 + (1 if symetrie else 0), 0
+    if dual or branche_dual:
+        variables_dual, contraintes_dual, tuples = poser_dual(x, sommets, aretes, k_high, branche_dual)
+        variables, contraintes = variables + variables_dual, contraintes + contraintes_dual
+
+    # Bornes connues de l'objectif (une expression par contrainte : pycsp3 modifie celle qu'il reçoit)
+    def distances():
+        return [dist_cyclique_var(x[u - 1], x[v - 1], n) for u, v in aretes]
+
+    if k_low is not None:
+        satisfy(
+            Maximum(distances()) >= k_low
+        )
+    if k_high is not None:
+        satisfy(
+            Maximum(distances()) <= k_high
+        )
+
+    # Ajout du paramètre d'optimisation
+    if redondantes:
+        # L'objectif devient une variable, pour borner aussi les paires à distance d >= 2 : d.objectif au plus
+        objectif = Var(dom=range(n // 2 + 1))
+        paires = [(d, u, v) for d, liste in redondantes.items() for (u, v) in liste
+                  if k_high is None or d * k_high < n // 2]  # Au-delà, la contrainte ne retire rien
+        satisfy(
+            Maximum(distances()) == objectif,
+            [dist_cyclique_var(x[u - 1], x[v - 1], n) <= d * objectif for (d, u, v) in paires]
+        )
+        minimize(
+            objectif
+        )
+        variables, contraintes = variables + 1, contraintes + 1 + len(paires)
+    else:
+        minimize(
+            Maximum(distances())
+        )
+
+    contraintes += (1 if k_low is not None else 0) + (1 if k_high is not None else 0)
+    noter(mesures, variables=variables, contraintes=contraintes, tuples=tuples, termes_objectif=len(aretes))
+    return x
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Modèle M2 : problème de décision « existe-t-il un étiquetage de cyclic bandwidth <= k ? » résolu par ACE via pycsp3.
+"""
+import itertools
+
+from pycsp3 import SAT as SAT_ACE, UNSAT as UNSAT_ACE
+from pycsp3 import AllDifferent, VarArray, annotate, clear, satisfy, values
+
+from cyclic_bandwidth.ace import lancer_ace
+from cyclic_bandwidth.graphe import dist_cyclique, domaines_etiquettes, voisins
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.recherche import rechercher_k
+from cyclic_bandwidth.resultat import INCONNU, SAT, UNSAT
+
+# Encodages de la contrainte « toutes les étiquettes sont différentes »
+ENCODAGES = ("alldiff", "permutations")
+
+
+def sonder(sommets, aretes, k, encodage="alldiff", symetrie=True, dual=False, branche_dual=False, options_ace="",
+           permutations=None, mesures=None, domaines=False, redondantes=None, trace=False):
+    """
+    Résout le problème de décision M2 pour une borne k.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth
+    :param encodage: "alldiff" (AllDifferent) ou "permutations" (table des permutations, petits graphes seulement)
+    :param symetrie: fixe l'étiquette de v_1 à 1 pour rompre les symétries de rotation
+    :param dual: ajoute le modèle dual position -> sommet, canalisé avec x, et l'adjacence vue des positions
+                 (voir poser_dual)
+    :param branche_dual: branche sur les positions du modèle dual (implique dual)
+    :param options_ace: options transmises à ACE (voir ace.options_recherche)
+    :param permutations: table des permutations déjà calculée (encodage "permutations")
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint les étiquettes de chaque sommet selon sa distance à v_1 (avec symetrie)
+    :param redondantes: paires de sommets à distance d >= 2 (voir graphe.paires_distance), contraintes à une distance
+                        cyclique <= d.k ; None : aucune
+    :param trace: affiche les compteurs de ACE pendant la résolution
+    :return: couple (statut, etiquettes)
+    """
+    with phase(mesures, "construction"):
+        x = construire(sommets, aretes, k, encodage, symetrie, dual, branche_dual, permutations, mesures, domaines,
+                       redondantes)
+
+    # Résolution
+    result = lancer_ace(options_ace, mesures, trace)
+    with phase(mesures, "decodage"):
+        etiquettes = values(x) if result is SAT_ACE else []
+    clear()  # Réinitialise les éléments pycsp3 pour pouvoir relancer
+
+    if result is SAT_ACE:
+        return SAT, etiquettes
+    elif result is UNSAT_ACE:
+        return UNSAT, []
+    return INCONNU, []
+
+
+def construire(sommets, aretes, k, encodage, symetrie, dual, branche_dual, permutations, mesures=None,
+               domaines=False, redondantes=None):
+    """
+    Pose les variables et les contraintes du modèle M2 pour une borne k (voir sonder pour les paramètres).
+
+    :return: tableau x des étiquettes des sommets
+    """
+    n = len(sommets)
+
+    # Création des variables et des paramètres
+    if domaines and symetrie:
+        permises = domaines_etiquettes(sommets, aretes, k)
+        x = VarArray(size=n, dom=lambda i: permises[i])
+    else:
+        x = VarArray(size=n, dom=range(1, n + 1))
+
+    # Définition des couples d'étiquettes respectants la distance imposé par la borne k.
+    couples_etiquettes_possibles = [(i, j) for i in range(1, n + 1) for j in range(1, n + 1) if
+                                    (i != j) and dist_cyclique(i, j, n) <= k]
+
+    # Définition des contraintes
+    if encodage == "permutations":
+        if permutations is None:
+            permutations = table_permutations(n, symetrie)
+        satisfy(
+            [x in permutations]
+        )
+    else:
+        satisfy(
+            AllDifferent(x)
+        )
+        if symetrie:
+            satisfy(
+                x[0] == 1
+            )
+    satisfy(
+        [(x[u - 1], x[v - 1]) in couples_etiquettes_possibles for (u, v) in aretes]
+    )
+    variables, contraintes = n, len(aretes) + 1 + (1 if symetrie and encodage != "permutations" else 0)
+
+    # Contraintes redondantes : deux sommets à distance d ont des étiquettes à distance cyclique <= d.k
+    tuples_redondants = 0
+    for d, paires in (redondantes or {}).items():
+        if paires and d * k < n // 2:  # Au-delà, toute paire d'étiquettes distinctes convient
+            couples_d = [(i, j) for i in range(1, n + 1) for j in range(1, n + 1) if
+                         (i != j) and dist_cyclique(i, j, n) <= d * k]
+            satisfy(
+                [(x[u - 1], x[v - 1]) in couples_d for (u, v) in paires]
+            )
+            contraintes, tuples_redondants = contraintes + len(paires), tuples_redondants + len(couples_d)
+
+    # Modèle dual (optionnel) : p[q] est le sommet placé à l'étiquette q+1 du cycle
+    tuples_dual = 0
+    if dual or branche_dual:
+        variables_dual, contraintes_dual, tuples_dual = poser_dual(x, sommets, aretes, k, branche_dual)
+        variables, contraintes = variables + variables_dual, contraintes + contraintes_dual
+
+    # Tuples des tables distinctes : celle des couples est partagée par toutes les arêtes
+    noter(mesures, variables=variables, contraintes=contraintes,
+          tuples=len(couples_etiquettes_possibles) + (len(permutations) if encodage == "permutations" else 0)
+          + tuples_redondants + tuples_dual)
+    return x
+
+
+def poser_dual(x, sommets, aretes, k=None, branche_dual=False):
+    """
+    Pose le modèle dual position -> sommet, canalisé avec x, et l'adjacence vue des positions pour une borne k : les
+    voisins du sommet placé à l'étiquette q+1 ont leur étiquette dans la fenêtre q+1 ± k.
+    Pour chaque position q et chaque rang t < degré maximal, v[q][t] est le t-ième voisin du sommet p[q] (le sommet
+    lui-même au-delà de son degré), lu dans une table (sommet, t-ième voisin) partagée par toutes les positions, et
+    e[q][t] = x[v[q][t]] son étiquette, de domaine la fenêtre de q+1 : O(n.degré) variables et contraintes et
+    O(n.degré) tuples en tout.
+
+    :param x: tableau des étiquettes des sommets
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth (None : canalisation seule)
+    :param branche_dual: branche sur les positions p
+    :return: triplet (variables, contraintes, tuples) ajoutés au modèle
+    """
+    n = len(sommets)
+    p = VarArray(size=n, dom=range(n))  # indice (à partir de 0) du sommet
+    satisfy(
+        AllDifferent(p),
+        [x[p[q]] == q + 1 for q in range(n)]  # Canalisation : x[i] = q+1 <=> p[q] = i
+    )
+    if branche_dual:
+        annotate(decision=p)  # Branchement sur les positions plutôt que sur les sommets
+    variables, contraintes, tuples = n, 1 + n, 0
+
+    adjacence = voisins(sommets, aretes)
+    degre = max((len(voisins_i) for voisins_i in adjacence.values()), default=0)
+    if k is None or degre == 0 or 2 * k + 1 >= n:  # Fenêtre de tout le cycle : l'adjacence ne retire rien
+        return variables, contraintes, tuples
+    # t-ième voisin de chaque sommet, en indices à partir de 0
+    tables = [[(i - 1, (adjacence[i][t] if t < len(adjacence[i]) else i) - 1) for i in sommets] for t in range(degre)]
+    fenetres = [[e for e in range(1, n + 1) if dist_cyclique(e, q + 1, n) <= k] for q in range(n)]
+    v = VarArray(size=[n, degre], dom=range(n))
+    e = VarArray(size=[n, degre], dom=lambda q, t: fenetres[q])
+    satisfy(
+        [(p[q], v[q][t]) in tables[t] for q in range(n) for t in range(degre)],
+        [x[v[q][t]] == e[q][t] for q in range(n) for t in range(degre)]
+    )
+    return variables + 2 * n * degre, contraintes + 2 * n * degre, tuples + n * degre
+
+
+def table_permutations(n, symetrie=True):
+    """
+    Construit la table de toutes les permutations des étiquettes (n! tuples).
+
+    :param n: nombre de sommets
+    :param symetrie: ne garde que les permutations qui donnent l'étiquette 1 à v_1
+    :return: liste des permutations
+    """
+    if symetrie:
+        return [(1,) + p for p in itertools.permutations(range(2, n + 1))]
+    return list(itertools.permutations(range(1, n + 1)))
+
+
+def resoudre(sommets, aretes, k_low, k_high, methode="dichotomie", encodage="alldiff", symetrie=True, dual=False,
+             branche_dual=False, options_ace="", trace=False, mesures=None, domaines=False, redondantes=None,
+             partage=None):
+    """
+    Résout le modèle M2 en cherchant la plus petite borne k satisfiable.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param methode: méthode de recherche de k (voir recherche.METHODES)
+    :param encodage: encodage de la différence des étiquettes (voir ENCODAGES)
+    :param symetrie: fixe l'étiquette de v_1 à 1
+    :param dual: ajoute le modèle dual position -> sommet
+    :param branche_dual: branche sur les positions du modèle dual
+    :param options_ace: options transmises à ACE
+    :param trace: mode trace
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint à chaque sondage les étiquettes de chaque sommet selon sa distance à v_1 (avec symetrie)
+    :param redondantes: paires de sommets à distance d >= 2, contraintes à une distance cyclique <= d.k
+    :param partage: bornes partagées avec d'autres recherches (voir recherche.rechercher_k), None : aucun partage
+    :return: Resultat de la résolution
+    """
+    modele = "M2/" + encodage + ("/symetrie" if symetrie else "") + ("/domaines" if domaines and symetrie else "") \
+        + "/" + methode
+    # Ne dépend pas de k donc peut être défini avant.
+    permutations = None
+    if encodage == "permutations":
+        with phase(mesures, "permutations"):
+            permutations = table_permutations(len(sommets), symetrie)
+            noter(mesures, tuples=len(permutations))
+
+    return rechercher_k(
+        modele, aretes,
+        lambda k: sonder(sommets, aretes, k, encodage, symetrie, dual, branche_dual, options_ace, permutations,
+                         mesures, domaines, redondantes, trace),
+        k_low, k_high, methode, trace, mesures, partage
+    )
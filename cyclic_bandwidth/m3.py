@@ -0,0 +1,594 @@
+# -*- coding: utf-8 -*-
+"""
+Modèle M3 : problème de décision « existe-t-il un étiquetage de cyclic bandwidth <= k ? » encodé en SAT (pysat).
+"""
+from array import array
+from itertools import chain, combinations, repeat
+from operator import add, mul, neg
+
+from pysat.examples.rc2 import RC2
+from pysat.formula import WCNF
+from pysat.solvers import Glucose3
+
+from cyclic_bandwidth.cubes import resoudre_cubes
+from cyclic_bandwidth.graphe import cyclic_bandwidth, dist_cyclique, domaines_etiquettes
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.progression import Progression, compteurs_pysat, resoudre_pysat
+from cyclic_bandwidth.recherche import rechercher_k
+from cyclic_bandwidth.resultat import OPTIMUM, SAT, UNSAT, Resultat
+
+try:  # numpy (optionnel) : génération vectorisée des clauses de la borne k
+    import numpy
+except ImportError:
+    numpy = None
+
+# Encodages de la contrainte « une seule étiquette par sommet, une seule fois chacune »
+ENCODAGES = ("paires", "sequentiel")
+
+
+def x(i, j, n):
+    """
+    Calcul un identifiant unique pour un x_ij
+    :param i: sommet v_i
+    :param j: valeur de l'étiquette
+    :param n: nombre de sommets
+    :return: identifiant du x_ij
+    """
+    return n * (i - 1) + j  # 1..n^2
+
+
+def s(i, j, n):
+    """
+    Calcul un identifiant unique pour un s_ij (compteur séquentiel sur les étiquettes de v_i)
+    :param i: sommet v_i
+    :param j: valeur de l'étiquette
+    :param n: nombre de sommets
+    :return: identifiant du s_ij
+    """
+    return n * n + n * (i - 1) + j  # n^2+1 .. 2*n^2
+
+
+def t(i, j, n):
+    """
+    Calcul un identifiant unique pour un t_ij (compteur séquentiel sur les sommets d'étiquette j)
+    :param i: sommet v_i
+    :param j: valeur de l'étiquette
+    :param n: nombre de sommets
+    :return: identifiant du t_ij
+    """
+    return 2 * n * n + n * (i - 1) + j  # 2*n^2+1 .. 3*n^2
+
+
+class Registre:
+    """
+    Numérotation compacte des variables d'un modèle élagué par domaines : seuls les couples (i, j) permis reçoivent un
+    rang r, consécutif dans l'ordre des sommets puis des étiquettes. Avec c couples permis, x(i, j) vaut r, s(i, j)
+    c + r et t(i, j) 2c + r : le solveur, dimensionné sur le plus grand identifiant, n'alloue rien pour les variables
+    jamais créées (la numérotation dense x, s, t va jusqu'à 3n^2).
+
+    :param n: nombre de sommets
+    :param domaines: étiquettes permises de chaque sommet (voir graphe.domaines_etiquettes)
+    """
+
+    def __init__(self, n, domaines):
+        self.n = n
+        self.domaines = domaines
+        self.rangs = array("i", [0]) * (n * n + 1)  # Rang de x(i, j) à l'indice n(i-1)+j, 0 : variable non créée
+        # Correspondance inverse, pour le décodage : sommet et étiquette de chaque rang (rang 0 inutilisé)
+        self.sommets, self.etiquettes = array("i", [0]), array("i", [0])
+        for i, permises in enumerate(domaines, start=1):
+            a, premier = n * (i - 1), len(self.sommets)
+            for r, j in enumerate(permises, start=premier):
+                self.rangs[a + j] = r
+            self.sommets.extend([i] * len(permises))
+            self.etiquettes.extend(permises)
+        self.couples = len(self.sommets) - 1
+
+    def x(self, i, j):
+        """
+        :return: identifiant du x_ij, 0 si l'étiquette j n'est pas permise pour v_i
+        """
+        return self.rangs[self.n * (i - 1) + j]
+
+    def s(self, i, j):
+        """
+        :return: identifiant du s_ij (couple (i, j) permis)
+        """
+        return self.couples + self.rangs[self.n * (i - 1) + j]
+
+    def t(self, i, j):
+        """
+        :return: identifiant du t_ij (couple (i, j) permis)
+        """
+        return 2 * self.couples + self.rangs[self.n * (i - 1) + j]
+
+    def variables(self, encodage):
+        """
+        :param encodage: encodage de la permutation (voir ENCODAGES)
+        :return: nombre de variables numérotées (x, puis s et t en encodage "sequentiel")
+        """
+        return self.couples if encodage == "paires" else 3 * self.couples
+
+    def economisees(self, encodage):
+        """
+        :param encodage: encodage de la permutation (voir ENCODAGES)
+        :return: nombre d'identifiants épargnés par rapport à la numérotation dense
+        """
+        return (1 if encodage == "paires" else 3) * (self.n * self.n - self.couples)
+
+
+def au_plus_un_paires(litteraux, tampon):
+    """
+    Ajoute à un tampon les clauses binaires « au plus un » par paires : (-a, -b) pour toutes les paires a < b.
+
+    :param litteraux: littéraux dont au plus un est vrai
+    :param tampon: array("i") des clauses binaires, deux littéraux consécutifs par clause
+    """
+    tampon.extend(chain.from_iterable(combinations([-a for a in litteraux], 2)))
+
+
+def clauses_permutation(n, encodage="sequentiel", symetrie=True, registre=None):
+    """
+    Construit les clauses qui font de x une permutation (indépendantes de k sans domaines).
+
+    :param n: nombre de sommets
+    :param encodage: "paires" (au plus un par paires, O(n^3) clauses) ou "sequentiel" (compteurs s et t, O(n^2))
+    :param symetrie: fixe l'étiquette de v_1 à 1
+    :param registre: Registre des couples permis, seules leurs variables sont créées ; None : toutes les étiquettes,
+                     numérotation dense
+    :return: couple (liste de clauses, array("i") des clauses binaires « au plus un » de l'encodage "paires")
+    """
+    clauses, binaires = [], array("i")
+    if registre is None:
+        etiquettes = [range(1, n + 1)] * n  # étiquettes permises de v_i
+        x_, s_, t_ = (lambda i, j: x(i, j, n)), (lambda i, j: s(i, j, n)), (lambda i, j: t(i, j, n))
+    else:
+        etiquettes, x_, s_, t_ = registre.domaines, registre.x, registre.s, registre.t
+    sommets = [[] for _ in range(n + 1)]  # sommets permis pour l'étiquette j
+    for i in range(1, n + 1):
+        for j in etiquettes[i - 1]:
+            sommets[j].append(i)
+
+    # 1-Une seule étiquette par sommets
+    for i in range(1, n + 1):  # Pour tous les sommets v_i
+        permises = etiquettes[i - 1]
+        # Au moins une étiquette par sommet
+        clauses.append([x_(i, j) for j in permises])
+
+        # Au maximum une étiquette par sommet
+        if encodage == "paires":
+            au_plus_un_paires(clauses[-1], binaires)
+        else:
+            clauses.append([-x_(i, permises[0]), s_(i, permises[0])])
+            for j_prec, j in zip(permises, permises[1:]):
+                clauses.append([-s_(i, j_prec), s_(i, j)])
+                clauses.append([-x_(i, j), s_(i, j)])
+                clauses.append([-x_(i, j), -s_(i, j_prec)])
+
+    # 2-Toutes les étiquettes sont différentes
+    for j in range(1, n + 1):  # Pour toutes les valeurs d'étiquettes j
+        permis = sommets[j]
+        clauses.append([x_(i, j) for i in permis])  # Toutes les étiquettes ont au moins un sommet
+
+        # Au max une seule étiquette j
+        if encodage == "paires":
+            au_plus_un_paires(clauses[-1], binaires)
+        elif permis:
+            clauses.append([-x_(permis[0], j), t_(permis[0], j)])
+            for i_prec, i in zip(permis, permis[1:]):
+                clauses.append([-t_(i_prec, j), t_(i, j)])
+                clauses.append([-x_(i, j), t_(i, j)])
+                clauses.append([-x_(i, j), -t_(i_prec, j)])
+
+    # 4-Rompre les symétries
+    if symetrie:
+        clauses.append([x_(1, 1)])
+
+    return clauses, binaires
+
+
+def couples_eloignes(n, k):
+    """
+    :param n: nombre de sommets
+    :param k: borne du cyclic bandwidth
+    :return: liste des couples (j, m) d'étiquettes à distance cyclique > k, par j puis m croissants
+    """
+    return [(j, m) for j in range(1, n + 1) for m in range(1, n + 1) if k < (m - j) % n < n - k]
+
+
+def clauses_bandwidth(n, aretes, k, registre=None):
+    """
+    Construit les clauses binaires qui interdisent une distance cyclique > k sur les arêtes.
+    Les littéraux de toutes les arêtes et de tous les couples d'étiquettes trop éloignées sont générés en une opération
+    sur des tableaux, sans boucle Python par arête : x(i, j) = n(i-1) + j est la somme du bloc des couples (j, m),
+    répété pour chaque arête, et du décalage (n(i-1), n(l-1)) de chaque arête, répété pour chaque couple.
+    Avec numpy (optionnel), la somme est diffusée par tranches d'arêtes ; sinon elle est faite par map sur des
+    array("i"). Les clauses sont rangées par arête, puis par couple (j, m).
+
+    :param n: nombre de sommets
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth
+    :param registre: Registre des couples permis : seuls les couples d'étiquettes permises aux deux extrémités de
+                     l'arête sont interdits, en numérotation compacte ; None : toutes les étiquettes, numérotation dense
+    :return: array("i") des clauses binaires, deux littéraux consécutifs par clause
+    """
+    # 3-Valeur de cyclic bandwidth
+    couples = couples_eloignes(n, k)
+    if numpy is not None:
+        return clauses_bandwidth_numpy(n, aretes, couples, registre)
+
+    bloc = array("i", chain.from_iterable(couples))  # j, m, j, m...
+    extremites = map((-1).__add__, chain.from_iterable(aretes))  # i-1, l-1, i-1, l-1...
+    decalages = map(n.__mul__, extremites)
+    # (n(i-1), n(l-1)) répété pour chaque couple, arête après arête
+    decalages = chain.from_iterable(map(mul, zip(decalages, decalages), repeat(len(couples))))
+    indices = map(add, chain.from_iterable(repeat(bloc, len(aretes))), decalages)  # x(i, j), x(l, m), ...
+    if registre is not None:
+        # Numérotation compacte ; les clauses d'un couple non permis (rang 0) sont retirées
+        rangs = map(registre.rangs.__getitem__, indices)
+        indices = chain.from_iterable(filter(all, zip(rangs, rangs)))
+    return array("i", map(neg, indices))
+
+
+def clauses_bandwidth_numpy(n, aretes, couples, registre=None, tranche=1 << 20):
+    """
+    clauses_bandwidth avec numpy : mêmes clauses, dans le même ordre.
+
+    :param n: nombre de sommets
+    :param aretes: Arêtes du graphe
+    :param couples: couples d'étiquettes trop éloignées (voir couples_eloignes)
+    :param registre: Registre des couples permis, None : toutes les étiquettes, numérotation dense
+    :param tranche: nombre de clauses diffusées à la fois, pour borner la mémoire des tableaux intermédiaires
+    :return: array("i") des clauses binaires, deux littéraux consécutifs par clause
+    """
+    tampon = array("i")
+    if not couples or not aretes:
+        return tampon
+    bloc = numpy.array(couples, dtype=numpy.intc)  # (couples, 2)
+    decalages = n * (numpy.array(aretes, dtype=numpy.intc) - 1)  # (arêtes, 2)
+    rangs = None if registre is None else numpy.frombuffer(registre.rangs, dtype=numpy.intc)
+    pas = max(1, tranche // len(couples))
+    for debut in range(0, len(aretes), pas):
+        indices = (decalages[debut:debut + pas, None, :] + bloc[None, :, :]).reshape(-1, 2)
+        if rangs is not None:
+            indices = rangs[indices]
+            indices = indices[indices.all(axis=1)]
+        tampon.frombytes(numpy.negative(indices).tobytes())
+    return tampon
+
+
+def clauses_niveaux(n, aretes, k_low, k_high, premier, registre=None):
+    """
+    Construit les clauses ternaires du modèle MaxSAT : un couple d'étiquettes à distance cyclique d, avec
+    k_low < d <= k_high, est interdit sur une arête si l'indicateur y(d-1) « cyclic bandwidth <= d-1 » est vrai.
+    Les couples à distance > k_high sont interdits sans condition (voir clauses_bandwidth).
+
+    :param n: nombre de sommets
+    :param aretes: Arêtes du graphe
+    :param k_low: borne inférieure prouvée, premier niveau
+    :param k_high: borne supérieure, au-delà du dernier niveau
+    :param premier: identifiant de y(k_low) ; y(k) vaut premier + k - k_low
+    :param registre: Registre des couples permis, None : toutes les étiquettes, numérotation dense
+    :return: array("i") des clauses ternaires, trois littéraux consécutifs par clause
+    """
+    tampon = array("i")
+    if registre is None:
+        etiquettes, rangs = [range(1, n + 1)] * n, range(n * n + 1)  # x(i, j) = n(i-1)+j
+    else:
+        etiquettes, rangs = registre.domaines, registre.rangs
+
+    def niveau(j, m):  # -y(d - 1) pour un couple à distance cyclique d, avec k_low < d <= k_high
+        return -(premier + min((m - j) % n, (j - m) % n) - 1 - k_low)
+
+    for i, l in aretes:
+        a, b = n * (i - 1), n * (l - 1)
+        for j in etiquettes[i - 1]:
+            proches = [m for m in etiquettes[l - 1] if k_low < min((m - j) % n, (j - m) % n) <= k_high]
+            bloc = [-rangs[a + j]] * (3 * len(proches))
+            bloc[0::3] = [niveau(j, m) for m in proches]
+            bloc[2::3] = [-rangs[b + m] for m in proches]
+            tampon.extend(bloc)
+    return tampon
+
+
+def charger_binaires(solver, tampon):
+    """
+    Ajoute au solveur les clauses binaires d'un tampon, sans construire de liste par clause.
+
+    :param solver: solveur pysat
+    :param tampon: array("i") des clauses binaires, deux littéraux consécutifs par clause
+    """
+    litteraux = iter(tampon)
+    solver.append_formula(zip(litteraux, litteraux))
+
+
+def decoder(modele, n, registre=None):
+    """
+    Extrait l'étiquetage d'un modèle du solveur.
+
+    :param modele: liste d'entiers : positif = variable vraie, négatif = fausse
+    :param n: nombre de sommets
+    :param registre: Registre des couples permis, None : numérotation dense
+    :return: liste des étiquettes (la i-ème valeur est l'étiquette de v_i)
+    """
+    etiquettes = [0] * n
+    if registre is not None:
+        for v in modele:
+            if 0 < v <= registre.couples:  # variables x vraies
+                etiquettes[registre.sommets[v] - 1] = registre.etiquettes[v]
+        return etiquettes
+    for v in modele:
+        if 0 < v <= n * n:  # variables x vraies
+            # Décoder i et j depuis x(i,j)
+            i, j = (v - 1) // n, (v - 1) % n + 1
+            etiquettes[i] = j
+    return etiquettes
+
+
+def phases_depart(depart, n, registre=None):
+    """
+    :param depart: étiquetage de départ (la i-ème valeur est l'étiquette de v_i)
+    :param n: nombre de sommets
+    :param registre: Registre des couples permis, None : numérotation dense
+    :return: littéraux x(i, e) de l'étiquetage, à donner en phases au solveur (couples non permis omis)
+    """
+    if registre is None:
+        return [x(i, e, n) for i, e in enumerate(depart, start=1)]
+    return [v for v in (registre.x(i, e) for i, e in enumerate(depart, start=1)) if v]
+
+
+def cubes_sondage(n, aretes, k, profondeur, symetrie=True, registre=None):
+    """
+    Découpe un sondage en cubes sur les étiquettes des profondeur sommets de plus haut degré : chaque cube fixe une
+    étiquette par sommet choisi, deux à deux différentes et à distance cyclique <= k sur les arêtes entre eux.
+    Avec la symétrie, v_1 n'est pas choisi (son étiquette est fixée à 1) et l'étiquette 1 est exclue ; la réflexion
+    e -> 2 - e (mod n), qui garde v_1 en 1, permet de plus de limiter le premier sommet à la moitié 2..n/2+1 du cycle.
+
+    :param n: nombre de sommets
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth
+    :param profondeur: nombre de sommets choisis
+    :param symetrie: l'étiquette de v_1 est fixée à 1
+    :param registre: Registre des couples permis, None : toutes les étiquettes, numérotation dense
+    :return: générateur des cubes, listes de littéraux x(i, j) à supposer vrais, produits à mesure que les solveurs
+             les demandent
+    """
+    degre = [0] * (n + 1)
+    for (u, v) in aretes:
+        degre[u] += 1
+        degre[v] += 1
+    choisis = sorted(range(2 if symetrie else 1, n + 1), key=degre.__getitem__, reverse=True)[:profondeur]
+    adjacentes = set(aretes) | {(v, u) for (u, v) in aretes}
+    litteral = registre.x if registre is not None else lambda i, j: x(i, j, n)
+
+    def etendre(etiquettes):
+        if len(etiquettes) == len(choisis):
+            yield [litteral(i, j) for i, j in zip(choisis, etiquettes)]
+            return
+        i = choisis[len(etiquettes)]
+        for j in (registre.domaines[i - 1] if registre is not None else range(1, n + 1)):
+            if symetrie and (j == 1 or not etiquettes and 2 * j > n + 2):
+                continue
+            if j not in etiquettes and all((i, l) not in adjacentes or dist_cyclique(j, e, n) <= k
+                                           for l, e in zip(choisis, etiquettes)):
+                yield from etendre(etiquettes + [j])
+
+    return etendre([])
+
+
+def sonder(n, aretes, base, k, mesures=None, registre=None, depart=None, trace=False, symetrie=True, cubes=0,
+           travailleurs=0):
+    """
+    Résout le problème de décision M3 pour une borne k.
+
+    :param n: nombre de sommets
+    :param aretes: Arêtes du graphe
+    :param base: clauses de la permutation (voir clauses_permutation)
+    :param k: borne du cyclic bandwidth
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param registre: Registre des couples permis pour cette borne k, None : toutes les étiquettes
+    :param depart: étiquetage de départ, donné en phases des variables x au solveur (None : aucun)
+    :param trace: affiche les compteurs du solveur pendant la résolution (voir progression.resoudre_pysat)
+    :param symetrie: l'étiquette de v_1 est fixée à 1 (découpe en cubes)
+    :param cubes: profondeur de la découpe en cubes résolus en parallèle (voir cubes_sondage), 0 : un seul solveur
+    :param travailleurs: nombre de processus de la découpe en cubes (0 : nombre de coeurs)
+    :return: couple (statut, etiquettes)
+    """
+    with phase(mesures, "clauses"):
+        clauses = clauses_bandwidth(n, aretes, k, registre)
+        noter(mesures, clauses=len(clauses) // 2)
+
+    if cubes:
+        # Les cubes sont découpés pendant la résolution : leur nombre, noté en cubes_resolus, n'est connu qu'à la fin
+        decoupe = cubes_sondage(n, aretes, k, cubes, symetrie, registre)
+        if trace: print("Cubes pour", k, ": découpe sur", cubes, "sommets")
+        permutation, binaires = base
+        with phase(mesures, "solveur"):
+            statut, solution = resoudre_cubes(permutation, (binaires, clauses), decoupe, travailleurs,
+                                              phases_depart(depart, n, registre) if depart else None, mesures)
+        if statut == SAT:
+            with phase(mesures, "decodage"):
+                etiquettes = decoder(solution, n, registre)
+            return SAT, etiquettes
+        return statut, []
+
+    with phase(mesures, "chargement"):
+        solver = Glucose3()
+
+        # Ajouter toutes les clauses
+        permutation, binaires = base  # Sans domaines, ces clauses ne bougent pas : on ne les calculent qu'une seule fois.
+        solver.append_formula(permutation)
+        charger_binaires(solver, binaires)
+        charger_binaires(solver, clauses)
+        if depart:
+            solver.set_phases(phases_depart(depart, n, registre))
+        noter(mesures, variables=solver.nof_vars(), clauses=solver.nof_clauses())
+
+    with phase(mesures, "solveur"):
+        satisfiable = resoudre_pysat(solver, mesures, trace)
+
+    if satisfiable:
+        with phase(mesures, "decodage"):
+            etiquettes = decoder(solver.get_model(), n, registre)
+        solver.delete()
+        return SAT, etiquettes
+    solver.delete()
+    return UNSAT, []
+
+
+def sonder_domaines(sommets, aretes, k, encodage, symetrie, mesures=None, depart=None, trace=False, cubes=0,
+                    travailleurs=0):
+    """
+    Résout le problème de décision M3 pour une borne k, en ne créant que les variables x(i, j) des étiquettes permises
+    par la distance de v_i à v_1 (voir graphe.domaines_etiquettes) : la permutation dépend alors de k.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k: borne du cyclic bandwidth
+    :param encodage: encodage de la permutation (voir ENCODAGES)
+    :param symetrie: fixe l'étiquette de v_1 à 1
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param depart: étiquetage de départ (None : aucun)
+    :param trace: affiche les compteurs du solveur pendant la résolution
+    :param cubes: profondeur de la découpe en cubes (voir sonder), 0 : un seul solveur
+    :param travailleurs: nombre de processus de la découpe en cubes (0 : nombre de coeurs)
+    :return: couple (statut, etiquettes)
+    """
+    n = len(sommets)
+    with phase(mesures, "domaines"):
+        registre = Registre(n, domaines_etiquettes(sommets, aretes, k))
+        noter(mesures, couples_permis=registre.couples, variables_economisees=registre.economisees(encodage))
+    if trace: print("Variables pour", k, ":", registre.variables(encodage), "(" + str(registre.economisees(encodage)),
+                    "économisées par la numérotation compacte)")
+    with phase(mesures, "permutation"):
+        base = clauses_permutation(n, encodage, symetrie, registre)
+        noter(mesures, clauses=len(base[0]) + len(base[1]) // 2)
+    return sonder(n, aretes, base, k, mesures, registre, depart, trace, symetrie, cubes, travailleurs)
+
+
+def resoudre_maxsat(sommets, aretes, k_low, k_high, encodage="sequentiel", symetrie=True, trace=False, mesures=None,
+                    domaines=False, depart=None):
+    """
+    Résout le modèle M3 en un seul appel MaxSAT (RC2) : les clauses de la permutation sont dures, et chaque niveau
+    k_low <= k < k_high a un indicateur y(k) « cyclic bandwidth <= k », avec y(k) -> y(k+1) et une clause souple
+    unitaire y(k). Le coût optimal est le nombre de niveaux faux, d'où CB = k_low + coût ; les clauses apprises sont
+    partagées entre les niveaux au lieu d'être perdues à chaque sondage.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param encodage: encodage de la permutation (voir ENCODAGES)
+    :param symetrie: fixe l'étiquette de v_1 à 1
+    :param trace: mode trace
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint les étiquettes de chaque sommet selon sa distance à v_1 et k_high (avec symetrie)
+    :param depart: étiquetage de départ, donné en phases des variables x au solveur (None : aucun)
+    :return: Resultat de la résolution
+    """
+    n = len(sommets)
+    modele = "M3/" + encodage + ("/symetrie" if symetrie else "") + ("/domaines" if domaines and symetrie else "") \
+        + "/maxsat"
+    if k_low > k_high:
+        return Resultat(modele, UNSAT, borne_inf=k_low)
+
+    # Les domaines calculés pour k_high contiennent ceux de toutes les bornes plus petites
+    registre = None
+    if domaines and symetrie:
+        with phase(mesures, "domaines"):
+            registre = Registre(n, domaines_etiquettes(sommets, aretes, k_high))
+            noter(mesures, couples_permis=registre.couples, variables_economisees=registre.economisees(encodage))
+        if trace: print("Variables :", registre.variables(encodage), "(" + str(registre.economisees(encodage)),
+                        "économisées par la numérotation compacte)")
+    # y(k_low), après les variables x (s et t)
+    premier = (registre.variables(encodage) if registre else n * n if encodage == "paires" else 3 * n * n) + 1
+    with phase(mesures, "permutation"):
+        permutation, binaires = clauses_permutation(n, encodage, symetrie, registre)
+    with phase(mesures, "clauses"):
+        interdites = clauses_bandwidth(n, aretes, k_high, registre)
+        ternaires = clauses_niveaux(n, aretes, k_low, k_high, premier, registre)
+        niveaux = [premier + k - k_low for k in range(k_low, k_high)]
+        noter(mesures, clauses=len(permutation) + (len(binaires) + len(interdites)) // 2 + len(ternaires) // 3,
+              niveaux=len(niveaux))
+
+    with phase(mesures, "chargement"):
+        formule = WCNF()
+        formule.nv = premier + k_high - k_low
+        for y, y_suivant in zip(niveaux, niveaux[1:]):  # y(k) -> y(k+1)
+            permutation.append([-y, y_suivant])
+        formule.hard = permutation
+        for y in niveaux:
+            formule.append([y], weight=1)
+        rc2 = RC2(formule, solver="g3")
+        charger_binaires(rc2.oracle, binaires)
+        charger_binaires(rc2.oracle, interdites)
+        litteraux = iter(ternaires)
+        rc2.oracle.append_formula(zip(litteraux, litteraux, litteraux))
+        if depart:
+            rc2.oracle.set_phases(phases_depart(depart, n, registre))
+        noter(mesures, variables=rc2.oracle.nof_vars(), clauses=rc2.oracle.nof_clauses())
+
+    with phase(mesures, "solveur"):
+        progression = Progression(mesures, trace)  # RC2 enchaîne les appels à l'oracle : un seul relevé, à la fin
+        solution = rc2.compute()
+        noter(mesures, cout=rc2.cost)
+        if progression.actif:
+            progression.relever(**compteurs_pysat(rc2.oracle))
+            progression.terminer()
+    if solution is None:
+        rc2.delete()
+        if trace: print("Unsat pour", k_high)
+        return Resultat(modele, UNSAT, borne_inf=k_high + 1)
+
+    with phase(mesures, "decodage"):
+        etiquettes = decoder(solution, n, registre)
+    rc2.delete()
+    cb = cyclic_bandwidth(etiquettes, aretes)
+    if trace: print("Optimum MaxSAT pour", cb, ": " + str(k_high - k_low - rc2.cost), "niveaux satisfaits sur",
+                    k_high - k_low)
+    return Resultat(modele, OPTIMUM, etiquettes, cb, borne_inf=cb, borne_sup=cb)
+
+
+def resoudre(sommets, aretes, k_low, k_high, methode="dichotomie", encodage="sequentiel", symetrie=True, trace=False,
+             mesures=None, domaines=False, maxsat=False, depart=None, cubes=0, travailleurs=0, partage=None):
+    """
+    Résout le modèle M3 en cherchant la plus petite borne k satisfiable.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param methode: méthode de recherche de k (voir recherche.METHODES)
+    :param encodage: encodage de la permutation (voir ENCODAGES)
+    :param symetrie: fixe l'étiquette de v_1 à 1
+    :param trace: mode trace
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint à chaque sondage les étiquettes de chaque sommet selon sa distance à v_1 (avec symetrie)
+    :param maxsat: un seul appel MaxSAT au lieu de la recherche de k (voir resoudre_maxsat)
+    :param depart: étiquetage de départ, donné en phases des variables x à chaque sondage (None : aucun)
+    :param cubes: profondeur de la découpe de chaque sondage en cubes résolus en parallèle (voir cubes_sondage),
+                  0 : un seul solveur par sondage ; ignorée avec maxsat
+    :param travailleurs: nombre de processus de la découpe en cubes (0 : nombre de coeurs)
+    :param partage: bornes partagées avec d'autres recherches (voir recherche.rechercher_k), None : aucun partage ;
+                    ignoré avec maxsat
+    :return: Resultat de la résolution
+    """
+    if maxsat:
+        return resoudre_maxsat(sommets, aretes, k_low, k_high, encodage, symetrie, trace, mesures, domaines, depart)
+    n = len(sommets)
+    modele = "M3/" + encodage + ("/symetrie" if symetrie else "") + ("/domaines" if domaines and symetrie else "") \
+        + ("/cubes" + str(cubes) if cubes else "") + "/" + methode
+    if domaines and symetrie:
+        return rechercher_k(modele, aretes,
+                            lambda k: sonder_domaines(sommets, aretes, k, encodage, symetrie, mesures, depart, trace,
+                                                      cubes, travailleurs),
+                            k_low, k_high, methode, trace, mesures, partage)
+
+    with phase(mesures, "permutation"):
+        base = clauses_permutation(n, encodage, symetrie)
+        noter(mesures, clauses=len(base[0]) + len(base[1]) // 2)
+
+    return rechercher_k(modele, aretes,
+                        lambda k: sonder(n, aretes, base, k, mesures, None, depart, trace, symetrie, cubes,
+                                         travailleurs),
+                        k_low, k_high, methode, trace, mesures, partage)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Modèle M4 : problème d'optimisation (minimisation du cyclic bandwidth) résolu par CP-SAT (OR-Tools), avec plusieurs
+travailleurs de recherche en parallèle.
+"""
+import os
+
+from ortools.sat.python import cp_model
+
+from cyclic_bandwidth.graphe import cyclic_bandwidth, domaines_etiquettes
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+
+class Progression(cp_model.CpSolverSolutionCallback):
+    """
+    Affiche chaque amélioration de l'objectif trouvée par les travailleurs (mode trace).
+    """
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+
+    def on_solution_callback(self):
+        print("Solution de CB", int(self.ObjectiveValue()), "après", "%.2f" % self.WallTime(), "s, borne inférieure",
+              int(self.BestObjectiveBound()))
+
+
+def dist_cyclique_var(modele, xu, xv, n):
+    """
+    Variable CP-SAT de la distance cyclique entre les étiquettes de deux sommets.
+
+    :param modele: cp_model.CpModel
+    :param xu: variable de l'étiquette du premier sommet
+    :param xv: variable de l'étiquette du deuxième sommet
+    :param n: nombre d'étiquettes
+    :return: variable égale à min(|xu - xv|, n - |xu - xv|)
+    """
+    ecart = modele.NewIntVar(0, n - 1, "")
+    modele.AddAbsEquality(ecart, xu - xv)
+    distance = modele.NewIntVar(0, n // 2, "")
+    modele.AddMinEquality(distance, [ecart, n - ecart])
+    return distance
+
+
+def resoudre(sommets, aretes, symetrie=True, travailleurs=0, temps_max=None, trace=False, k_low=None, k_high=None,
+             mesures=None, domaines=False, redondantes=None, depart=None):
+    """
+    Résout le modèle M4 : minimise le maximum des distances cycliques sur les arêtes avec CP-SAT.
+    Avec un temps maximal, le meilleur étiquetage trouvé est rendu avec la meilleure borne inférieure prouvée.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param symetrie: fixe l'étiquette de v_1 à 1 pour rompre les symétries de rotation
+    :param travailleurs: nombre de travailleurs de recherche en parallèle (0 : nombre de coeurs)
+    :param temps_max: temps maximal de la recherche en secondes (None : aucun)
+    :param trace: mode trace
+    :param k_low: borne inférieure prouvée du cyclic bandwidth (None : aucune)
+    :param k_high: borne supérieure imposée au cyclic bandwidth (None : aucune)
+    :param mesures: Mesures des phases (None : pas de mesure)
+    :param domaines: restreint les étiquettes de chaque sommet selon sa distance à v_1 et k_high (avec symetrie)
+    :param redondantes: paires de sommets à distance d >= 2 (voir graphe.paires_distance), contraintes à une distance
+                        cyclique <= d fois l'objectif ; None : aucune
+    :param depart: étiquetage donné en indication au solveur (None : aucun)
+    :return: Resultat de la résolution
+    """
+    nom = "M4" + ("/symetrie" if symetrie else "") + ("/domaines" if domaines and symetrie and k_high is not None else "")
+    if k_low is not None and k_high is not None and k_low > k_high:
+        return Resultat(nom, UNSAT, borne_inf=k_low)
+    with phase(mesures, "construction"):
+        modele, x = construire(sommets, aretes, symetrie, k_low, k_high, mesures, domaines, redondantes)
+        for v, e in zip(x, depart or []):
+            modele.AddHint(v, e)
+
+    # Résolution
+    solveur = cp_model.CpSolver()
+    solveur.parameters.num_workers = travailleurs if travailleurs > 0 else os.cpu_count() or 1
+    if temps_max is not None:
+        solveur.parameters.max_time_in_seconds = temps_max
+    with phase(mesures, "solveur", travailleurs=solveur.parameters.num_workers):
+        statut = solveur.Solve(modele, Progression() if trace else None)
+        noter(mesures, statut=solveur.StatusName(statut))
+
+    if statut in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        with phase(mesures, "decodage"):
+            etiquettes = [solveur.Value(v) for v in x]
+        cb = cyclic_bandwidth(etiquettes, aretes)
+        if statut == cp_model.OPTIMAL:
+            return Resultat(nom, OPTIMUM, etiquettes, cb, borne_inf=cb, borne_sup=cb)
+        borne_inf = max(int(solveur.BestObjectiveBound()), k_low if k_low is not None else 0)
+        return Resultat(nom, SAT, etiquettes, cb, borne_inf=min(borne_inf, cb), borne_sup=cb)
+    elif statut == cp_model.INFEASIBLE:
+        if trace: print("Unsat : problème non résolu.")
+        return Resultat(nom, UNSAT, borne_inf=k_high + 1 if k_high is not None else None)
+    else:
+        if trace: print("Pas de retour du solveur.")
+        return Resultat(nom, INCONNU, borne_inf=k_low)
+
+
+def construire(sommets, aretes, symetrie, k_low, k_high, mesures=None, domaines=False, redondantes=None):
+    """
+    Pose les variables, les contraintes et l'objectif du modèle M4 (voir resoudre pour les paramètres).
+
+    :return: couple (cp_model.CpModel, liste x des variables des étiquettes des sommets)
+    """
+    n = len(sommets)
+    modele = cp_model.CpModel()
+
+    # Création des variables : x[i] est l'étiquette du sommet v_(i+1)
+    if domaines and symetrie and k_high is not None:
+        x = [modele.NewIntVarFromDomain(cp_model.Domain.FromValues(permises), "x" + str(i))
+             for i, permises in enumerate(domaines_etiquettes(sommets, aretes, k_high), start=1)]
+    else:
+        x = [modele.NewIntVar(1, n, "x" + str(i)) for i in sommets]
+
+    # Une étiquette différente par sommet
+    modele.AddAllDifferent(x)
+
+    # Rupture des symétries
+    if symetrie:
+        modele.Add(x[0] == 1)
+
+    # Objectif : le maximum des distances cycliques, borné par les bornes connues
+    objectif = modele.NewIntVar(k_low if k_low is not None else 0, k_high if k_high is not None else n // 2,
+                                "objectif")
+    for (u, v) in aretes:
+        modele.Add(dist_cyclique_var(modele, x[u - 1], x[v - 1], n) <= objectif)
+
+    # Contraintes redondantes : deux sommets à distance d ont des étiquettes à distance cyclique <= d.objectif
+    for d, paires in (redondantes or {}).items():
+        if k_high is None or d * k_high < n // 2:  # Au-delà, la contrainte ne retire rien
+            for (u, v) in paires:
+                modele.Add(dist_cyclique_var(modele, x[u - 1], x[v - 1], n) <= d * objectif)
+
+    modele.Minimize(objectif)
+
+    proto = modele.Proto()
+    noter(mesures, variables=len(proto.variables), contraintes=len(proto.constraints))
+    return modele, x
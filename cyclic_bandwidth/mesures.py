@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure du temps et de la taille des modèles, phase par phase (lecture, construction, compilation, solveur, décodage)
+et sondage par sondage de k, pour l'option --stats.
+"""
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+
+def temps_cpu():
+    """
+    Temps CPU consommé par le processus et par ses processus fils terminés (le solveur ACE lancé par pycsp3).
+
+    :return: temps en secondes
+    """
+    fils = os.times()
+    return time.process_time() + fils.children_user + fils.children_system
+
+
+class Mesures:
+    """
+    Arbre des phases d'une résolution : chaque phase a son temps réel (« mur »), son temps CPU, ses informations
+    (k, tailles du modèle, statut...) et ses sous-phases.
+    """
+
+    def __init__(self):
+        self.racine = {"phase": "total", "phases": []}
+        self.pile = [self.racine]
+        self.debut = (time.perf_counter(), temps_cpu())
+
+    @contextmanager
+    def phase(self, nom, **infos):
+        """
+        Mesure une phase ; les phases ouvertes pendant celle-ci deviennent ses sous-phases.
+
+        :param nom: nom de la phase
+        :param infos: informations de la phase
+        :return: dictionnaire de la phase
+        """
+        noeud = dict(phase=nom, **infos)
+        noeud["phases"] = []
+        self.pile[-1]["phases"].append(noeud)
+        self.pile.append(noeud)
+        mur, cpu = time.perf_counter(), temps_cpu()
+        try:
+            yield noeud
+        finally:
+            noeud["mur"] = round(time.perf_counter() - mur, 6)
+            noeud["cpu"] = round(temps_cpu() - cpu, 6)
+            if not noeud["phases"]:
+                del noeud["phases"]
+            self.pile.pop()
+
+    def ajouter(self, nom, mur, cpu=None, **infos):
+        """
+        Ajoute une phase déjà mesurée (par exemple une partie d'un appel qu'on ne peut pas découper).
+
+        :param nom: nom de la phase
+        :param mur: temps réel en secondes
+        :param cpu: temps CPU en secondes
+        :param infos: informations de la phase
+        """
+        noeud = dict(phase=nom, **infos)
+        noeud["mur"] = round(mur, 6)
+        noeud["cpu"] = round(cpu, 6) if cpu is not None else None
+        self.pile[-1]["phases"].append(noeud)
+
+    def noter(self, **infos):
+        """
+        Ajoute des informations à la phase en cours.
+
+        :param infos: informations (tailles du modèle, statut...)
+        """
+        self.pile[-1].update(infos)
+
+    def en_dict(self):
+        """
+        :return: arbre des phases, avec le temps total depuis la création
+        """
+        self.racine["mur"] = round(time.perf_counter() - self.debut[0], 6)
+        self.racine["cpu"] = round(temps_cpu() - self.debut[1], 6)
+        return self.racine
+
+
+def phase(mesures, nom, **infos):
+    """
+    Mesure une phase si les mesures sont activées.
+
+    :param mesures: Mesures, None si désactivées
+    :param nom: nom de la phase
+    :param infos: informations de la phase
+    :return: gestionnaire de contexte
+    """
+    return mesures.phase(nom, **infos) if mesures is not None else nullcontext()
+
+
+def noter(mesures, **infos):
+    """
+    Ajoute des informations à la phase en cours si les mesures sont activées.
+
+    :param mesures: Mesures, None si désactivées
+    :param infos: informations
+    """
+    if mesures is not None:
+        mesures.noter(**infos)
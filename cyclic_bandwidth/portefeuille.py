@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Portefeuille : plusieurs variantes (modèle et options) résolvent la même instance en parallèle, chacune dans son
+processus. Les bornes trouvées passent par un canal local (voir Canal) : une recherche de k (M2, M3) resserre son
+intervalle avant chaque sondage avec les bornes des autres. Dès que la plus grande borne inférieure prouvée atteint le
+meilleur étiquetage trouvé, toutes les variantes sont arrêtées ; la variante qui a fermé l'intervalle est la gagnante.
+"""
+import copy
+import multiprocessing
+import os
+import queue
+import shlex
+import signal
+import sys
+import time
+
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.recherche import Partage
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+# Statut d'une variante arrêtée avant sa fin (optimum prouvé par une autre, ou délai dépassé)
+ARRETEE = "ARRETEE"
+
+
+class Canal(Partage):
+    """
+    Bornes partagées entre les processus d'un portefeuille : plus grande borne inférieure prouvée et plus petit cyclic
+    bandwidth d'un étiquetage trouvé, en mémoire partagée. Chaque amélioration est aussi envoyée au processus
+    principal, avec l'étiquetage, sur la file des messages.
+
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param messages: file des messages vers le processus principal
+    :param contexte: contexte multiprocessing
+    """
+
+    def __init__(self, k_low, k_high, messages, contexte):
+        self.verrou = contexte.Lock()
+        self.borne_inf = contexte.Value("i", k_low, lock=False)
+        self.cb = contexte.Value("i", k_high + 1, lock=False)  # k_high + 1 : aucun étiquetage sous k_high
+        self.messages = messages
+        self.variante = None  # Nom de la variante du processus, donné à son lancement
+
+    def resserrer(self, k_low, k_high):
+        """
+        :param k_low: borne inférieure prouvée de la recherche
+        :param k_high: plus grande borne encore utile à sonder
+        :return: couple (k_low, k_high) resserré par les bornes partagées
+        """
+        with self.verrou:
+            return max(k_low, self.borne_inf.value), min(k_high, self.cb.value - 1)
+
+    def ameliorer(self, borne_inf=None, cb=None):
+        """
+        Met à jour les bornes partagées.
+
+        :param borne_inf: borne inférieure prouvée (None : aucune)
+        :param cb: cyclic bandwidth d'un étiquetage trouvé (None : aucun)
+        :return: True si l'une des bornes partagées est améliorée
+        """
+        ameliore = False
+        with self.verrou:
+            if borne_inf is not None and borne_inf > self.borne_inf.value:
+                self.borne_inf.value, ameliore = borne_inf, True
+            if cb is not None and cb < self.cb.value:
+                self.cb.value, ameliore = cb, True
+        return ameliore
+
+    def publier(self, borne_inf=None, etiquettes=None, cb=None):
+        """
+        Partage les bornes d'un sondage, et les envoie au processus principal si elles améliorent les bornes connues.
+
+        :param borne_inf: borne inférieure prouvée (None : aucune)
+        :param etiquettes: étiquetage trouvé (None : aucun)
+        :param cb: cyclic bandwidth de l'étiquetage
+        """
+        if self.ameliorer(borne_inf, cb):
+            self.messages.put(("borne", self.variante, borne_inf, etiquettes, cb))
+
+
+def arguments_variante(parser, args, variante):
+    """
+    Options d'une variante : celles de la ligne de commande, remplacées par celles de la variante.
+
+    :param parser: parser de la ligne de commande (voir cli.creer_parser)
+    :param args: options de la ligne de commande
+    :param variante: modèle suivi de ses options, ex. "M3 --maxsat" (ou options seules, ex. "-m M3 --maxsat")
+    :return: options de la variante
+    """
+    mots = shlex.split(variante)
+    if mots and not mots[0].startswith("-"):
+        mots = ["-m"] + mots
+    return parser.parse_args(mots, namespace=copy.copy(args))
+
+
+def lancer_variante(nom, sommets, aretes, args, k_low, k_high, depart, canal, messages):
+    """
+    Processus d'une variante : résout le graphe en partageant ses bornes, puis envoie son Resultat.
+
+    :param nom: nom de la variante
+    :param args: options de la variante
+    :param canal: Canal des bornes partagées
+    :param messages: file des messages ("fin", nom, Resultat) ou ("erreur", nom, message), en plus des bornes publiées
+                     par le canal
+    (autres paramètres : voir resoudre_portefeuille)
+    """
+    from cyclic_bandwidth.cli import resoudre_modele
+
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()  # Le processus et ses solveurs externes (java) forment un groupe, arrêté d'un seul coup
+    sys.stdout = open(os.devnull, "w")  # Les traces des variantes ne se mélangent pas
+    canal.variante = nom
+    try:
+        messages.put(("fin", nom, resoudre_modele(sommets, aretes, args, k_low, k_high, None, depart, canal)))
+    except Exception as e:
+        messages.put(("erreur", nom, repr(e)))
+
+
+def arreter(processus):
+    """
+    Arrête le processus d'une variante et les solveurs qu'il a lancés.
+
+    :param processus: multiprocessing.Process à arrêter
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(processus.pid, signal.SIGKILL)
+        else:
+            processus.terminate()
+    except ProcessLookupError:
+        pass
+    processus.join()
+
+
+def resoudre_portefeuille(sommets, aretes, variantes, k_low, k_high, delai=None, trace=False, mesures=None,
+                          depart=None):
+    """
+    Résout le graphe avec plusieurs variantes en parallèle, jusqu'à ce que l'une d'elles ferme l'intervalle
+    [k_low, k_high], que toutes aient fini ou que le délai soit dépassé.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :param variantes: dictionnaire nom -> options de la variante (voir arguments_variante)
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param delai: délai maximal en secondes (None : aucun)
+    :param trace: affiche les bornes reçues et la fin de chaque variante
+    :param mesures: Mesures où noter la gagnante et le bilan des variantes (None : pas de mesure)
+    :param depart: étiquetage de départ donné à chaque variante (None : aucun)
+    :return: Resultat combiné, de modèle "portefeuille/" suivi du nom de la gagnante
+    """
+    contexte = multiprocessing.get_context()
+    messages = contexte.Queue()
+    canal = Canal(k_low, k_high, messages, contexte)
+    debut = time.perf_counter()
+
+    borne_inf, meilleur = k_low, None  # meilleur : (etiquettes, cb, nom de la variante)
+    gagnante = None
+    bilan = {nom: {"variante": nom, "statut": ARRETEE} for nom in variantes}
+
+    def prendre(nom, b_inf, etiquettes, cb):
+        # Retient les bornes d'une variante ; rend True si l'intervalle est fermé
+        nonlocal borne_inf, meilleur
+        if b_inf is not None and b_inf > borne_inf:
+            borne_inf = b_inf
+        if etiquettes and (meilleur is None or cb < meilleur[1]):
+            meilleur = (etiquettes, cb, nom)
+        canal.ameliorer(borne_inf, meilleur[1] if meilleur else None)
+        return borne_inf > min(k_high, meilleur[1] - 1 if meilleur else k_high)
+
+    with phase(mesures, "portefeuille", variantes=list(variantes)):
+        groupe = {}
+        for nom, args in variantes.items():
+            p = contexte.Process(target=lancer_variante,
+                                 args=(nom, sommets, aretes, args, k_low, k_high, depart, canal, messages))
+            p.start()
+            groupe[nom] = p
+        try:
+            en_cours = set(groupe)
+            while en_cours and gagnante is None:
+                reste = None if delai is None else delai - (time.perf_counter() - debut)
+                if reste is not None and reste <= 0:
+                    if trace: print("Portefeuille : délai dépassé")
+                    break
+                try:
+                    message = messages.get(timeout=min(reste, 0.5) if reste is not None else 0.5)
+                except queue.Empty:
+                    for nom in list(en_cours):  # Un processus arrêté sans message (mémoire épuisée...) est en erreur
+                        if groupe[nom].exitcode not in (None, 0):
+                            en_cours.discard(nom)
+                            bilan[nom].update(statut=INCONNU, erreur="code retour " + str(groupe[nom].exitcode))
+                    continue
+                if message[0] == "borne":
+                    _, nom, b_inf, etiquettes, cb = message
+                    if trace: print("Portefeuille :", nom, "borne inférieure" if cb is None else "étiquetage de CB",
+                                    b_inf if cb is None else cb)
+                    ferme = prendre(nom, b_inf, etiquettes, cb)
+                else:
+                    evenement, nom, contenu = message
+                    en_cours.discard(nom)
+                    groupe[nom].join()
+                    bilan[nom]["temps"] = round(time.perf_counter() - debut, 4)
+                    if evenement == "erreur":
+                        bilan[nom].update(statut=INCONNU, erreur=contenu)
+                        if trace: print("Portefeuille :", nom, "en erreur", contenu)
+                        continue
+                    bilan[nom].update(statut=contenu.statut, cb=contenu.cb, borne_inf=contenu.borne_inf)
+                    if trace: print("Portefeuille :", nom, "termine,", contenu.statut, "en", bilan[nom]["temps"], "s")
+                    ferme = prendre(nom, contenu.borne_inf, contenu.etiquettes, contenu.cb)
+                if ferme:
+                    gagnante = nom
+                    bilan[nom].setdefault("temps", round(time.perf_counter() - debut, 4))
+        finally:
+            for p in groupe.values():
+                if p.is_alive():
+                    arreter(p)
+        if trace and gagnante is not None: print("Variante gagnante :", gagnante)
+        noter(mesures, gagnante=gagnante, bilan=list(bilan.values()))
+
+    nom = gagnante or (meilleur[2] if meilleur else None)
+    modele = "portefeuille/" + (nom if nom is not None else "-")
+    if meilleur is not None:
+        etiquettes, cb, _ = meilleur
+        return Resultat(modele, OPTIMUM if borne_inf >= cb else SAT, etiquettes, cb, borne_inf=min(borne_inf, cb),
+                        borne_sup=cb)
+    return Resultat(modele, UNSAT if gagnante is not None else INCONNU, borne_inf=borne_inf)
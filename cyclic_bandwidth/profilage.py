@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Mode profilage (--profile) : la résolution est suivie par le profileur déterministe cProfile et par tracemalloc.
+On obtient les fonctions les plus coûteuses et, pour chaque phase des mesures (construction, clauses, sondages...),
+le pic mémoire et les lignes qui ont alloué le plus.
+"""
+import cProfile
+import inspect
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from cyclic_bandwidth.mesures import Mesures
+
+# Fichiers dont les allocations (celles des mesures elles-mêmes) ne sont pas des sites d'allocation intéressants
+EXCLUS = {tracemalloc.__file__, inspect.getfile(Mesures), __file__, "<frozen importlib._bootstrap>",
+          "<frozen importlib._bootstrap_external>"}
+
+
+class Profilage(Mesures):
+    """
+    Mesures des phases complétées par le profil des fonctions et la mémoire de chaque phase.
+    Le surcoût du profilage fausse les temps absolus : seules les proportions entre phases et fonctions comptent.
+    """
+
+    def __init__(self, sites=5):
+        """
+        :param sites: nombre de lignes d'allocation retenues par phase
+        """
+        super().__init__()
+        self.sites = sites
+        self.profil = cProfile.Profile()
+        self.surcout = 0  # Temps réel passé dans les relevés, retiré des temps des phases
+        self.surcout_cpu = 0
+
+    def demarrer(self):
+        """
+        Démarre le profileur et le suivi des allocations.
+        """
+        tracemalloc.start()
+        self.racine["pic_memoire_ko"] = 0
+        self.profil.enable()
+
+    def arreter(self):
+        """
+        Arrête le profileur et le suivi des allocations.
+        """
+        self.profil.disable()
+        self._replier(self.racine)
+        tracemalloc.stop()
+
+    @contextmanager
+    def _releve(self):
+        """
+        Encadre un relevé du profilage : le profileur est suspendu et le temps passé est compté comme surcoût.
+        """
+        self.profil.disable()
+        mur, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.surcout += time.perf_counter() - mur
+            self.surcout_cpu += time.process_time() - cpu
+            self.profil.enable()
+
+    def _replier(self, noeud):
+        """
+        Reporte le pic mémoire observé depuis le dernier relevé dans une phase, puis repart de l'utilisation actuelle.
+
+        :param noeud: dictionnaire de la phase
+        """
+        pic = tracemalloc.get_traced_memory()[1] // 1024
+        noeud["pic_memoire_ko"] = max(noeud.get("pic_memoire_ko", 0), pic)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, nom, **infos):
+        """
+        Mesure une phase (voir Mesures.phase) avec son pic mémoire. Pour une phase sans sous-phase, relève aussi ses
+        principaux sites d'allocation : les lignes dont les allocations encore vivantes ont le plus augmenté.
+        Les temps des phases ne comptent pas les relevés, coûteux sur un gros tas.
+        """
+        parent = self.pile[-1]
+        with self._releve():
+            self._replier(parent)
+            avant = tracemalloc.take_snapshot()
+        surcout, surcout_cpu = self.surcout, self.surcout_cpu
+        with super().phase(nom, **infos) as noeud:
+            yield noeud
+        with self._releve():
+            noeud["mur"] = round(noeud["mur"] - (self.surcout - surcout), 6)
+            noeud["cpu"] = round(noeud["cpu"] - (self.surcout_cpu - surcout_cpu), 6)
+            self._replier(noeud)
+            if "phases" not in noeud:
+                noeud["allocations"] = self._sites(tracemalloc.take_snapshot().compare_to(avant, "lineno"))
+            parent["pic_memoire_ko"] = max(parent.get("pic_memoire_ko", 0), noeud["pic_memoire_ko"])
+
+    def _sites(self, differences):
+        """
+        Retient les principaux sites d'allocation d'une comparaison de relevés tracemalloc.
+
+        :param differences: liste de tracemalloc.StatisticDiff, triée par différence décroissante
+        :return: liste de dictionnaires (site, ko, nombre)
+        """
+        sites = []
+        for stat in differences:
+            if len(sites) == self.sites:
+                break
+            if stat.size_diff > 0 and stat.traceback[0].filename not in EXCLUS:
+                sites.append({"site": str(stat.traceback), "ko": stat.size_diff // 1024, "nombre": stat.count_diff})
+        return sites
+
+    def en_dict(self):
+        """
+        :return: arbre des phases (voir Mesures.en_dict), sans le temps des relevés
+        """
+        racine = super().en_dict()
+        racine["mur"] = round(racine["mur"] - self.surcout, 6)
+        racine["cpu"] = round(racine["cpu"] - self.surcout_cpu, 6)
+        return racine
+
+    def rapport(self, lignes=25):
+        """
+        Rapport texte : fonctions triées par temps propre puis par temps cumulé, puis mémoire de chaque phase.
+
+        :param lignes: nombre de fonctions par classement
+        :return: texte du rapport
+        """
+        texte = io.StringIO()
+        for tri, titre in (("tottime", "temps propre"), ("cumulative", "temps cumulé")):
+            texte.write("=== Fonctions les plus coûteuses (" + titre + ") ===\n")
+            pstats.Stats(self.profil, stream=texte).strip_dirs().sort_stats(tri).print_stats(lignes)
+
+        texte.write("=== Mémoire par phase (pic, puis lignes dont les allocations ont le plus augmenté) ===\n")
+
+        def ecrire(noeud, profondeur):
+            infos = "".join(" " + cle + "=" + str(noeud[cle]) for cle in ("k", "statut") if cle in noeud)
+            texte.write("  " * profondeur + noeud["phase"] + infos + " : pic " + str(noeud.get("pic_memoire_ko"))
+                        + " Ko, " + str(noeud.get("mur")) + " s\n")
+            for site in noeud.get("allocations", []):
+                texte.write("  " * profondeur + "    " + site["site"] + " : +" + str(site["ko"]) + " Ko ("
+                            + str(site["nombre"]) + " blocs)\n")
+            for fille in noeud.get("phases", []):
+                ecrire(fille, profondeur + 1)
+
+        ecrire(self.en_dict(), 0)
+        return texte.getvalue()
+
+    def ecrire(self, prefixe):
+        """
+        Écrit le profil brut (PREFIXE.prof, lisible par pstats, snakeviz...) et le rapport (PREFIXE.txt).
+
+        :param prefixe: chemin des fichiers sans extension
+        """
+        self.profil.dump_stats(prefixe + ".prof")
+        with open(prefixe + ".txt", "w") as f:
+            f.write(self.rapport())
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Suivi des solveurs pendant la résolution : conflits, décisions, propagations, redémarrages et mémoire, relevés
+périodiquement dans le solveur pysat (M3) ou lus dans la sortie de ACE (M1, M2).
+Les relevés sont affichés en mode trace et enregistrés dans la phase du solveur des mesures (--stats) : un sondage
+bloqué se distingue ainsi d'un sondage presque terminé.
+"""
+import glob
+import os
+import re
+import threading
+import time
+
+from cyclic_bandwidth.mesures import noter
+
+# Secondes entre deux relevés
+INTERVALLE = 5.0
+# Conflits accordés au solveur pysat entre deux relevés (il reprend ensuite avec ses clauses apprises)
+TRANCHE_CONFLITS = 20000
+# Compteurs relevés, dans l'ordre d'affichage
+COMPTEURS = ("conflits", "decisions", "propagations", "redemarrages", "memoire_ko")
+
+# Noms des compteurs dans les sorties des solveurs
+NOMS_PYSAT = {"conflicts": "conflits", "decisions": "decisions", "propagations": "propagations",
+              "restarts": "redemarrages"}
+NOMS_ACE = {"wrg": "conflits", "wrong": "conflits", "decisions": "decisions", "nodes": "decisions",
+            "effs": "propagations", "revisions": "propagations", "mem": "memoire_ko"}
+MOTIF_ACE = re.compile(r"\b([a-z]+)[=:]\(?([\d,.]+)([kKmMgG]?)")
+MULTIPLES_KO = {"": 1 / 1024, "k": 1, "m": 1024, "g": 1024 * 1024}  # mem=45M : mégaoctets
+
+
+def memoire_ko():
+    """
+    Mémoire résidente du processus.
+
+    :return: kilo-octets (pic du processus si la mémoire courante n'est pas lisible)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Progression:
+    """
+    Relevés successifs des compteurs d'un solveur pendant un appel.
+
+    :param mesures: Mesures où enregistrer les relevés dans la phase en cours (None : pas d'enregistrement)
+    :param trace: affiche chaque relevé
+    :param intervalle: secondes entre deux relevés
+    """
+
+    def __init__(self, mesures=None, trace=False, intervalle=INTERVALLE):
+        self.mesures = mesures
+        self.trace = trace
+        self.intervalle = intervalle
+        self.debut = time.perf_counter()
+        self.dernier = self.debut
+        self.releves = []
+
+    @property
+    def actif(self):
+        """
+        :return: True si les relevés sont affichés ou enregistrés
+        """
+        return self.trace or self.mesures is not None
+
+    def echu(self):
+        """
+        :return: True si l'intervalle depuis le dernier relevé est écoulé
+        """
+        return time.perf_counter() - self.dernier >= self.intervalle
+
+    def relever(self, **compteurs):
+        """
+        Enregistre un relevé des compteurs, et l'affiche en mode trace.
+
+        :param compteurs: valeurs des compteurs (voir COMPTEURS)
+        """
+        self.dernier = time.perf_counter()
+        releve = {"t": round(self.dernier - self.debut, 3)}
+        releve.update((cle, compteurs[cle]) for cle in COMPTEURS if compteurs.get(cle) is not None)
+        self.releves.append(releve)
+        if self.trace:
+            print("Progression :", "%.1f s," % releve["t"],
+                  ", ".join(str(releve[cle]) + " " + cle for cle in COMPTEURS if cle in releve))
+
+    def resume(self):
+        """
+        :return: relevés et derniers compteurs, à enregistrer dans la phase du solveur (vide sans relevé)
+        """
+        if not self.releves:
+            return {}
+        resume = {cle: valeur for cle, valeur in self.releves[-1].items() if cle != "t"}
+        resume["progression"] = self.releves
+        return resume
+
+    def terminer(self):
+        """
+        Enregistre les relevés et les derniers compteurs dans la phase en cours des mesures.
+        """
+        noter(self.mesures, **self.resume())
+
+
+def compteurs_pysat(solver):
+    """
+    :param solver: solveur pysat
+    :return: compteurs cumulés du solveur et mémoire du processus
+    """
+    stats = solver.accum_stats() or {}
+    compteurs = {NOMS_PYSAT[cle]: valeur for cle, valeur in stats.items() if cle in NOMS_PYSAT}
+    compteurs["memoire_ko"] = memoire_ko()
+    return compteurs
+
+
+def resoudre_pysat(solver, mesures=None, trace=False, intervalle=INTERVALLE):
+    """
+    Résout avec un solveur pysat en relevant ses compteurs à intervalles réguliers : le solveur avance par tranches
+    de conflits, et garde ses clauses apprises d'une tranche à l'autre.
+    Sans trace ni mesures, le solveur est appelé d'une traite.
+
+    :param solver: solveur pysat chargé
+    :param mesures: Mesures où enregistrer les relevés (None : pas d'enregistrement)
+    :param trace: affiche les relevés
+    :param intervalle: secondes entre deux relevés
+    :return: True si satisfiable, False sinon
+    """
+    progression = Progression(mesures, trace, intervalle)
+    if not progression.actif:
+        return solver.solve()
+
+    satisfiable = None
+    while satisfiable is None:
+        solver.conf_budget(TRANCHE_CONFLITS)
+        satisfiable = solver.solve_limited()
+        if satisfiable is not None or progression.echu():
+            progression.relever(**compteurs_pysat(solver))
+    progression.terminer()
+    return satisfiable
+
+
+def compteurs_ace(texte):
+    """
+    Extrait les derniers compteurs affichés par ACE (valeurs « cle=valeur », lignes « Run » des redémarrages).
+
+    :param texte: sortie de ACE
+    :return: dictionnaire des compteurs trouvés
+    """
+    compteurs = {}
+    redemarrages = 0
+    for ligne in texte.splitlines():
+        if ligne.strip().lower().startswith("run"):
+            redemarrages += 1
+        for cle, valeur, unite in MOTIF_ACE.findall(ligne):
+            if cle in NOMS_ACE:
+                try:
+                    nombre = float(valeur.replace(",", ""))
+                except ValueError:
+                    continue
+                if NOMS_ACE[cle] == "memoire_ko":
+                    compteurs["memoire_ko"] = int(nombre * MULTIPLES_KO[unite.lower()])
+                elif not unite:
+                    compteurs[NOMS_ACE[cle]] = int(nombre)
+    if redemarrages:
+        compteurs["redemarrages"] = redemarrages
+    return compteurs
+
+
+class SuiviAce:
+    """
+    Suit la sortie de ACE pendant sa résolution : pycsp3 la recopie ligne à ligne dans un fichier solver_*.log, relu
+    par un fil d'exécution à chaque intervalle. S'utilise comme gestionnaire de contexte autour de l'appel au solveur ;
+    les relevés sont ensuite dans progression (voir Progression.resume).
+
+    :param mesures: Mesures où enregistrer les relevés (None : pas d'enregistrement)
+    :param trace: affiche les relevés
+    :param intervalle: secondes entre deux relevés
+    """
+
+    def __init__(self, mesures=None, trace=False, intervalle=INTERVALLE):
+        self.progression = Progression(mesures, trace, intervalle)
+        self.arret = threading.Event()
+        self.fil = None
+        self.fichier = None
+        self.horloge = time.time()  # Début du suivi, comparable aux dates des fichiers
+
+    def chercher_fichier(self):
+        """
+        :return: fichier solver_*.log écrit par ce processus depuis le début du suivi, None s'il n'existe pas encore
+        """
+        from pycsp3.compiler import Compilation
+
+        dossier = Compilation.pathname or os.getcwd()
+        candidats = [f for f in glob.glob(os.path.join(dossier, "solver_*_" + str(os.getpid()) + "_*.log"))
+                     if os.path.getmtime(f) >= self.horloge - 1]
+        return max(candidats, key=os.path.getmtime) if candidats else None
+
+    def relever(self):
+        """
+        Relève les compteurs de la sortie de ACE écrite jusqu'ici.
+        """
+        if self.fichier is None:
+            self.fichier = self.chercher_fichier()
+        if self.fichier is not None:
+            try:
+                with open(self.fichier) as f:
+                    compteurs = compteurs_ace(f.read())
+            except OSError:
+                return
+            if compteurs:
+                self.progression.relever(**compteurs)
+
+    def suivre(self):
+        while not self.arret.wait(self.progression.intervalle):
+            self.relever()
+
+    def __enter__(self):
+        if self.progression.actif:
+            self.fil = threading.Thread(target=self.suivre, daemon=True)
+            self.fil.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.fil is not None:
+            self.arret.set()
+            self.fil.join()
+            from pycsp3 import solver
+
+            dernier = solver() and solver().last_log  # Sortie complète de l'appel
+            self.fichier = dernier if dernier and os.path.exists(dernier) else self.fichier
+            self.relever()
+        return False
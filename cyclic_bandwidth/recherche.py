@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Recherche de la plus petite borne k satisfiable, commune aux modèles de décision M2 et M3.
+
+Chaque méthode est une stratégie qui choisit le prochain k à sonder d'après l'intervalle [k_low, k_high] restant et
+l'historique des sondages. Quelle que soit la méthode, un sondage satisfiable ramène k_high au cyclic bandwidth
+mesuré de son étiquetage moins un : le solveur rend souvent un étiquetage bien meilleur que la borne demandée.
+"""
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.mesures import noter, phase
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+
+class Partage:
+    """
+    Bornes partagées d'une recherche de k (voir rechercher_k) : l'intervalle est resserré avant chaque sondage, et
+    chaque sondage publie sa borne. Sans redéfinition, l'intervalle est inchangé et rien n'est publié.
+    """
+
+    def resserrer(self, k_low, k_high):
+        """
+        :param k_low: borne inférieure prouvée de la recherche
+        :param k_high: plus grande borne encore utile à sonder
+        :return: couple (k_low, k_high) resserré
+        """
+        return k_low, k_high
+
+    def publier(self, borne_inf=None, etiquettes=None, cb=None):
+        """
+        Publie les bornes d'un sondage.
+
+        :param borne_inf: borne inférieure prouvée (None : aucune)
+        :param etiquettes: étiquetage trouvé (None : aucun)
+        :param cb: cyclic bandwidth de l'étiquetage
+        """
+
+
+def k_fixe(k_low, k_high, historique):
+    """
+    Un seul sondage, à k_high.
+
+    :param k_low: borne inférieure prouvée
+    :param k_high: plus grande borne encore utile à sonder
+    :param historique: liste des sondages déjà faits, couples (k, statut)
+    :return: prochain k à sonder, None pour arrêter la recherche
+    """
+    return None if historique else k_high
+
+
+def k_pas(k_low, k_high, historique):
+    """
+    Descente depuis k_high : chaque sondage satisfiable est suivi d'un sondage juste sous son étiquetage.
+    (Paramètres : voir k_fixe)
+    """
+    return k_high
+
+
+def k_dichotomie(k_low, k_high, historique):
+    """
+    Dichotomie : milieu de l'intervalle restant.
+    (Paramètres : voir k_fixe)
+    """
+    return (k_low + k_high) // 2
+
+
+def k_galop(k_low, k_high, historique):
+    """
+    Galop descendant depuis la borne heuristique k_high : k_high, puis des écarts 1, 3, 7... sous k_high tant que les
+    sondages sont satisfiables, puis dichotomie après le premier sondage insatisfiable.
+    Adaptée quand la borne heuristique est proche de l'optimum : les premiers sondages, satisfiables, sont rapides.
+    (Paramètres : voir k_fixe)
+    """
+    if any(statut == UNSAT for _, statut in historique):
+        return k_dichotomie(k_low, k_high, historique)
+    return max(k_low, k_high - (2 ** len(historique) - 1))
+
+
+def k_dichotomie_unsat(k_low, k_high, historique):
+    """
+    Dichotomie biaisée vers la borne inférieure : sonde au premier quart de l'intervalle restant.
+    Parie sur des sondages insatisfiables loin sous l'optimum, vite réfutés, et compte sur le saut au cyclic bandwidth
+    mesuré pour réduire l'intervalle par le haut à chaque sondage satisfiable.
+    (Paramètres : voir k_fixe)
+    """
+    return k_low + (k_high - k_low) // 4
+
+
+# Méthodes de recherche de k disponibles : nom -> stratégie (k_low, k_high, historique) -> prochain k
+STRATEGIES = {
+    "fixe": k_fixe,
+    "pas": k_pas,
+    "dichotomie": k_dichotomie,
+    "galop": k_galop,
+    "dichotomie_unsat": k_dichotomie_unsat,
+}
+METHODES = tuple(STRATEGIES)
+
+
+def rechercher_k(modele, aretes, sonder, k_low, k_high, methode="dichotomie", trace=False, mesures=None,
+                 partage=None):
+    """
+    Recherche le plus petit k satisfiable par sondages successifs du problème de décision.
+
+    :param modele: nom de la variante résolue, reporté dans le résultat
+    :param aretes: Arêtes du graphe
+    :param sonder: fonction k -> (statut, etiquettes), statut valant SAT, UNSAT ou INCONNU
+    :param k_low: borne inférieure prouvée de départ
+    :param k_high: borne supérieure de départ
+    :param methode: nom de la stratégie de choix de k (voir STRATEGIES)
+    :param trace: affiche le résultat de chaque sondage
+    :param mesures: Mesures où enregistrer chaque sondage (None : pas de mesure)
+    :param partage: Partage des bornes (portefeuille.Canal entre variantes, reprise.Reprise vers un point de
+                    reprise) : l'intervalle est resserré par ses bornes avant chaque sondage, et chaque sondage y
+                    publie la sienne ; None : aucun partage
+    :return: Resultat de la recherche
+    """
+    strategie = STRATEGIES[methode]
+    meilleur = []  # Étiquetage du dernier sondage satisfiable
+    statut = SAT
+    historique = []
+
+    while True:
+        if partage is not None:
+            k_low, k_high = partage.resserrer(k_low, k_high)
+        if k_low > k_high:
+            break
+        k = strategie(k_low, k_high, historique)
+        if k is None:
+            break
+        with phase(mesures, "sondage", k=k):
+            statut, etiquettes = sonder(k)
+            noter(mesures, statut=statut)
+        historique.append((k, statut))
+
+        if statut == SAT:
+            meilleur = etiquettes
+            cb = cyclic_bandwidth(etiquettes, aretes)
+            if trace: print("Sat pour", k, ": étiquetage de CB", cb)
+            k_high = min(k, cb) - 1
+            if partage is not None:
+                partage.publier(etiquettes=etiquettes, cb=cb)
+        elif statut == UNSAT:
+            if trace: print("Unsat pour", k)
+            k_low = k + 1
+            if partage is not None:
+                partage.publier(borne_inf=k_low)
+        else:
+            if trace: print("Pas de retour du solveur pour", k)
+            break
+
+    if not meilleur:
+        return Resultat(modele, INCONNU if statut == INCONNU else UNSAT, borne_inf=k_low)
+
+    cb = cyclic_bandwidth(meilleur, aretes)
+    return Resultat(modele, OPTIMUM if cb <= k_low else SAT, meilleur, cb, borne_inf=min(k_low, cb), borne_sup=cb)
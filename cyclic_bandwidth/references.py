@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Valeurs de référence des 113 instances de Data/ (Data/Best BRP Results-113 instances.pdf, V. Campos, E. Piñana,
+R. Martí), recopiées dans references.csv.
+
+Ces valeurs portent sur le bandwidth (linéaire) B du graphe et non sur le cyclic bandwidth B_c. Replier le cycle des
+étiquettes sur une ligne (1, n, 2, n-1, ...) au plus double les distances, d'où B / 2 <= B_c <= B :
+- la borne inférieure publiée LB de B donne la borne inférieure prouvée ceil(LB / 2) de B_c ;
+- le meilleur bandwidth publié est une borne supérieure de B_c.
+"""
+import csv
+import os
+from dataclasses import dataclass
+
+FICHIER_REFERENCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references.csv")
+
+# Méthodes dont le bandwidth est reporté dans le tableau de référence
+METHODES_REFERENCE = ("grasp_pr", "tabou", "scatter_search")
+
+
+@dataclass
+class Reference:
+    """
+    Valeurs de référence d'une instance.
+
+    :param instance: nom du fichier de l'instance
+    :param n: nombre de sommets
+    :param m: nombre d'arêtes
+    :param borne_inf_bw: borne inférieure publiée du bandwidth
+    :param meilleur_bw: meilleur bandwidth publié (GRASP+PR, recherche tabou, scatter search)
+    """
+    instance: str
+    n: int
+    m: int
+    borne_inf_bw: int
+    meilleur_bw: int
+
+    @property
+    def borne_inf(self):
+        """Borne inférieure prouvée du cyclic bandwidth : ceil(LB / 2)."""
+        return (self.borne_inf_bw + 1) // 2
+
+    @property
+    def borne_sup(self):
+        """Borne supérieure du cyclic bandwidth : meilleur bandwidth publié, au plus n // 2."""
+        return min(self.meilleur_bw, self.n // 2)
+
+
+def charger_references(fichier=FICHIER_REFERENCES):
+    """
+    Charge le tableau des valeurs de référence.
+
+    :param fichier: fichier CSV (instance, n, m, borne_inf_bw puis le bandwidth de chaque méthode)
+    :return: dictionnaire nom de l'instance -> Reference
+    """
+    references = {}
+    with open(fichier, newline="") as f:
+        for ligne in csv.DictReader(f):
+            references[ligne["instance"]] = Reference(
+                ligne["instance"], int(ligne["n"]), int(ligne["m"]), int(ligne["borne_inf_bw"]),
+                min(int(ligne[methode]) for methode in METHODES_REFERENCE))
+    return references
+
+
+def reference(instance, sommets, aretes):
+    """
+    Cherche les valeurs de référence d'une instance.
+    Le nombre de sommets et d'arêtes doit correspondre, pour ne pas appliquer les bornes à un autre graphe du même nom.
+
+    :param instance: nom ou chemin du fichier de l'instance
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: Reference, None si l'instance n'est pas dans le tableau
+    """
+    if instance is None:
+        return None
+    ref = charger_references().get(os.path.basename(instance))
+    if ref is None or ref.n != len(sommets) or ref.m != len(aretes):
+        return None
+    return ref
+
+
+def ecart(cb, valeur):
+    """
+    Écart relatif d'un cyclic bandwidth à une valeur de référence, comme la colonne « LB dev. » du tableau.
+
+    :param cb: cyclic bandwidth obtenu
+    :param valeur: valeur de référence
+    :return: écart en pourcentage (négatif sous la référence), None sans cb ou référence nulle
+    """
+    if cb is None or not valeur:
+        return None
+    return round(100 * (cb - valeur) / valeur, 2)
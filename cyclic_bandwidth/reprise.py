@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Points de reprise de la recherche de k : après chaque sondage, la borne inférieure prouvée et le meilleur étiquetage
+sont écrits dans un petit fichier JSON propre à l'instance et aux options. Une recherche interrompue (délai, machine
+préemptée) repart ensuite avec --reprendre de l'intervalle resserré et de cet étiquetage, sans refaire les sondages
+terminés. Le fichier est effacé quand la recherche aboutit.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from cyclic_bandwidth.etiquetage import valider
+from cyclic_bandwidth.recherche import Partage
+from cyclic_bandwidth.resultat import INCONNU, OPTIMUM, SAT, UNSAT, Resultat
+
+# Dossier des points de reprise par défaut
+DOSSIER = os.path.join(tempfile.gettempdir(), "cyclic_bandwidth_reprise")
+# Options qui définissent la recherche : un point de reprise ne sert qu'à une recherche lancée avec les mêmes
+OPTIONS = ("modele", "encodage", "sans_symetrie", "recherche", "strategie", "dual", "branche_dual", "domaines",
+           "distances", "cubes", "composantes", "sans_familles")
+
+
+def chemin_reprise(dossier, instance, empreinte, args):
+    """
+    Fichier du point de reprise d'une instance pour des options.
+
+    :param dossier: dossier des points de reprise
+    :param instance: nom du fichier de l'instance (None : graphe sans nom)
+    :param empreinte: empreinte du graphe (voir stockage.empreinte_graphe)
+    :param args: options de la ligne de commande
+    :return: chemin du fichier, INSTANCE.CLE.json où CLE résume le graphe et les options
+    """
+    options = {cle: getattr(args, cle) for cle in OPTIONS}
+    cle = hashlib.sha256((empreinte + json.dumps(options, sort_keys=True)).encode()).hexdigest()[:16]
+    return os.path.join(dossier, (instance or "graphe") + "." + cle + ".json")
+
+
+class Reprise(Partage):
+    """
+    Point de reprise d'une recherche de k, branché sur ses bornes partagées (voir recherche.Partage) : chaque sondage
+    publié est aussitôt écrit. L'intervalle n'est pas resserré en cours de recherche : le point de reprise le donne
+    au départ.
+
+    :param chemin: fichier du point de reprise
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.borne_inf = None
+        self.etiquettes = []
+        self.cb = None
+
+    def charger(self, aretes, n):
+        """
+        Relit le point de reprise, s'il existe.
+
+        :param aretes: Arêtes du graphe
+        :param n: nombre de sommets
+        :return: Resultat SAT (étiquetage) ou INCONNU (borne inférieure seule) du point de reprise, None sans fichier
+                 lisible
+        :raises EtiquetageInvalide: si l'étiquetage enregistré n'est pas valide pour le graphe
+        """
+        if not os.path.exists(self.chemin):
+            return None
+        try:
+            with open(self.chemin) as f:
+                etat = json.load(f)
+            self.borne_inf, self.etiquettes = etat["borne_inf"], etat["etiquettes"]
+        except (ValueError, KeyError):  # Fichier d'une autre version ou abîmé : la recherche repart de zéro
+            return None
+        self.cb = valider(self.etiquettes, aretes, n) if self.etiquettes else None
+        if self.etiquettes:
+            return Resultat("reprise", SAT, self.etiquettes, self.cb, borne_inf=self.borne_inf, borne_sup=self.cb)
+        return Resultat("reprise", INCONNU, borne_inf=self.borne_inf)
+
+    def publier(self, borne_inf=None, etiquettes=None, cb=None):
+        """
+        Retient les bornes d'un sondage et réécrit le point de reprise.
+
+        :param borne_inf: borne inférieure prouvée (None : aucune)
+        :param etiquettes: étiquetage trouvé (None : aucun)
+        :param cb: cyclic bandwidth de l'étiquetage
+        """
+        if borne_inf is not None and (self.borne_inf is None or borne_inf > self.borne_inf):
+            self.borne_inf = borne_inf
+        if etiquettes and (self.cb is None or cb < self.cb):
+            self.etiquettes, self.cb = etiquettes, cb
+        os.makedirs(os.path.dirname(self.chemin) or ".", exist_ok=True)
+        temporaire = self.chemin + ".tmp"
+        with open(temporaire, "w") as f:
+            json.dump({"borne_inf": self.borne_inf, "cb": self.cb, "etiquettes": self.etiquettes}, f)
+        os.replace(temporaire, self.chemin)  # Un arrêt pendant l'écriture laisse le point de reprise précédent
+
+    def terminer(self, resultat):
+        """
+        Efface le point de reprise d'une recherche aboutie (optimum prouvé, ou aucun étiquetage sous la borne).
+
+        :param resultat: Resultat de la recherche
+        """
+        if resultat.statut in (OPTIMUM, UNSAT) and os.path.exists(self.chemin):
+            os.remove(self.chemin)
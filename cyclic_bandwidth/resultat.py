@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Résultat d'une résolution, commun à tous les modèles.
+"""
+from dataclasses import dataclass, field
+
+# Statuts possibles d'une résolution
+OPTIMUM = "OPTIMUM"  # Étiquetage trouvé et prouvé optimal
+SAT = "SAT"  # Étiquetage trouvé, optimalité non prouvée
+UNSAT = "UNSAT"  # Aucun étiquetage ne respecte la borne demandée
+INCONNU = "INCONNU"  # Pas de retour du solveur
+
+
+@dataclass
+class Resultat:
+    """
+    Résultat d'une résolution.
+
+    :param modele: nom de la variante résolue (ex. "M3/sequentiel/dichotomie")
+    :param statut: OPTIMUM, SAT, UNSAT ou INCONNU
+    :param etiquettes: meilleur étiquetage trouvé (la i-ème valeur est l'étiquette de v_i), vide sinon
+    :param cb: cyclic bandwidth de l'étiquetage, None sans étiquetage
+    :param borne_inf: plus grande borne inférieure prouvée du CB optimal
+    :param borne_sup: plus petite borne supérieure connue du CB optimal
+    """
+    modele: str
+    statut: str
+    etiquettes: list = field(default_factory=list)
+    cb: int = None
+    borne_inf: int = None
+    borne_sup: int = None
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Base SQLite des résolutions : chaque exécution y est enregistrée avec ses bornes prouvées et son étiquetage.
+Les résolutions suivantes d'un même graphe repartent du meilleur intervalle connu et sautent les instances fermées.
+"""
+import hashlib
+import json
+import sqlite3
+
+from cyclic_bandwidth.graphe import cyclic_bandwidth
+from cyclic_bandwidth.resultat import OPTIMUM, SAT, UNSAT, Resultat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empreinte TEXT NOT NULL,
+    instance TEXT,
+    n INTEGER NOT NULL,
+    m INTEGER NOT NULL,
+    modele TEXT NOT NULL,
+    options TEXT,
+    statut TEXT NOT NULL,
+    cb INTEGER,
+    borne_inf INTEGER,
+    borne_sup INTEGER,
+    temps REAL,
+    etiquettes TEXT,
+    date TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS executions_empreinte ON executions (empreinte);
+"""
+
+
+def empreinte_graphe(sommets, aretes):
+    """
+    Calcule l'empreinte d'un graphe : deux fichiers décrivant les mêmes arêtes sur les mêmes sommets (dans un ordre
+    quelconque) ont la même empreinte. La numérotation des sommets compte, car les étiquetages enregistrés en dépendent.
+
+    :param sommets: Sommets du graphe
+    :param aretes: Arêtes du graphe
+    :return: empreinte SHA-256 en hexadécimal
+    """
+    normalisees = sorted({(min(u, v), max(u, v)) for (u, v) in aretes})
+    texte = str(len(sommets)) + ";" + ";".join(str(u) + "," + str(v) for (u, v) in normalisees)
+    return hashlib.sha256(texte.encode()).hexdigest()
+
+
+def etiquetage_valide(etiquettes, n):
+    """
+    Vérifie qu'un étiquetage est une permutation de 1..n.
+
+    :param etiquettes: liste des étiquettes
+    :param n: nombre de sommets
+    :return: True si l'étiquetage est valide
+    """
+    return len(etiquettes) == n and sorted(etiquettes) == list(range(1, n + 1))
+
+
+class Stockage:
+    """
+    Base des résolutions, utilisable comme gestionnaire de contexte.
+    Plusieurs processus (mode lot) peuvent y écrire en même temps : SQLite sérialise les écritures.
+    """
+
+    def __init__(self, fichier):
+        """
+        :param fichier: fichier SQLite (créé s'il n'existe pas)
+        """
+        self.connexion = sqlite3.connect(fichier, timeout=60)
+        self.connexion.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """
+        Ferme la connexion à la base.
+        """
+        self.connexion.close()
+
+    def enregistrer(self, empreinte, n, m, resultat, options=None, temps=None, instance=None):
+        """
+        Enregistre une résolution.
+
+        :param empreinte: empreinte du graphe (voir empreinte_graphe)
+        :param n: nombre de sommets
+        :param m: nombre d'arêtes
+        :param resultat: Resultat de la résolution
+        :param options: dictionnaire des options de la résolution, enregistré en JSON
+        :param temps: durée de la résolution en secondes
+        :param instance: nom du fichier de l'instance
+        """
+        with self.connexion:
+            self.connexion.execute(
+                "INSERT INTO executions (empreinte, instance, n, m, modele, options, statut, cb, borne_inf, borne_sup,"
+                " temps, etiquettes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (empreinte, instance, n, m, resultat.modele, json.dumps(options, sort_keys=True) if options else None,
+                 resultat.statut, resultat.cb, resultat.borne_inf, resultat.borne_sup, temps,
+                 json.dumps(resultat.etiquettes) if resultat.etiquettes else None))
+
+    def meilleur(self, empreinte, aretes, n):
+        """
+        Rassemble les connaissances sur un graphe : plus grande borne inférieure prouvée et meilleur étiquetage connu.
+        Les étiquetages enregistrés sont revérifiés avant d'être utilisés.
+
+        :param empreinte: empreinte du graphe
+        :param aretes: Arêtes du graphe
+        :param n: nombre de sommets du graphe, dont chaque étiquetage enregistré doit être une permutation
+        :return: Resultat (OPTIMUM si l'instance est fermée, SAT avec un étiquetage, UNSAT sinon), None si inconnu
+        """
+        ligne = self.connexion.execute(
+            "SELECT MAX(borne_inf), COUNT(*) FROM executions WHERE empreinte = ?", (empreinte,)).fetchone()
+        if ligne[1] == 0:
+            return None
+        borne_inf = ligne[0]
+
+        etiquettes, cb, modele = [], None, "base"
+        for (texte, modele_ligne) in self.connexion.execute(
+                "SELECT etiquettes, modele FROM executions WHERE empreinte = ? AND etiquettes IS NOT NULL"
+                " ORDER BY cb, id", (empreinte,)):
+            candidat = json.loads(texte)
+            if etiquetage_valide(candidat, n):
+                etiquettes, cb, modele = candidat, cyclic_bandwidth(candidat, aretes), modele_ligne
+                break
+
+        if not etiquettes:
+            return Resultat(modele, UNSAT, borne_inf=borne_inf)
+        statut = OPTIMUM if borne_inf is not None and borne_inf >= cb else SAT
+        return Resultat(modele, statut, etiquettes, cb, borne_inf=min(borne_inf, cb) if borne_inf else None,
+                        borne_sup=cb)